@@ -0,0 +1,66 @@
+"""
+Encode/decode throughput of the route serialization backends.
+
+Usage:
+    python -m benchmarks.bench_serialization [--routes 10000] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.storage import serialization
+from src.storage.models.route_model import RouteModel
+
+
+def make_routes(count: int, holds_per_route: int = 20) -> list:
+    """Generate synthetic routes with a realistic number of holds."""
+    start = datetime(2024, 1, 1)
+    return [
+        RouteModel(
+            name=f"Route {i}",
+            hold_ids=[uuid4() for _ in range(holds_per_route)],
+            created_at=start + timedelta(minutes=i),
+            difficulty="6b+",
+            description="Synthetic benchmark route " * 3,
+            author="bench",
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest wall-clock time of several runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    routes = make_routes(args.routes)
+    print(f"{args.routes} routes, best of {args.repeat}")
+    print(f"{'backend':<10}{'encode/s':>14}{'decode/s':>14}{'MB':>8}")
+
+    for backend in serialization.available_backends():
+        serialization.set_backend(backend)
+        documents = [serialization.encode_route(route) for route in routes]
+
+        encode_time = best_of(args.repeat, lambda: [serialization.encode_route(r) for r in routes])
+        decode_time = best_of(args.repeat, lambda: [serialization.decode_route(d) for d in documents])
+        size_mb = sum(len(d) for d in documents) / 1e6
+
+        print(f"{backend:<10}{args.routes / encode_time:>14,.0f}{args.routes / decode_time:>14,.0f}{size_mb:>8.2f}")
+
+    serialization.set_backend()
+
+
+if __name__ == "__main__":
+    main()
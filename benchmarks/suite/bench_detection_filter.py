@@ -0,0 +1,25 @@
+"""Suppression of overlapping detections after inference."""
+import numpy as np
+
+from benchmarks.suite.fixtures import make_detection
+from src.api.detection_filter import suppress_overlapping
+
+# Overlap threshold of the default RoboflowConfig
+IOU_THRESHOLD = 0.3
+
+
+def _with_duplicates(predictions, every=10, seed=0):
+    """Predictions plus a slightly shifted, less confident copy of every tenth one"""
+    rng = np.random.default_rng(seed)
+    duplicates = []
+    for i, prediction in enumerate(predictions[::every]):
+        duplicate = make_detection(rng, 90_000 + i, prediction["x"] + 3, prediction["y"] - 2, prediction["width"])
+        duplicate["confidence"] = prediction["confidence"] - 0.01
+        duplicates.append(duplicate)
+    return predictions + duplicates
+
+
+def test_suppress_overlapping(benchmark, wall_response):
+    predictions = _with_duplicates(wall_response["predictions"])
+    kept = benchmark(suppress_overlapping, predictions, IOU_THRESHOLD)
+    assert len(kept) <= len(wall_response["predictions"])
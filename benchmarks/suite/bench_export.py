@@ -0,0 +1,48 @@
+"""Rendering and encoding exported route images."""
+import pytest
+from PIL import Image
+
+from benchmarks.suite.fixtures import WALL_HEIGHT, WALL_WIDTH, make_roboflow_response
+from src.core.hold import Hold
+from src.core.route import Route
+from src.utils.route_image_processor import RouteImageProcessor
+from src.utils.route_renderer import RouteRenderer
+
+# Holds on the exported wall
+EXPORT_WALL_HOLDS = 500
+
+
+@pytest.fixture(scope="module")
+def export_wall(tmp_path_factory):
+    """Wall photo on disk, its holds and a route of 12 hand and 4 foot holds"""
+    image_path = tmp_path_factory.mktemp("wall") / "wall.jpg"
+    Image.radial_gradient("L").resize((WALL_WIDTH, WALL_HEIGHT)).convert("RGB").save(image_path, quality=90)
+
+    holds = [Hold.from_detection(p) for p in make_roboflow_response(EXPORT_WALL_HOLDS)["predictions"]]
+    for order, hold in enumerate(holds[:12]):
+        hold.is_hand_selected, hold.hand_order = True, order
+    for order, hold in enumerate(holds[12:16]):
+        hold.is_foot_selected, hold.foot_order = True, order
+    route = Route.from_holds(holds[:12], holds[12:16], name="Benchmark route")
+    return image_path, holds, route
+
+
+@pytest.fixture(scope="module")
+def processor():
+    processor = RouteImageProcessor()
+    yield processor
+    processor.close()
+
+
+def test_export_route(benchmark, export_wall, tmp_path):
+    image_path, holds, route = export_wall
+    renderer = RouteRenderer()
+    benchmark.pedantic(renderer.render_file, args=(image_path, route, holds, tmp_path / "route.jpg"),
+                       rounds=5, warmup_rounds=1)
+
+
+def test_export_route_profiles(benchmark, export_wall, processor, tmp_path):
+    image_path, holds, route = export_wall
+    written = benchmark.pedantic(processor.export_route_profiles, args=(image_path, route, holds, tmp_path, "route"),
+                                 rounds=5, warmup_rounds=1)  # The warmup round starts the encoder pool
+    assert len(written) == 6
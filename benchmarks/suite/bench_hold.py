@@ -0,0 +1,43 @@
+"""Hold construction from API detections and point-in-hold tests."""
+import numpy as np
+import pytest
+
+from benchmarks.suite.fixtures import load_recorded_responses
+from src.core.hold import Hold
+
+RECORDED = load_recorded_responses()
+
+# Points tested per round of the hit test benchmarks
+HIT_TESTS = 200
+
+
+def test_from_detection(benchmark, wall_response):
+    predictions = wall_response["predictions"]
+    holds = benchmark(lambda: [Hold.from_detection(prediction) for prediction in predictions])
+    assert len(holds) == len(predictions)
+
+
+@pytest.mark.skipif(not RECORDED, reason="No recorded responses in benchmarks/suite/responses")
+@pytest.mark.parametrize("name", sorted(RECORDED))
+def test_from_detection_recorded(benchmark, name):
+    predictions = RECORDED[name]["predictions"]
+    benchmark(lambda: [Hold.from_detection(prediction) for prediction in predictions])
+
+
+def _hit_points(holds, seed=0):
+    """Points near the centre of random holds, half of them inside"""
+    rng = np.random.default_rng(seed)
+    chosen = rng.choice(len(holds), HIT_TESTS)
+    offsets = rng.uniform(-0.6, 0.6, (HIT_TESTS, 2))
+    return [(holds[i], holds[i].x + dx * holds[i].width, holds[i].y + dy * holds[i].height)
+            for i, (dx, dy) in zip(chosen.tolist(), offsets.tolist())]
+
+
+def test_contains_point(benchmark, wall_holds):
+    points = _hit_points(wall_holds)
+    benchmark(lambda: [hold.contains_point(x, y) for hold, x, y in points])
+
+
+def test_contains_point_with_tolerance(benchmark, wall_holds):
+    points = _hit_points(wall_holds)
+    benchmark(lambda: [hold.contains_point(x, y, 1.0) for hold, x, y in points])
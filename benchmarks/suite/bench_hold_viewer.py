@@ -0,0 +1,61 @@
+"""HoldViewer rendering and click handling, offscreen (QT_QPA_PLATFORM=offscreen)."""
+import pytest
+from PyQt5.QtCore import QEvent, QPointF, QSize, Qt
+from PyQt5.QtGui import QColor, QImage, QMouseEvent, QPainter, QPixmap
+
+from benchmarks.suite.fixtures import WALL_HEIGHT, WALL_WIDTH
+from src.gui.widgets.hold_viewer import HoldViewer
+
+VIEWER_SIZE = QSize(1280, 800)
+
+# Clicks per round of the click benchmark
+CLICKS = 100
+
+
+@pytest.fixture
+def viewer(qapp, wall_holds):
+    viewer = HoldViewer()
+    viewer.resize(VIEWER_SIZE)
+    # Display sized decode of the wall, as the image loader delivers it
+    pixmap = QPixmap(WALL_WIDTH // 2, WALL_HEIGHT // 2)
+    pixmap.fill(QColor(120, 110, 100))
+    viewer.wall_image = pixmap
+    viewer.image_size = QSize(WALL_WIDTH, WALL_HEIGHT)
+    viewer.holds = wall_holds
+    for order, hold in enumerate(wall_holds[:12]):
+        hold.is_hand_selected, hold.hand_order = True, order
+    yield viewer
+    for hold in wall_holds:
+        hold.is_hand_selected, hold.hand_order = False, None
+        hold.is_foot_selected, hold.foot_order = False, None
+    viewer.deleteLater()
+
+
+def _paint(viewer: HoldViewer, target: QImage) -> None:
+    painter = QPainter(target)
+    viewer.render_view(painter)
+    painter.end()
+
+
+@pytest.mark.parametrize("zoom", [1.0, 4.0, 16.0], ids=lambda zoom: f"zoom{zoom:g}")
+def test_paint(benchmark, viewer, zoom):
+    viewer.zoom_at(QPointF(VIEWER_SIZE.width() / 2, VIEWER_SIZE.height() / 2), zoom)
+    target = QImage(VIEWER_SIZE, QImage.Format_ARGB32_Premultiplied)
+    _paint(viewer, target)  # Builds the path cache and the scaled image, like the first frame
+    benchmark(_paint, viewer, target)
+
+
+def test_click(benchmark, viewer, wall_holds):
+    # Click the centres of holds: selects, and deselects on the next round
+    holds = wall_holds[12:12 + CLICKS]
+    events = [
+        QMouseEvent(QEvent.MouseButtonPress, QPointF(*viewer.get_scaled_coordinates(hold.x, hold.y)),
+                    Qt.LeftButton, Qt.LeftButton, Qt.NoModifier)
+        for hold in holds
+    ]
+
+    def click_all():
+        for event in events:
+            viewer.mousePressEvent(event)
+
+    benchmark(click_all)
@@ -0,0 +1,38 @@
+"""RouteRepository I/O over catalogues of different sizes."""
+import itertools
+
+import pytest
+
+from src.storage.repositories.route_repository import RouteRepository
+
+
+@pytest.fixture(scope="session")
+def filled_repository(tmp_path_factory, route_catalogue):
+    repository = RouteRepository(tmp_path_factory.mktemp(f"routes{len(route_catalogue)}"))
+    repository.save_many(route_catalogue)
+    return repository
+
+
+def test_save(benchmark, filled_repository, route_catalogue):
+    routes = itertools.cycle(route_catalogue[:100])
+    benchmark(lambda: filled_repository.save(next(routes)))
+
+
+def test_save_many(benchmark, tmp_path_factory, route_catalogue):
+    def fresh_repository():
+        return (RouteRepository(tmp_path_factory.mktemp("batch")), route_catalogue), {}
+
+    benchmark.pedantic(lambda repository, routes: repository.save_many(routes),
+                       setup=fresh_repository, rounds=3)
+
+
+def test_get(benchmark, filled_repository, route_catalogue):
+    ids = itertools.cycle([str(route.id) for route in route_catalogue[::max(1, len(route_catalogue) // 100)]])
+    route = benchmark(lambda: filled_repository.get(next(ids)))
+    assert route is not None
+
+
+def test_get_all(benchmark, filled_repository, route_catalogue):
+    routes = benchmark.pedantic(filled_repository.get_all, rounds=3, warmup_rounds=1)
+    assert len(routes) == len(route_catalogue)
+
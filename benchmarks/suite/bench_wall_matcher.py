@@ -0,0 +1,22 @@
+"""Matching a re-photographed wall to its stored snapshot."""
+import numpy as np
+
+from src.core.analysis.wall_matcher import WallMatcher, project
+
+# Re-shoot from a little further away, slightly tilted and off-center
+RESHOOT = np.array([[0.85, -0.03, 120.0], [0.03, 0.85, -60.0], [1e-5, 0.0, 1.0]])
+
+
+def _reshoot(boxes, seed=0):
+    """Boxes as detected on another photo: moved, 10% of the holds missed, 2 px of noise"""
+    rng = np.random.default_rng(seed)
+    kept = boxes[rng.random(len(boxes)) > 0.1]
+    centers = project(RESHOOT, kept[:, :2]) + rng.normal(0, 2.0, (len(kept), 2))
+    return np.column_stack([centers, kept[:, 2:] * 0.85])
+
+
+def test_match_wall(benchmark, wall_holds):
+    reference = np.array([(hold.x, hold.y, hold.width, hold.height) for hold in wall_holds])
+    boxes = _reshoot(reference)
+    match = benchmark(WallMatcher().match_boxes, boxes, reference)
+    assert match is not None and len(match) > 0.8 * len(boxes)
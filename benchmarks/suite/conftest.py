@@ -0,0 +1,61 @@
+"""
+Shared fixtures of the pytest-benchmark suite.
+
+Usage (from the project root):
+    QT_QPA_PLATFORM=offscreen pytest benchmarks/suite
+    QT_QPA_PLATFORM=offscreen pytest benchmarks/suite --benchmark-save=baseline
+    QT_QPA_PLATFORM=offscreen pytest benchmarks/suite --benchmark-compare --benchmark-compare-fail=median:25%
+
+Baselines are stored per machine in benchmarks/suite/baselines, compare against a baseline
+recorded on the same machine. --large-catalogues adds the 100k route catalogue.
+"""
+import logging
+
+import pytest
+
+from benchmarks.suite.fixtures import make_roboflow_response, make_route_models
+
+# Hold counts of the synthetic walls
+WALL_SIZES = (50, 500, 2000)
+
+
+def pytest_addoption(parser):
+    parser.addoption("--large-catalogues", action="store_true",
+                     help="Also benchmark the repository with 100k routes (writes 100k files)")
+
+
+def pytest_configure(config):
+    # Log I/O is not what is measured here
+    logging.disable(logging.CRITICAL)
+
+
+def pytest_generate_tests(metafunc):
+    if "catalogue_size" in metafunc.fixturenames:
+        sizes = [10, 1_000, 10_000]
+        if metafunc.config.getoption("--large-catalogues"):
+            sizes.append(100_000)
+        metafunc.parametrize("catalogue_size", sizes, scope="session")
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture(scope="session", params=WALL_SIZES, ids=lambda count: f"{count}holds")
+def wall_response(request):
+    """Roboflow response of a synthetic wall"""
+    return make_roboflow_response(request.param, seed=request.param)
+
+
+@pytest.fixture(scope="session")
+def wall_holds(wall_response):
+    """Holds built from the wall response, as the DetectionWorker does"""
+    from src.core.hold import Hold
+    return [Hold.from_detection(prediction) for prediction in wall_response["predictions"]]
+
+
+@pytest.fixture(scope="session")
+def route_catalogue(catalogue_size):
+    return make_route_models(catalogue_size)
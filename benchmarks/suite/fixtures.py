@@ -0,0 +1,90 @@
+"""
+Synthetic, deterministic inputs of the benchmark suite.
+
+Walls are generated as Roboflow responses, in the exact schema of the hosted model's JSON output,
+so they exercise the same code as a real detection. Recorded responses placed as JSON files in
+benchmarks/suite/responses are benchmarked as well.
+"""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+from uuid import UUID
+
+import numpy as np
+
+from src.storage.models.route_model import ConnectionModel, RouteModel
+
+RESPONSES_DIR = Path(__file__).parent / "responses"
+
+# Size of the synthetic wall photo in pixels
+WALL_WIDTH = 4000
+WALL_HEIGHT = 3000
+
+# Vertices of a synthetic contour, similar to the dense masks the model returns
+CONTOUR_POINTS = 120
+
+
+def make_detection(rng: np.random.Generator, index: int, cx: float, cy: float, size: float) -> dict:
+    """One prediction as returned by the Roboflow instance segmentation model."""
+    angles = np.linspace(0, 2 * np.pi, CONTOUR_POINTS, endpoint=False)
+    # Irregular blob: a circle with a few low-frequency bumps and pixel noise
+    radius = size / 2 * (1 + 0.15 * np.sin(3 * angles + rng.uniform(0, 6)) + 0.08 * np.sin(5 * angles))
+    radius += rng.normal(0, 0.6, CONTOUR_POINTS)
+    xs = np.rint(cx + radius * np.cos(angles))
+    ys = np.rint(cy + radius * np.sin(angles))
+    return {
+        "x": float((xs.min() + xs.max()) / 2),
+        "y": float((ys.min() + ys.max()) / 2),
+        "width": float(xs.max() - xs.min()),
+        "height": float(ys.max() - ys.min()),
+        "confidence": float(rng.uniform(0.4, 0.99)),
+        "class": "hold",
+        "class_id": 0,
+        "detection_id": f"bench-{index:05d}",
+        "points": [{"x": float(x), "y": float(y)} for x, y in zip(xs, ys)],
+    }
+
+
+def make_roboflow_response(hold_count: int, seed: int = 0) -> dict:
+    """A detection response for a wall with hold_count holds spread over the photo."""
+    rng = np.random.default_rng(seed)
+    sizes = rng.uniform(25, 90, hold_count)
+    centers = rng.uniform((60, 60), (WALL_WIDTH - 60, WALL_HEIGHT - 60), (hold_count, 2))
+    return {
+        "predictions": [
+            make_detection(rng, i, cx, cy, size) for i, ((cx, cy), size) in enumerate(zip(centers, sizes))
+        ],
+        "image": {"width": str(WALL_WIDTH), "height": str(WALL_HEIGHT)},
+    }
+
+
+def load_recorded_responses() -> Dict[str, dict]:
+    """Recorded API responses, keyed by file name."""
+    if not RESPONSES_DIR.is_dir():
+        return {}
+    return {path.stem: json.loads(path.read_text()) for path in sorted(RESPONSES_DIR.glob("*.json"))}
+
+
+def make_route_models(count: int, holds_per_route: int = 12, seed: int = 0) -> List[RouteModel]:
+    """A catalogue of routes with hands, feet and connections, as saved by the main window."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2024, 1, 1)
+    routes = []
+    for i in range(count):
+        ids = [UUID(bytes=rng.bytes(16), version=4) for _ in range(holds_per_route)]
+        hands, feet = ids[:holds_per_route * 2 // 3], ids[holds_per_route * 2 // 3:]
+        routes.append(RouteModel(
+            name=f"Route {i}",
+            hold_ids=ids,
+            id=UUID(bytes=rng.bytes(16), version=4),
+            created_at=start + timedelta(minutes=i),
+            difficulty="6b+",
+            description="Synthetic benchmark route",
+            author="bench",
+            wall_hash="0" * 64,
+            hand_hold_ids=hands,
+            foot_hold_ids=feet,
+            connections=[ConnectionModel(a, b) for chain in (hands, feet) for a, b in zip(chain, chain[1:])],
+        ))
+    return routes
@@ -0,0 +1,135 @@
+from operator import itemgetter
+from typing import List, Tuple
+
+import numpy as np
+import shapely
+
+from src.utils.config import ProjectConfig
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+
+logger = setup_logger("api/detection_filter", ProjectConfig.get_log_file("roboflow"))
+
+_point_coordinates = itemgetter('x', 'y')
+
+
+def prediction_outlines(predictions: List[dict]) -> np.ndarray:
+    """
+    Build the outline polygons of API predictions at once.
+
+    Args:
+        predictions (List[dict]): Predictions of the API response, those without a usable
+            contour are represented by their box
+
+    Returns:
+        np.ndarray: (N,) array of shapely polygons, possibly invalid where a contour crosses itself
+    """
+    contours = []
+    for prediction in predictions:
+        points = prediction.get('points') or []
+        if len(points) >= 3:
+            contours.append(np.array(list(map(_point_coordinates, points)), dtype=np.float64))
+        else:
+            half_width, half_height = prediction['width'] / 2, prediction['height'] / 2
+            x, y = prediction['x'], prediction['y']
+            contours.append(np.array([(x - half_width, y - half_height), (x + half_width, y - half_height),
+                                      (x + half_width, y + half_height), (x - half_width, y + half_height)]))
+
+    if not contours:
+        return np.empty(0, dtype=object)
+
+    counts = np.array([len(contour) for contour in contours], dtype=np.int64)
+    index = np.repeat(np.arange(len(contours)), counts)
+    return shapely.polygons(shapely.linearrings(np.concatenate(contours), indices=index))
+
+
+def overlapping_pairs(outlines: np.ndarray, iou_threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the pairs of outlines overlapping by more than an intersection over union.
+
+    Note:
+        Candidate pairs come from an STR-tree over the outline boxes, so only outlines whose boxes
+        intersect are compared. The box intersection bounds the IoU from above, pairs that cannot
+        reach iou_threshold are dropped before the exact polygon intersections of the remaining
+        pairs are computed at once in GEOS. Self-intersecting outlines are repaired with
+        make_valid before any area is taken, a crossing contour has no meaningful raw area.
+
+    Args:
+        outlines (np.ndarray): (N,) shapely geometries
+        iou_threshold (float): Smallest IoU of a returned pair
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: First indices, second indices (first < second) and their IoU
+    """
+    invalid = ~shapely.is_valid(outlines)
+    if invalid.any():
+        outlines = outlines.copy()
+        outlines[invalid] = shapely.make_valid(outlines[invalid])
+
+    first, second = shapely.STRtree(outlines).query(outlines)
+    unique = first < second
+    first, second = first[unique], second[unique]
+
+    areas = shapely.area(outlines)
+    bounds = shapely.bounds(outlines)
+    box_width = np.minimum(bounds[first, 2], bounds[second, 2]) - np.maximum(bounds[first, 0], bounds[second, 0])
+    box_height = np.minimum(bounds[first, 3], bounds[second, 3]) - np.maximum(bounds[first, 1], bounds[second, 1])
+    largest = np.minimum(np.clip(box_width, 0, None) * np.clip(box_height, 0, None),
+                         np.minimum(areas[first], areas[second]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        possible = largest / (areas[first] + areas[second] - largest) > iou_threshold
+    first, second = first[possible], second[possible]
+
+    intersection = shapely.area(shapely.intersection(outlines[first], outlines[second]))
+    union = areas[first] + areas[second] - intersection
+    with np.errstate(invalid="ignore", divide="ignore"):
+        iou = np.where(union > 0, intersection / union, 0.0)
+    overlapping = iou > iou_threshold
+    return first[overlapping], second[overlapping], iou[overlapping]
+
+
+def suppress_overlapping(predictions: List[dict], iou_threshold: float) -> List[dict]:
+    """
+    Non-maximum suppression of overlapping hold polygons.
+
+    Note:
+        Predictions are visited by decreasing confidence. Every kept prediction suppresses the
+        less confident predictions its polygon overlaps by more than iou_threshold, so of a group
+        of near-duplicates only the most confident one is kept. Order of the kept predictions
+        is unchanged.
+
+    Args:
+        predictions (List[dict]): Predictions of the API response
+        iou_threshold (float): IoU above which two predictions are considered the same hold
+
+    Returns:
+        List[dict]: Kept predictions
+    """
+    if len(predictions) < 2:
+        return list(predictions)
+
+    with metrics.timer("detection_nms_seconds"):
+        first, second, _ = overlapping_pairs(prediction_outlines(predictions), iou_threshold)
+        if len(first) == 0:
+            return list(predictions)
+
+        confidence = np.array([prediction['confidence'] for prediction in predictions], dtype=np.float64)
+        # Overlapping predictions of every prediction, as CSR-style neighbour lists
+        pairs_from = np.concatenate([first, second])
+        pairs_to = np.concatenate([second, first])
+        order = np.argsort(pairs_from, kind="stable")
+        pairs_to = pairs_to[order]
+        offsets = np.searchsorted(pairs_from[order], np.arange(len(predictions) + 1))
+
+        suppressed = np.zeros(len(predictions), dtype=bool)
+        # Only predictions that overlap another one need to be visited
+        involved = np.unique(pairs_from)
+        for i in involved[np.argsort(-confidence[involved], kind="stable")].tolist():
+            if not suppressed[i]:
+                # A kept, more confident neighbour would have suppressed i, so all neighbours are less confident
+                suppressed[pairs_to[offsets[i]:offsets[i + 1]]] = True
+
+    kept = [prediction for prediction, removed in zip(predictions, suppressed.tolist()) if not removed]
+    metrics.increment("detection_suppressed_total", len(predictions) - len(kept))
+    logger.info(f"Suppressed {len(predictions) - len(kept)} overlapping detections, kept {len(kept)}")
+    return kept
@@ -6,8 +6,10 @@ import supervision as sv
 import cv2
 import numpy as np
 
+from src.api.detection_filter import suppress_overlapping
 from src.utils.config import ProjectConfig, RoboflowConfig
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 
 
 class RoboflowClient:
@@ -41,6 +43,10 @@ class RoboflowClient:
         """
         Detect holds on the climbing route image.
 
+        Note:
+            Overlapping predictions are suppressed by the IoU of their polygons, using
+            overlap_threshold of the config. The hosted model only compares boxes.
+
         Args:
             image_path (Path): Path to the image with the climbing route
 
@@ -49,11 +55,13 @@ class RoboflowClient:
         """
         self.logger.info(f"Detecting holds on the image: {image_path}")
 
-        result = self.model.predict(
-            str(image_path),
-            confidence=self.config.confidence_threshold,
-            # overlap=self.config.overlap_threshold # idk whether to leave this or not
-        ).json()
+        with metrics.timer("roboflow_detect_seconds"):
+            result = self.model.predict(
+                str(image_path),
+                confidence=self.config.confidence_threshold,
+            ).json()
+        metrics.increment("roboflow_predictions_total", len(result['predictions']))
+        result['predictions'] = suppress_overlapping(result['predictions'], self.config.overlap_threshold)
 
         self.logger.info(f"Detected {len(result['predictions'])} holds on the image.")
         return result
@@ -0,0 +1,64 @@
+"""
+Fit the route difficulty model on the graded routes of the catalogue.
+
+Every graded route whose wall snapshot is stored is used. The mean absolute error of a k-fold
+cross-validation is reported in grades, e.g. 0.8 means estimates are off by less than one grade
+step (6b -> 6b+) on average.
+
+Usage:
+    python -m src.core.analysis
+    python -m src.core.analysis --alpha 5 --output data/models/difficulty.json
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from src.core.analysis.difficulty import DifficultyModel, load_graded_catalogue
+from src.storage.repositories.route_repository import RouteRepository
+from src.storage.repositories.wall_repository import WallRepository
+from src.utils.config import ProjectConfig
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes-dir", type=Path, default=ProjectConfig.ROUTES_DIR, help="Route repository directory")
+    parser.add_argument("--walls-dir", type=Path, default=ProjectConfig.WALLS_DIR, help="Wall repository directory")
+    parser.add_argument("--output", type=Path, default=ProjectConfig.DIFFICULTY_MODEL_PATH, help="Model file to write")
+    parser.add_argument("--alpha", type=float, default=ProjectConfig.DIFFICULTY_ALPHA, help="L2 regularization strength")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds, 0 to skip validation")
+    return parser.parse_args(argv)
+
+
+def cross_validate(features: np.ndarray, scores: np.ndarray, alpha: float, folds: int) -> float:
+    """Mean absolute error of held-out predictions, in grade steps"""
+    order = np.random.default_rng(0).permutation(len(scores))
+    errors = []
+    for held_out in np.array_split(order, folds):
+        train = np.setdiff1d(order, held_out)
+        model = DifficultyModel.fit(features[train], scores[train], alpha)
+        errors.append(np.abs(model.predict(features[held_out]) - scores[held_out]))
+    return float(np.concatenate(errors).mean())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    features, scores = load_graded_catalogue(RouteRepository(args.routes_dir), WallRepository(args.walls_dir))
+    if len(scores) < 2:
+        print("Not enough graded routes with a stored wall to fit the difficulty model", file=sys.stderr)
+        return 1
+
+    if args.folds > 1 and len(scores) >= args.folds * 2:
+        error = cross_validate(features, scores, args.alpha, args.folds)
+        print(f"{args.folds}-fold cross-validated mean error: {error:.2f} grades", file=sys.stderr)
+
+    model = DifficultyModel.fit(features, scores, args.alpha)
+    model.save(args.output)
+    print(f"Fitted on {len(scores)} routes, saved to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from src.core.connection import Connection
+from src.core.hold import Hold
+from src.core.route import Route
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("core/analysis/beta_solver", ProjectConfig.get_log_file("core"))
+
+
+@dataclass
+class LimbSequence:
+    """
+    Proposed order of the holds of one limb type.
+
+    Attributes:
+        holds (List[Hold]): Holds in climbing order
+        cost (float): Total cost of the moves, in median hold sizes
+        feasible (bool): Whether every move is within reach
+    """
+    holds: List[Hold] = field(default_factory=list)
+    cost: float = 0.0
+    feasible: bool = True
+
+
+@dataclass
+class BetaSequence:
+    """
+    Proposed beta of a route: hand and foot holds in climbing order.
+
+    Attributes:
+        hands (LimbSequence): Ordered hand holds
+        feet (LimbSequence): Ordered foot holds
+    """
+    hands: LimbSequence
+    feet: LimbSequence
+
+    @property
+    def feasible(self) -> bool:
+        return self.hands.feasible and self.feet.feasible
+
+    @property
+    def connections(self) -> List[Connection]:
+        """Connections between consecutive holds of the same limb type, as drawn by the HoldViewer"""
+        connections = [Connection(a, b) for a, b in zip(self.hands.holds, self.hands.holds[1:])]
+        connections.extend(Connection(a, b) for a, b in zip(self.feet.holds, self.feet.holds[1:]))
+        return connections
+
+    def apply(self) -> None:
+        """Number the holds in the proposed order, as if they had been clicked in that order"""
+        for order, hold in enumerate(self.hands.holds):
+            hold.hand_order = order
+        for order, hold in enumerate(self.feet.holds):
+            hold.foot_order = order
+
+    def to_route(self, **kwargs) -> Route:
+        """
+        Route following the proposed order.
+        Args:
+            **kwargs: Additional route attributes
+        """
+        return Route(hand_holds=list(self.hands.holds), foot_holds=list(self.feet.holds),
+                     connections=self.connections, **kwargs)
+
+
+class BetaSolver:
+    """
+    Proposes the order in which the selected holds of a route are climbed.
+
+    Note:
+        Holds are sorted bottom to top and a dynamic program searches the cheapest order visiting
+        all of them, where every hold is climbed before the holds ranked window or more above it
+        by height. This keeps the search exact under that constraint and linear in the number of
+        holds: n * window * 2^window states instead of n!. Moves cost their length, moves longer
+        than the reach cost extra and so do moves down, distances are measured in median hold sizes.
+        Hands and feet are solved separately and memoized per set of hold IDs, so editing the feet
+        of a route reuses the hand sequence and going back to an earlier selection is free.
+    """
+
+    def __init__(self,
+                 hand_reach: float = ProjectConfig.BETA_HAND_REACH,
+                 foot_reach: float = ProjectConfig.BETA_FOOT_REACH,
+                 window: int = ProjectConfig.BETA_WINDOW,
+                 cache_size: int = ProjectConfig.MAX_CACHE_SIZE):
+        if window < 1:
+            raise ValueError(f"Beta solver window must be at least 1, got {window}")
+        self.hand_reach = hand_reach
+        self.foot_reach = foot_reach
+        self.window = window
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (limb, frozenset of hold IDs) -> (hold IDs in order, cost, feasible)
+
+    def solve(self, hand_holds: Sequence[Hold], foot_holds: Sequence[Hold]) -> BetaSequence:
+        """
+        Args:
+            hand_holds (Sequence[Hold]): Selected hand holds, in any order
+            foot_holds (Sequence[Hold]): Selected foot holds, in any order
+        Returns:
+            BetaSequence: The holds in proposed climbing order
+        """
+        with metrics.timer("beta_solve_seconds"):
+            unit = _unit(list(hand_holds) + list(foot_holds))
+            return BetaSequence(
+                hands=self._solve_limb("hand", hand_holds, self.hand_reach * unit, unit),
+                feet=self._solve_limb("foot", foot_holds, self.foot_reach * unit, unit),
+            )
+
+    def solve_selected(self, holds: Sequence[Hold]) -> BetaSequence:
+        """Solve the holds currently selected in the HoldViewer"""
+        return self.solve([h for h in holds if h.is_hand_selected], [h for h in holds if h.is_foot_selected])
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    def _solve_limb(self, limb: str, holds: Sequence[Hold], reach: float, unit: float) -> LimbSequence:
+        by_id: Dict = {hold.id: hold for hold in holds}
+        key = (limb, frozenset(by_id))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            metrics.increment("beta_cache_hits_total")
+        else:
+            cached = self._order(list(by_id.values()), reach, unit)
+            self._cache[key] = cached
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        order, cost, feasible = cached
+        return LimbSequence(holds=[by_id[hold_id] for hold_id in order], cost=cost, feasible=feasible)
+
+    def _order(self, holds: List[Hold], reach: float, unit: float) -> Tuple[List, float, bool]:
+        """Cheapest order of holds, as (hold IDs, cost, feasible)"""
+        if len(holds) < 2:
+            return [hold.id for hold in holds], 0.0, True
+
+        # Bottom to top; image y grows downwards
+        holds = sorted(holds, key=lambda h: (-h.y, h.x))
+        costs, over_reach = move_costs(np.array([(h.x, h.y) for h in holds]), reach, unit)
+        path, cost = windowed_path(costs.tolist(), min(self.window, len(holds)))
+        feasible = not any(over_reach[a, b] for a, b in zip(path, path[1:]))
+        if not feasible:
+            logger.debug(f"No order of {len(holds)} holds keeps every move within reach")
+        return [holds[i].id for i in path], cost, feasible
+
+
+def _unit(holds: Sequence[Hold]) -> float:
+    """Median longer bounding box side of the holds, the scale distances are measured in"""
+    sizes = [max(hold.width, hold.height) for hold in holds]
+    return float(np.median(sizes)) if sizes and np.median(sizes) > 0 else 1.0
+
+
+def move_costs(centers: np.ndarray, reach: float, unit: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cost of moving between every pair of holds.
+    Args:
+        centers (np.ndarray): (N, 2) hold centers in image coordinates
+        reach (float): Longest comfortable move in pixels
+        unit (float): Pixels per cost unit
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (N, N) costs and (N, N) mask of moves out of reach
+    """
+    distances = cdist(centers, centers)
+    down = np.maximum(centers[None, :, 1] - centers[:, None, 1], 0.0)
+    over = np.maximum(distances - reach, 0.0)
+    costs = (distances + ProjectConfig.BETA_DOWN_PENALTY * down + ProjectConfig.BETA_REACH_PENALTY * over) / unit
+    return costs, over > 0
+
+
+def windowed_path(costs: List[List[float]], window: int) -> Tuple[List[int], float]:
+    """
+    Cheapest path visiting every node once, where node i is visited before node j whenever
+    j >= i + window (Balas-Simonetti precedence constraint).
+
+    Note:
+        A state is (first unvisited node f, bitmask of visited nodes f+1..f+window-1, last node).
+        All nodes below f are visited and only nodes below f + window can be visited next, which
+        is exactly the precedence constraint. States of the same size are processed layer by layer.
+
+    Args:
+        costs (List[List[float]]): (N, N) move costs, nested lists for fast indexing
+        window (int): Size of the neighbourhood, 1 keeps the given order
+    Returns:
+        Tuple[List[int], float]: Node indices in visiting order and the total cost
+    """
+    count = len(costs)
+    # state -> (cost, previous state); a state is (first, mask, last)
+    layer = {}
+    for j in range(min(window, count)):
+        layer[_advance(0, 0, j)] = (0.0, None)
+    history = [layer]
+    for _ in range(count - 1):
+        next_layer = {}
+        for state, (cost, _) in layer.items():
+            first, mask, last = state
+            row = costs[last]
+            for offset in range(min(window, count - first)):
+                if offset and mask >> (offset - 1) & 1:
+                    continue
+                j = first + offset
+                new_cost = cost + row[j]
+                new_state = _advance(first, mask, j)
+                best = next_layer.get(new_state)
+                if best is None or new_cost < best[0]:
+                    next_layer[new_state] = (new_cost, state)
+        layer = next_layer
+        history.append(layer)
+
+    state, (cost, _) = min(layer.items(), key=lambda item: item[1][0])
+    total = cost
+    path = []
+    for layer in reversed(history):
+        path.append(state[2])
+        state = layer[state][1]
+    return path[::-1], total
+
+
+def _advance(first: int, mask: int, visited: int) -> Tuple[int, int, int]:
+    """State after visiting node visited from the state (first, mask, ...)"""
+    if visited == first:
+        # Move the frontier past every visited node
+        first += 1
+        while mask & 1:
+            mask >>= 1
+            first += 1
+        mask >>= 1
+    else:
+        mask |= 1 << (visited - first - 1)
+    return first, mask, visited
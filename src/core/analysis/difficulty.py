@@ -0,0 +1,336 @@
+import itertools
+import json
+import os
+import weakref
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.core.analysis.hold_analyzer import HoldAnalyzer
+from src.core.route import Route
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("core/analysis/difficulty", ProjectConfig.get_log_file("core"))
+
+# Grades of the French scale offered by the route toolbar and dialog, easiest first
+GRADES = (
+    "4a", "4b", "4c", "5a", "5b", "5c",
+    "6a", "6a+", "6b", "6b+", "6c", "6c+",
+    "7a", "7a+", "7b", "7b+", "7c", "7c+",
+)
+_GRADE_INDEX = {grade: index for index, grade in enumerate(GRADES)}
+
+# Columns of the feature matrix. Distances are in median hold sizes and areas relative to the
+# median hold area of the wall, so routes on photos of different resolution are comparable.
+FEATURE_NAMES = (
+    "hand_moves",
+    "foot_to_hand_ratio",
+    "reach_mean",
+    "reach_std",
+    "reach_max",
+    "crossovers",
+    "hand_area_mean",
+    "hand_area_min",
+    "foot_area_mean",
+    "height_gain",
+    "mean_height",
+    "lateral_span",
+)
+
+MODEL_FORMAT_VERSION = 1
+
+
+def grade_to_score(grade: Optional[str]) -> Optional[int]:
+    """Position of a grade on GRADES, None for missing or unknown grades"""
+    return _GRADE_INDEX.get(grade.strip().lower()) if grade else None
+
+
+def score_to_grade(score: float) -> str:
+    """Nearest grade of a continuous score"""
+    return GRADES[int(np.clip(np.rint(score), 0, len(GRADES) - 1))]
+
+
+def route_features(analyzer: HoldAnalyzer, routes: Sequence[Route]) -> np.ndarray:
+    """
+    Compute the difficulty features of many routes on one wall in one vectorized pass.
+
+    Args:
+        analyzer (HoldAnalyzer): Analyzer of the wall the routes are set on
+        routes (Sequence[Route]): Routes to describe
+
+    Returns:
+        np.ndarray: (R, len(FEATURE_NAMES)) float64 feature matrix
+    """
+    count = len(routes)
+    features = np.zeros((count, len(FEATURE_NAMES)))
+    if count == 0 or len(analyzer) == 0:
+        return features
+
+    statistics = analyzer.analyze_routes(routes)
+    unit = analyzer.median_hold_size or 1.0
+    areas = analyzer.areas
+    relative_areas = areas / (float(np.median(areas)) or 1.0)
+    hands, feet = analyzer._sequences(routes)
+    hand_counts = np.diff(hands.offsets)
+    foot_counts = np.diff(feet.offsets)
+    hand_route = np.repeat(np.arange(count), hand_counts)
+    foot_route = np.repeat(np.arange(count), foot_counts)
+
+    # Move distance distribution, from the per-route sums of distances and squared distances
+    moves, move_route = hands.moves(analyzer.centers)
+    reach = np.linalg.norm(moves, axis=1) / unit
+    move_counts = np.bincount(move_route, minlength=count)
+    reach_sum = np.bincount(move_route, reach, minlength=count)
+    reach_squares = np.bincount(move_route, reach ** 2, minlength=count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        reach_mean = np.where(move_counts > 0, reach_sum / move_counts, 0.0)
+        reach_var = np.where(move_counts > 0, reach_squares / move_counts - reach_mean ** 2, 0.0)
+
+    # Hold sizes
+    hand_area_sum = np.bincount(hand_route, relative_areas[hands.holds], minlength=count)
+    hand_area_min = np.full(count, np.inf)
+    np.minimum.at(hand_area_min, hand_route, relative_areas[hands.holds])
+    foot_area_sum = np.bincount(foot_route, relative_areas[feet.holds], minlength=count)
+
+    # Wall position, 0 at the lowest and 1 at the highest hold of the wall (image y grows downwards)
+    y_min, y_max = analyzer.centers[:, 1].min(), analyzer.centers[:, 1].max()
+    x_min, x_max = analyzer.centers[:, 0].min(), analyzer.centers[:, 0].max()
+    wall_height = (y_max - y_min) or 1.0
+    wall_width = (x_max - x_min) or 1.0
+    hand_x = analyzer.centers[hands.holds, 0]
+    hand_height = (y_max - analyzer.centers[hands.holds, 1]) / wall_height
+    span_min = np.full(count, np.inf)
+    span_max = np.full(count, -np.inf)
+    np.minimum.at(span_min, hand_route, hand_x)
+    np.maximum.at(span_max, hand_route, hand_x)
+
+    has_hands = hand_counts > 0
+    has_feet = foot_counts > 0
+    features[:, 0] = statistics.hand_moves
+    features[:, 1] = foot_counts / np.maximum(hand_counts, 1)
+    features[:, 2] = reach_mean
+    features[:, 3] = np.sqrt(np.maximum(reach_var, 0.0))
+    features[:, 4] = statistics.hand_reach_max / unit
+    features[:, 5] = statistics.crossovers
+    features[has_hands, 6] = hand_area_sum[has_hands] / hand_counts[has_hands]
+    features[has_hands, 7] = hand_area_min[has_hands]
+    features[has_feet, 8] = foot_area_sum[has_feet] / foot_counts[has_feet]
+    features[:, 9] = statistics.height_gain / wall_height
+    features[has_hands, 10] = np.bincount(hand_route, hand_height, minlength=count)[has_hands] / hand_counts[has_hands]
+    features[has_hands, 11] = (span_max - span_min)[has_hands] / wall_width
+    return features
+
+
+@dataclass
+class DifficultyModel:
+    """
+    Ridge regression from standardized route features to a position on GRADES.
+
+    Attributes:
+        mean (np.ndarray): Feature means of the training set
+        scale (np.ndarray): Feature standard deviations of the training set
+        coefficients (np.ndarray): Weight of every standardized feature
+        intercept (float): Score of an average route
+        feature_names (Tuple[str, ...]): Names of the features, in column order
+    """
+    mean: np.ndarray
+    scale: np.ndarray
+    coefficients: np.ndarray
+    intercept: float
+    feature_names: Tuple[str, ...] = FEATURE_NAMES
+
+    @classmethod
+    def fit(cls, features: np.ndarray, scores: np.ndarray, alpha: float = ProjectConfig.DIFFICULTY_ALPHA) -> 'DifficultyModel':
+        """
+        Fit the model in closed form.
+        Args:
+            features (np.ndarray): (R, F) feature matrix
+            scores (np.ndarray): (R,) grade positions, see grade_to_score
+            alpha (float): L2 regularization strength
+        Returns:
+            DifficultyModel: Fitted model
+        """
+        features = np.asarray(features, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.float64)
+        if len(features) == 0:
+            raise ValueError("Cannot fit the difficulty model without graded routes.")
+
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        standardized = (features - mean) / scale
+        intercept = float(scores.mean())
+        gram = standardized.T @ standardized + alpha * np.eye(features.shape[1])
+        coefficients = np.linalg.solve(gram, standardized.T @ (scores - intercept))
+        return cls(mean=mean, scale=scale, coefficients=coefficients, intercept=intercept)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            features (np.ndarray): (R, F) feature matrix
+        Returns:
+            np.ndarray: (R,) continuous grade positions
+        """
+        return ((np.asarray(features) - self.mean) / self.scale) @ self.coefficients + self.intercept
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Write the model as JSON, atomically"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        document = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "grades": list(GRADES),
+            "feature_names": list(self.feature_names),
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "coefficients": self.coefficients.tolist(),
+            "intercept": self.intercept,
+        }
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            tmp_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+            os.replace(tmp_path, path)
+            logger.info(f"Saved difficulty model to {path}")
+        except Exception as e:
+            logger.error(f"Failed to save difficulty model to {path}: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> Optional['DifficultyModel']:
+        """
+        Read a model written by save().
+        Returns:
+            DifficultyModel: The model, None if there is none or it does not match this version
+        """
+        path = Path(path)
+        if not path.exists():
+            return None
+        try:
+            document = json.loads(path.read_text(encoding="utf-8"))
+            if document.get("format_version") != MODEL_FORMAT_VERSION or \
+                    tuple(document["feature_names"]) != FEATURE_NAMES or tuple(document["grades"]) != GRADES:
+                logger.warning(f"Difficulty model {path} was fitted for other features or grades, refit it")
+                return None
+            return cls(
+                mean=np.array(document["mean"]),
+                scale=np.array(document["scale"]),
+                coefficients=np.array(document["coefficients"]),
+                intercept=float(document["intercept"]),
+            )
+        except Exception as e:
+            logger.error(f"Error loading difficulty model {path}: {str(e)}")
+            return None
+
+
+def _route_key(wall: int, route: Route) -> Tuple:
+    """Cache key of a route's features: the wall geometry and the route's holds in order"""
+    return wall, tuple(hold.id for hold in route.hand_holds), tuple(hold.id for hold in route.foot_holds)
+
+
+class DifficultyEstimator:
+    """
+    Estimates route grades from their geometry with a fitted DifficultyModel.
+
+    Note:
+        Features are cached per hold sequence, least recently used first out. Scoring a batch
+        only computes the features of routes whose holds changed since they were last scored,
+        all of them in one vectorized pass, so re-scoring after an edit costs one route.
+        Keys include the analyzer the features were computed with: re-photographed walls reuse
+        hold IDs with a different geometry, so the same holds on another analyzer are new rows.
+    """
+
+    def __init__(self, model: DifficultyModel, cache_size: int = ProjectConfig.DIFFICULTY_CACHE_SIZE):
+        self.model = model
+        self.cache_size = cache_size
+        self._features = OrderedDict()  # Route key -> feature row
+        self._walls = weakref.WeakKeyDictionary()  # HoldAnalyzer -> wall number of its route keys
+        self._wall_numbers = itertools.count()
+
+    @classmethod
+    def load(cls, path: Union[Path, str] = None) -> Optional['DifficultyEstimator']:
+        """Estimator with the saved model, None if no model was fitted yet"""
+        model = DifficultyModel.load(path or ProjectConfig.DIFFICULTY_MODEL_PATH)
+        return cls(model) if model is not None else None
+
+    def features(self, analyzer: HoldAnalyzer, routes: Sequence[Route]) -> np.ndarray:
+        """Feature matrix of routes on the analyzer's wall, computing only uncached rows"""
+        wall = self._walls.get(analyzer)
+        if wall is None:
+            wall = self._walls[analyzer] = next(self._wall_numbers)
+        keys = [_route_key(wall, route) for route in routes]
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in self._features and key not in missing:
+                missing[key] = i
+
+        if missing:
+            rows = route_features(analyzer, [routes[i] for i in missing.values()])
+            for key, row in zip(missing, rows):
+                self._features[key] = row
+
+        matrix = np.empty((len(routes), len(FEATURE_NAMES)))
+        for i, key in enumerate(keys):
+            matrix[i] = self._features[key]
+            self._features.move_to_end(key)
+        while len(self._features) > self.cache_size:
+            self._features.popitem(last=False)
+        return matrix
+
+    def score_routes(self, analyzer: HoldAnalyzer, routes: Sequence[Route]) -> np.ndarray:
+        """
+        Args:
+            analyzer (HoldAnalyzer): Analyzer of the wall the routes are set on
+            routes (Sequence[Route]): Routes to score
+        Returns:
+            np.ndarray: (R,) continuous grade positions
+        """
+        return self.model.predict(self.features(analyzer, routes))
+
+    def estimate_grades(self, analyzer: HoldAnalyzer, routes: Sequence[Route]) -> List[str]:
+        """Estimated grade of every route"""
+        return [score_to_grade(score) for score in self.score_routes(analyzer, routes)]
+
+    def estimate(self, analyzer: HoldAnalyzer, route: Route) -> str:
+        """Estimated grade of one route, e.g. after it was edited"""
+        return self.estimate_grades(analyzer, [route])[0]
+
+
+def load_graded_catalogue(route_repository, wall_repository) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Features and grades of every graded route whose wall snapshot is stored.
+
+    Args:
+        route_repository (RouteRepository): Routes with their difficulty
+        wall_repository (WallRepository): Wall snapshots the routes refer to
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (R, F) features and (R,) grade positions
+    """
+    models_by_wall: Dict[str, list] = defaultdict(list)
+    skipped = 0
+    for model in route_repository.iter_all():
+        if model.wall_hash and grade_to_score(model.difficulty) is not None:
+            models_by_wall[model.wall_hash].append(model)
+        else:
+            skipped += 1
+
+    features, scores = [], []
+    for wall_hash, models in models_by_wall.items():
+        wall = wall_repository.get(wall_hash)
+        if wall is None:
+            skipped += len(models)
+            continue
+        holds = wall.to_holds()
+        routes = [Route.from_model(model, holds) for model in models]
+        features.append(route_features(HoldAnalyzer(holds), routes))
+        scores.append([grade_to_score(model.difficulty) for model in models])
+
+    logger.info(f"Loaded {sum(len(s) for s in scores)} graded routes from {len(scores)} walls, skipped {skipped}")
+    if not features:
+        return np.empty((0, len(FEATURE_NAMES))), np.empty(0)
+    return np.concatenate(features), np.concatenate(scores).astype(np.float64)
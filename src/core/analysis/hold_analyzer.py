@@ -1,2 +1,312 @@
-from sklearn.cluster import DBSCAN
-#TODO add the logic for clusterization of holds in one place if nessecery
\ No newline at end of file
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+import shapely
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+
+from src.core.hold import Hold
+from src.core.route import Route
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("core/analysis/hold_analyzer", ProjectConfig.get_log_file("core"))
+
+# Neighbours per hold in the k-NN graph
+DEFAULT_NEIGHBORS = 8
+
+# Sideways offset, in median hold widths, below which a move counts as straight up or down
+CROSSOVER_MIN_OFFSET = 0.5
+
+
+def hold_outlines(holds: Sequence[Hold]) -> np.ndarray:
+    """
+    Build the outline polygons of many holds at once.
+
+    Args:
+        holds (Sequence[Hold]): Holds, those without a usable contour are represented by their box
+
+    Returns:
+        np.ndarray: (N,) array of shapely polygons
+    """
+    contours = []
+    for hold in holds:
+        if len(hold.contour_points) >= 3:
+            contours.append(np.array([(p.x, p.y) for p in hold.contour_points], dtype=np.float64))
+        else:
+            x_min, y_min, x_max, y_max = hold.bounds
+            contours.append(np.array([(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]))
+
+    if not contours:
+        return np.empty(0, dtype=object)
+
+    counts = np.array([len(contour) for contour in contours], dtype=np.int64)
+    hold_index = np.repeat(np.arange(len(contours)), counts)
+    return shapely.make_valid(shapely.polygons(shapely.linearrings(np.concatenate(contours), indices=hold_index)))
+
+
+@dataclass
+class MoveStatistics:
+    """
+    Move statistics of many routes, one row per route (columnar).
+
+    Note:
+        Distances are in image pixels, center to center. Image y grows downwards, so a route
+        climbing up has a positive height_gain. Crossovers assume the hands alternate along the
+        hand sequence: a hand move crosses the other hand when it goes sideways in the same
+        direction as the previous move.
+
+    Attributes:
+        route_ids (List[UUID]): Route of every row
+        hand_moves (np.ndarray): Number of hand moves
+        foot_moves (np.ndarray): Number of foot moves
+        hand_reach_mean (np.ndarray): Mean hand move distance, 0 without moves
+        hand_reach_max (np.ndarray): Longest hand move
+        foot_reach_mean (np.ndarray): Mean foot move distance
+        foot_reach_max (np.ndarray): Longest foot move
+        hand_distance (np.ndarray): Total distance travelled by the hands
+        height_gain (np.ndarray): Height between the first and the last hand hold
+        crossovers (np.ndarray): Number of crossing hand moves
+    """
+    route_ids: List[UUID]
+    hand_moves: np.ndarray
+    foot_moves: np.ndarray
+    hand_reach_mean: np.ndarray
+    hand_reach_max: np.ndarray
+    foot_reach_mean: np.ndarray
+    foot_reach_max: np.ndarray
+    hand_distance: np.ndarray
+    height_gain: np.ndarray
+    crossovers: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.route_ids)
+
+    def row(self, index: int) -> Dict[str, object]:
+        """Statistics of one route as a dictionary"""
+        return {name: (value[index].item() if isinstance(value, np.ndarray) else value[index])
+                for name, value in vars(self).items()}
+
+
+class _Sequences:
+    """
+    Hold sequences of many routes packed into flat arrays.
+
+    Attributes:
+        holds (np.ndarray): Hold indices of all sequences, concatenated
+        offsets (np.ndarray): (R + 1,) sequence r is holds[offsets[r]:offsets[r + 1]]
+    """
+
+    def __init__(self, sequences: List[List[int]]):
+        counts = np.array([len(sequence) for sequence in sequences], dtype=np.int64)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.holds = np.fromiter((i for sequence in sequences for i in sequence), dtype=np.int64, count=int(counts.sum()))
+
+    def moves(self, centers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vector of every move between consecutive holds of the same sequence.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (M, 2) move vectors and (M,) sequence of each move
+        """
+        route_of_hold = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+        same_route = route_of_hold[1:] == route_of_hold[:-1]
+        points = centers[self.holds]
+        return (points[1:] - points[:-1])[same_route], route_of_hold[1:][same_route]
+
+
+class HoldAnalyzer:
+    """
+    Geometric analysis of the holds of one wall: neighbour graphs, clusters and route moves.
+
+    Note:
+        Hold centers are indexed in a KD-tree once. Neighbour queries, graphs and the statistics
+        of any number of routes are then computed with vectorized array operations, without
+        per-pair Python loops. Routes are matched to the wall's holds by hold ID.
+
+    Attributes:
+        holds (List[Hold]): Analyzed holds
+        centers (np.ndarray): (N, 2) hold centers
+        sizes (np.ndarray): (N, 2) bounding box width and height
+        tree (cKDTree): KD-tree over the centers
+    """
+
+    def __init__(self, holds: Sequence[Hold]):
+        self.holds = list(holds)
+        self.centers = np.array([(hold.x, hold.y) for hold in self.holds], dtype=np.float64).reshape(-1, 2)
+        self.sizes = np.array([(hold.width, hold.height) for hold in self.holds], dtype=np.float64).reshape(-1, 2)
+        self.tree = cKDTree(self.centers)
+        self._index_of: Dict[UUID, int] = {hold.id: i for i, hold in enumerate(self.holds)}
+        self._outlines: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.holds)
+
+    def index_of(self, hold: Hold) -> int:
+        """Index of a hold of the wall, KeyError for foreign holds"""
+        return self._index_of[hold.id]
+
+    @property
+    def outlines(self) -> np.ndarray:
+        """(N,) shapely polygons of the hold contours, built on first use"""
+        if self._outlines is None:
+            self._outlines = hold_outlines(self.holds)
+        return self._outlines
+
+    @property
+    def areas(self) -> np.ndarray:
+        """(N,) contour areas in square pixels"""
+        return shapely.area(self.outlines)
+
+    @property
+    def median_hold_size(self) -> float:
+        """Median of the longer bounding box side, a scale for the wall's distances"""
+        return float(np.median(self.sizes.max(axis=1))) if len(self.holds) else 0.0
+
+    def nearest(self, k: int = DEFAULT_NEIGHBORS) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k nearest other holds of every hold.
+        Args:
+            k (int): Neighbours per hold, fewer if the wall has fewer holds
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (N, k) center distances and (N, k) hold indices, nearest first
+        """
+        k = min(k, len(self.holds) - 1)
+        if k <= 0:
+            return np.empty((len(self.holds), 0)), np.empty((len(self.holds), 0), dtype=np.int64)
+        distances, indices = self.tree.query(self.centers, k + 1)
+        return distances[:, 1:], indices[:, 1:]  # The first hit of every hold is itself
+
+    def knn_graph(self, k: int = DEFAULT_NEIGHBORS) -> csr_matrix:
+        """
+        Symmetric k-nearest-neighbour graph.
+        Returns:
+            csr_matrix: (N, N) center distances, an edge if either hold is among the other's k nearest
+        """
+        distances, indices = self.nearest(k)
+        rows = np.repeat(np.arange(len(self.holds)), indices.shape[1])
+        graph = coo_matrix((distances.ravel(), (rows, indices.ravel())), shape=(len(self.holds),) * 2).tocsr()
+        return graph.maximum(graph.T)
+
+    def radius_pairs(self, radius: float, contour: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All pairs of holds closer than radius.
+        Args:
+            radius (float): Largest distance in pixels
+            contour (bool): Measure the gap between the contours instead of the center distance
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (P, 2) index pairs with i < j and (P,) their distances
+        """
+        if not contour:
+            pairs = self.tree.query_pairs(radius, output_type="ndarray")
+            distances = np.linalg.norm(self.centers[pairs[:, 0]] - self.centers[pairs[:, 1]], axis=1)
+            return pairs, distances
+
+        # Contours can only be within radius if the centers are within radius plus both half diagonals
+        reach = radius + float(np.hypot(*self.sizes.max(axis=0))) if len(self.holds) else radius
+        pairs = self.tree.query_pairs(reach, output_type="ndarray")
+        half_diagonals = np.hypot(self.sizes[:, 0], self.sizes[:, 1]) / 2
+        center_distances = np.linalg.norm(self.centers[pairs[:, 0]] - self.centers[pairs[:, 1]], axis=1)
+        pairs = pairs[center_distances <= radius + half_diagonals[pairs[:, 0]] + half_diagonals[pairs[:, 1]]]
+
+        gaps = shapely.distance(self.outlines[pairs[:, 0]], self.outlines[pairs[:, 1]])
+        close = gaps <= radius
+        return pairs[close], gaps[close]
+
+    def radius_graph(self, radius: float, contour: bool = False) -> csr_matrix:
+        """
+        Symmetric graph of all holds closer than radius, see radius_pairs.
+        Returns:
+            csr_matrix: (N, N) distances, touching contours are stored as a tiny positive distance
+        """
+        pairs, distances = self.radius_pairs(radius, contour)
+        weights = np.maximum(distances, np.finfo(np.float64).tiny)  # Explicit zeros would drop the edge
+        n = len(self.holds)
+        graph = coo_matrix((weights, (pairs[:, 0], pairs[:, 1])), shape=(n, n)).tocsr()
+        return graph + graph.T
+
+    def clusters(self, radius: float, contour: bool = True) -> np.ndarray:
+        """
+        Group holds that are closer than radius to each other, e.g. volumes with screw-ons.
+        Args:
+            radius (float): Largest gap in pixels within a group
+            contour (bool): Measure the gap between contours instead of centers
+        Returns:
+            np.ndarray: (N,) cluster label of every hold
+        """
+        _, labels = connected_components(self.radius_graph(radius, contour), directed=False)
+        return labels
+
+    def _sequences(self, routes: Sequence[Route]) -> Tuple[_Sequences, _Sequences]:
+        index_of = self._index_of
+        hands = _Sequences([[index_of[hold.id] for hold in route.hand_holds] for route in routes])
+        feet = _Sequences([[index_of[hold.id] for hold in route.foot_holds] for route in routes])
+        return hands, feet
+
+    def reach_distances(self, route: Route) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Distances of the consecutive hand moves and foot moves of a route.
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Hand move distances and foot move distances, in pixels
+        """
+        hands, feet = self._sequences([route])
+        return (np.linalg.norm(hands.moves(self.centers)[0], axis=1),
+                np.linalg.norm(feet.moves(self.centers)[0], axis=1))
+
+    def analyze_routes(self, routes: Sequence[Route]) -> MoveStatistics:
+        """
+        Move statistics of many routes in one vectorized pass.
+        Args:
+            routes (Sequence[Route]): Routes set on this wall
+        Returns:
+            MoveStatistics: One row per route, in the order of routes
+        """
+        count = len(routes)
+        hands, feet = self._sequences(routes)
+
+        hand_moves, hand_route = hands.moves(self.centers)
+        foot_moves, foot_route = feet.moves(self.centers)
+        hand_reach = np.linalg.norm(hand_moves, axis=1)
+        foot_reach = np.linalg.norm(foot_moves, axis=1)
+
+        hand_count = np.bincount(hand_route, minlength=count)
+        foot_count = np.bincount(foot_route, minlength=count)
+        hand_distance = np.bincount(hand_route, hand_reach, minlength=count)
+        foot_distance = np.bincount(foot_route, foot_reach, minlength=count)
+        hand_reach_max = np.zeros(count)
+        np.maximum.at(hand_reach_max, hand_route, hand_reach)
+        foot_reach_max = np.zeros(count)
+        np.maximum.at(foot_reach_max, foot_route, foot_reach)
+
+        # A crossover is a sideways move in the same direction as the previous move of the other hand
+        sideways = hand_moves[:, 0]
+        min_offset = CROSSOVER_MIN_OFFSET * self.median_hold_size
+        direction = np.where(np.abs(sideways) > min_offset, np.sign(sideways), 0)
+        crossing = (direction[1:] * direction[:-1] > 0) & (hand_route[1:] == hand_route[:-1])
+        crossovers = np.bincount(hand_route[1:][crossing], minlength=count)
+
+        # First and last hand hold of every route with hands
+        has_hands = np.diff(hands.offsets) > 0
+        height_gain = np.zeros(count)
+        first = hands.holds[hands.offsets[:-1][has_hands]]
+        last = hands.holds[hands.offsets[1:][has_hands] - 1]
+        height_gain[has_hands] = self.centers[first, 1] - self.centers[last, 1]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hand_reach_mean = np.where(hand_count > 0, hand_distance / hand_count, 0.0)
+            foot_reach_mean = np.where(foot_count > 0, foot_distance / foot_count, 0.0)
+
+        return MoveStatistics(
+            route_ids=[route.id for route in routes],
+            hand_moves=hand_count,
+            foot_moves=foot_count,
+            hand_reach_mean=hand_reach_mean,
+            hand_reach_max=hand_reach_max,
+            foot_reach_mean=foot_reach_mean,
+            foot_reach_max=foot_reach_max,
+            hand_distance=hand_distance,
+            height_gain=height_gain,
+            crossovers=crossovers,
+        )
@@ -0,0 +1,357 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial import cKDTree
+
+from src.core.hold import Hold
+from src.storage.models.wall_model import WallModel
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("core/analysis/wall_matcher", ProjectConfig.get_log_file("core"))
+
+# Nearest holds describing the surroundings of a hold
+NEIGHBORS = 5
+
+# Relative difference of the distance and difference of the direction (radians) to a
+# neighbour within which two holds see it at the same place
+DISTANCE_TOLERANCE = 0.15
+ANGLE_TOLERANCE = 0.15
+
+# Neighbour offsets two holds must share to be paired before the homography is known
+SHARED_NEIGHBORS = 4
+
+# Rounds of re-pairing holds with the refined homography
+REFINE_ROUNDS = 2
+
+
+@dataclass
+class WallMatch:
+    """
+    Alignment of a new detection to a stored wall.
+
+    Attributes:
+        homography (np.ndarray): (3, 3) maps new image coordinates onto the stored wall image
+        pairs (np.ndarray): (K, 2) index of the new hold and of the stored hold it is matched to
+        errors (np.ndarray): (K,) distance of each pair after alignment, in stored image pixels
+        inliers (int): Holds consistent with the homography found by RANSAC
+    """
+    homography: np.ndarray
+    pairs: np.ndarray
+    errors: np.ndarray
+    inliers: int
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+
+def estimate_homography(source: np.ndarray, target: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Least squares homography from 4 or more point pairs (normalized DLT).
+    Args:
+        source (np.ndarray): (K, 2) points
+        target (np.ndarray): (K, 2) corresponding points
+    Returns:
+        np.ndarray: (3, 3) homography mapping source onto target, None for degenerate points
+    """
+    source_norm, source_points = _normalize(source)
+    target_norm, target_points = _normalize(target)
+    x, y = source_points[:, 0], source_points[:, 1]
+    u, v = target_points[:, 0], target_points[:, 1]
+    zeros, ones = np.zeros_like(x), np.ones_like(x)
+    system = np.concatenate([
+        np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y, -u], axis=1),
+        np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y, -v], axis=1),
+    ])
+    _, singular_values, vt = np.linalg.svd(system, full_matrices=False)
+    if singular_values[-2] < 1e-12:
+        return None
+    homography = np.linalg.inv(target_norm) @ vt[-1].reshape(3, 3) @ source_norm
+    return homography / homography[2, 2] if abs(homography[2, 2]) > 1e-12 else None
+
+
+def _normalize(points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Similarity moving points to zero mean and sqrt(2) mean distance, and the moved points"""
+    mean = points.mean(axis=0)
+    spread = np.linalg.norm(points - mean, axis=1).mean() or 1.0
+    scale = np.sqrt(2) / spread
+    transform = np.array([[scale, 0, -scale * mean[0]], [0, scale, -scale * mean[1]], [0, 0, 1]])
+    return transform, (points - mean) * scale
+
+
+def project(homography: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Apply a homography to (K, 2) points"""
+    projected = points @ homography[:, :2].T + homography[:, 2]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return projected[:, :2] / projected[:, 2:]
+
+
+def ransac_homography(source: np.ndarray, target: np.ndarray, threshold: float,
+                      iterations: int = ProjectConfig.WALL_MATCH_ITERATIONS,
+                      seed: int = 0) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """
+    Homography consistent with the most point pairs, robust to wrong pairs.
+
+    Note:
+        All hypotheses are fitted to 4 random pairs and scored against every pair at once, as
+        batched 8x8 linear solves and one (hypotheses, pairs) residual matrix. The best one is
+        refitted to its inliers.
+
+    Args:
+        source (np.ndarray): (K, 2) points
+        target (np.ndarray): (K, 2) putative corresponding points, many may be wrong
+        threshold (float): Largest distance of an inlier after projection, in target units
+        iterations (int): Hypotheses tried
+        seed (int): Seed of the sampling, results are deterministic
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (3, 3) homography, None if no hypothesis fits, and the (K,) inlier mask
+    """
+    count = len(source)
+    if count < 4:
+        return None, np.zeros(count, dtype=bool)
+
+    # Hypotheses are fitted in normalized coordinates, where the systems are well conditioned
+    source_norm, normalized_source = _normalize(source)
+    target_norm, normalized_target = _normalize(target)
+    normalized_threshold = threshold * target_norm[0, 0]
+
+    rng = np.random.default_rng(seed)
+    samples = np.argsort(rng.random((iterations, count)), axis=1)[:, :4] if count <= 64 else \
+        rng.integers(0, count, (iterations, 4))
+    x, y = normalized_source[samples, 0], normalized_source[samples, 1]
+    u, v = normalized_target[samples, 0], normalized_target[samples, 1]
+    zeros, ones = np.zeros_like(x), np.ones_like(x)
+    # (iterations, 8, 8) systems with h33 = 1
+    rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y], axis=2)
+    rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y], axis=2)
+    systems = np.concatenate([rows_u, rows_v], axis=1)
+    values = np.concatenate([u, v], axis=1)
+
+    # Drop degenerate samples, e.g. repeated or collinear points
+    solvable = np.abs(np.linalg.det(systems)) > 1e-9
+    if not solvable.any():
+        return None, np.zeros(count, dtype=bool)
+    solutions = np.linalg.solve(systems[solvable], values[solvable][:, :, None])[:, :, 0]
+    homographies = np.concatenate([solutions, np.ones((len(solutions), 1))], axis=1).reshape(-1, 3, 3)
+
+    projected = np.einsum("hij,kj->hki", homographies, np.column_stack([normalized_source, np.ones(count)]))
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        errors = np.linalg.norm(projected[:, :, :2] / projected[:, :, 2:] - normalized_target, axis=2)
+    inlier_counts = np.count_nonzero(errors < normalized_threshold, axis=1)
+    best = int(np.argmax(inlier_counts))
+    inliers = errors[best] < normalized_threshold
+    if inliers.sum() < 4:
+        return None, inliers
+    best_homography = np.linalg.inv(target_norm) @ homographies[best] @ source_norm
+    best_homography /= best_homography[2, 2]
+
+    refined = estimate_homography(source[inliers], target[inliers])
+    if refined is None:
+        return best_homography, inliers
+    with np.errstate(invalid="ignore"):
+        refined_inliers = np.linalg.norm(project(refined, source) - target, axis=1) < threshold
+    if refined_inliers.sum() >= inliers.sum():
+        return refined, refined_inliers
+    return best_homography, inliers
+
+
+def _neighbor_offsets(centers: np.ndarray) -> np.ndarray:
+    """
+    (N, NEIGHBORS, 2) log distance and direction from every point to its nearest other points,
+    scaled so that one unit is the tolerated difference between two photos.
+    """
+    k = min(NEIGHBORS, len(centers) - 1)
+    _, neighbors = cKDTree(centers).query(centers, k + 1)
+    offsets = centers[neighbors[:, 1:]] - centers[:, None, :]
+    distances = np.maximum(np.linalg.norm(offsets, axis=2), 1e-9)
+    angles = np.arctan2(offsets[..., 1], offsets[..., 0])
+    return np.stack([np.log(distances) / DISTANCE_TOLERANCE, angles / ANGLE_TOLERANCE], axis=2)
+
+
+def _putative_pairs(centers: np.ndarray, reference_centers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pairs of holds whose surroundings look alike, both point sets in units of their median hold size.
+
+    Note:
+        Every hold is described by the distances and directions to its NEIGHBORS nearest holds.
+        Two holds are paired when at least SHARED_NEIGHBORS of those agree within
+        DISTANCE_TOLERANCE and ANGLE_TOLERANCE, found with one KD-tree query over the neighbours
+        of both photos. Relative distances absorb small errors of the zoom estimate and the
+        directions tolerate a slightly tilted camera. The pattern of a few neighbours survives
+        missed detections and moved holds nearby, while unrelated holds rarely share it.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Indices of the new and of the stored holds of each pair
+    """
+    offsets = _neighbor_offsets(centers)
+    reference_offsets = _neighbor_offsets(reference_centers)
+    k, reference_k = offsets.shape[1], reference_offsets.shape[1]
+
+    # Directions just below -pi and just above pi are the same, the stored ones are repeated a turn apart
+    turn = 2 * np.pi / ANGLE_TOLERANCE
+    flat = reference_offsets.reshape(-1, 2)
+    owner = np.repeat(np.arange(len(reference_centers)), reference_k)
+    wrapped = np.abs(flat[:, 1]) > turn / 2 - 1
+    shifted = flat[wrapped] - np.column_stack([np.zeros(wrapped.sum()), np.sign(flat[wrapped, 1]) * turn])
+    flat, owner = np.concatenate([flat, shifted]), np.concatenate([owner, owner[wrapped]])
+
+    agreeing = cKDTree(offsets.reshape(-1, 2)).sparse_distance_matrix(cKDTree(flat), 1.0, output_type="ndarray")
+    pair_keys = (agreeing["i"] // k).astype(np.int64) * len(reference_centers) + owner[agreeing["j"]]
+    pair_keys, shared = np.unique(pair_keys, return_counts=True)
+    pair_keys = pair_keys[shared >= min(SHARED_NEIGHBORS, k, reference_k)]
+    return pair_keys // len(reference_centers), pair_keys % len(reference_centers)
+
+
+def _assign(projected: np.ndarray, reference_centers: np.ndarray, tree: cKDTree, gate: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One-to-one pairs of projected and reference points closer than gate with the smallest total distance.
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (K, 2) index pairs and their (K,) distances
+    """
+    # Points sent to infinity by the homography are moved out of reach
+    projected = np.where(np.isfinite(projected), projected, -1e12)
+    candidates = cKDTree(projected).sparse_distance_matrix(tree, gate, output_type="ndarray")
+    if len(candidates) == 0:
+        return np.empty((0, 2), dtype=np.int64), np.empty(0)
+    rows, columns, distances = candidates["i"], candidates["j"], candidates["v"]
+
+    # Holds with a single candidate that no other hold competes for are paired directly,
+    # the Hungarian algorithm only runs on the ambiguous rest
+    row_counts = np.bincount(rows, minlength=len(projected))
+    column_counts = np.bincount(columns, minlength=len(reference_centers))
+    unique = (row_counts[rows] == 1) & (column_counts[columns] == 1)
+    pairs = [np.column_stack([rows[unique], columns[unique]])]
+    errors = [distances[unique]]
+
+    rest = ~unique
+    if rest.any():
+        row_ids, row_index = np.unique(rows[rest], return_inverse=True)
+        column_ids, column_index = np.unique(columns[rest], return_inverse=True)
+        unmatched = gate * len(row_ids) + 1.0
+        costs = np.full((len(row_ids), len(column_ids)), unmatched)
+        costs[row_index, column_index] = distances[rest]
+        assigned_rows, assigned_columns = linear_sum_assignment(costs)
+        valid = costs[assigned_rows, assigned_columns] < unmatched
+        pairs.append(np.column_stack([row_ids[assigned_rows[valid]], column_ids[assigned_columns[valid]]]))
+        errors.append(costs[assigned_rows[valid], assigned_columns[valid]])
+
+    return np.concatenate(pairs).astype(np.int64), np.concatenate(errors)
+
+
+class WallMatcher:
+    """
+    Matches the holds of a new photo to those of a stored photo of the same wall.
+
+    Note:
+        Photos are assumed to be taken upright, they may differ in distance, framing and angle.
+        Distances are measured in median hold sizes of each photo, which makes the search
+        independent of zoom. Holds are first paired by the pattern of their nearest neighbours
+        and RANSAC fits the homography to the pairs that agree, rejecting wrong pairs and holds
+        that were moved or missed. Holds are then re-paired under the homography, which is
+        refitted, and finally assigned one to one with the Hungarian algorithm within max_error.
+
+    Attributes:
+        max_error (float): Largest distance of a matched pair after alignment, in median hold sizes
+        min_ratio (float): Share of the holds of the smaller photo that must align for a match
+        min_holds (int): Fewest aligned holds for a match
+    """
+
+    def __init__(self,
+                 max_error: float = ProjectConfig.WALL_MATCH_MAX_ERROR,
+                 min_ratio: float = ProjectConfig.WALL_MATCH_MIN_RATIO,
+                 min_holds: int = ProjectConfig.WALL_MATCH_MIN_HOLDS):
+        self.max_error = max_error
+        self.min_ratio = min_ratio
+        self.min_holds = max(min_holds, 4)
+
+    def match(self, holds: Sequence[Hold], reference: Sequence[Hold]) -> Optional[WallMatch]:
+        """
+        Args:
+            holds (Sequence[Hold]): Holds of the new photo
+            reference (Sequence[Hold]): Holds of the stored photo
+        Returns:
+            WallMatch: The alignment, None if the photos do not show the same wall
+        """
+        return self.match_boxes(_boxes(holds), _boxes(reference))
+
+    def match_wall(self, holds: Sequence[Hold], wall: WallModel) -> Optional[WallMatch]:
+        """Match holds to a wall snapshot, without recreating its holds"""
+        return self.match_boxes(_boxes(holds), wall.boxes)
+
+    def match_boxes(self, boxes: np.ndarray, reference_boxes: np.ndarray) -> Optional[WallMatch]:
+        """
+        Args:
+            boxes (np.ndarray): (N, 4) x, y, width, height of the new holds (box centers)
+            reference_boxes (np.ndarray): (M, 4) boxes of the stored holds
+        Returns:
+            WallMatch: The alignment, None if the photos do not show the same wall
+        """
+        required = max(self.min_holds, int(np.ceil(self.min_ratio * min(len(boxes), len(reference_boxes)))))
+        if min(len(boxes), len(reference_boxes)) < required:
+            return None
+
+        with metrics.timer("wall_match_seconds"):
+            centers, sizes = boxes[:, :2], boxes[:, 2:].max(axis=1)
+            reference_centers, reference_sizes = reference_boxes[:, :2], reference_boxes[:, 2:].max(axis=1)
+            unit = float(np.median(sizes)) or 1.0
+            reference_unit = float(np.median(reference_sizes)) or 1.0
+            tree = cKDTree(reference_centers)
+
+            # Candidate pairs in hold sizes, which takes out the difference in zoom
+            candidates, reference_candidates = _putative_pairs(centers / unit, reference_centers / reference_unit)
+            if len(candidates) < self.min_holds:
+                return None
+
+            # Fitted tighter than pairs are accepted, dense walls have a hold near almost any point
+            threshold = self.max_error * reference_unit
+            homography, inliers = ransac_homography(centers[candidates], reference_centers[reference_candidates],
+                                                    threshold / 2)
+            if homography is None or inliers.sum() < self.min_holds:
+                logger.debug(f"No wall alignment, {int(inliers.sum())} holds agree")
+                return None
+
+            for _ in range(REFINE_ROUNDS):
+                pairs, _ = _assign(project(homography, centers), reference_centers, tree, threshold)
+                if len(pairs) < 4:
+                    break
+                refined = estimate_homography(centers[pairs[:, 0]], reference_centers[pairs[:, 1]])
+                if refined is None:
+                    break
+                homography = refined
+
+            pairs, errors = _assign(project(homography, centers), reference_centers, tree, threshold)
+            if len(pairs) < required:
+                return None
+
+        logger.info(f"Matched {len(pairs)} of {len(boxes)} holds to a stored wall of {len(reference_boxes)} holds, "
+                    f"median error {np.median(errors) / reference_unit:.2f} hold sizes")
+        return WallMatch(homography=homography, pairs=pairs, errors=errors, inliers=int(inliers.sum()))
+
+
+def _boxes(holds: Sequence[Hold]) -> np.ndarray:
+    return np.array([(hold.x, hold.y, hold.width, hold.height) for hold in holds], dtype=np.float64).reshape(-1, 4)
+
+
+def adopt_hold_ids(holds: List[Hold], reference_ids: Sequence[UUID], match: WallMatch) -> int:
+    """
+    Give matched holds the ID of their stored counterpart, so routes set on the stored wall
+    refer to them. Unmatched holds keep their new IDs.
+    Args:
+        holds (List[Hold]): Holds of the new photo, changed in place
+        reference_ids (Sequence[UUID]): IDs of the stored holds, in the order used for matching
+        match (WallMatch): Result of WallMatcher
+    Returns:
+        int: Number of holds that took over an ID
+    """
+    for new_index, reference_index in match.pairs.tolist():
+        holds[new_index].id = reference_ids[reference_index]
+    return len(match.pairs)
+
+
+def wall_hold_ids(wall: WallModel) -> List[UUID]:
+    """Hold IDs of a wall snapshot, in snapshot order"""
+    return [UUID(bytes=row.tobytes()) for row in wall.hold_ids]
@@ -0,0 +1,104 @@
+from typing import Tuple
+
+import numpy as np
+import shapely
+
+# Largest value of an int16 delta
+_INT16_MAX = np.iinfo(np.int16).max
+
+# Default fixed-point resolution of encoded contours, in steps per image pixel
+CONTOUR_SCALE = 16
+
+
+def simplify_contour(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Simplify a closed contour with the Douglas-Peucker algorithm.
+
+    Note:
+        Runs in GEOS through shapely. No removed vertex lies farther than tolerance from the
+        simplified outline, so hit tests against it are off by at most tolerance pixels. The
+        ring may start at a different vertex than the input. Contours that would collapse
+        below 3 vertices are returned unchanged.
+
+    Args:
+        points (np.ndarray): (K, 2) array of contour vertices
+        tolerance (float): Largest allowed distance in pixels, 0 keeps every vertex
+
+    Returns:
+        np.ndarray: (L, 2) float64 array of the kept vertices, without a closing duplicate
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if tolerance <= 0 or len(points) <= 3:
+        return points
+
+    try:
+        ring = shapely.simplify(shapely.linearrings(points), tolerance, preserve_topology=False)
+    except shapely.errors.GEOSException:
+        return points  # Degenerate ring, e.g. all vertices on one line
+    simplified = shapely.get_coordinates(ring)[:-1]
+    return simplified if len(simplified) >= 3 else points
+
+
+def encode_contours(points: np.ndarray, offsets: np.ndarray,
+                    scale: float = CONTOUR_SCALE) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    Encode packed contours as int16 deltas between consecutive fixed-point vertices.
+
+    Note:
+        Coordinates are rounded to 1/scale pixel. The first vertex of every contour is stored
+        absolutely in origins, the following ones as the step from their predecessor, which
+        fits in 16 bits for any realistic hold. If a step would overflow, the scale is lowered
+        for the whole set instead, so encoding never fails.
+
+    Args:
+        points (np.ndarray): (M, 2) array of all contour vertices
+        offsets (np.ndarray): (N + 1,) int array, contour i owns points[offsets[i]:offsets[i + 1]]
+        scale (float): Fixed-point steps per pixel
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float]: (N, 2) int32 origins, (M, 2) int16 deltas and
+            the scale actually used
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    starts = offsets[:-1]
+    has_points = counts > 0
+
+    while True:
+        fixed = np.rint(points * scale).astype(np.int64)
+        deltas = np.zeros_like(fixed)
+        deltas[1:] = fixed[1:] - fixed[:-1]
+        deltas[starts[has_points]] = 0  # Contour starts are stored in origins
+        largest = int(np.abs(deltas).max()) if len(deltas) else 0
+        if largest <= _INT16_MAX:
+            break
+        scale = scale * _INT16_MAX / (largest + 1)
+
+    origins = np.zeros((len(counts), 2), dtype=np.int64)
+    origins[has_points] = fixed[starts[has_points]]
+    return origins.astype(np.int32), deltas.astype(np.int16), float(scale)
+
+
+def decode_contours(origins: np.ndarray, deltas: np.ndarray, offsets: np.ndarray, scale: float) -> np.ndarray:
+    """
+    Decode contours written by encode_contours.
+
+    Args:
+        origins (np.ndarray): (N, 2) first vertex of every contour, fixed point
+        deltas (np.ndarray): (M, 2) steps between consecutive vertices
+        offsets (np.ndarray): (N + 1,) int array of contour offsets
+        scale (float): Fixed-point steps per pixel
+
+    Returns:
+        np.ndarray: (M, 2) float32 array of contour vertices in pixels
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    counts = np.diff(offsets)
+    has_points = counts > 0
+
+    # One running sum over all contours, rebased at the start of each one
+    running = np.cumsum(np.asarray(deltas, dtype=np.int64).reshape(-1, 2), axis=0)
+    base = origins[has_points].astype(np.int64) - running[offsets[:-1][has_points]]
+    fixed = running + np.repeat(base, counts[has_points], axis=0)
+    return (fixed / scale).astype(np.float32)
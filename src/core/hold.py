@@ -6,6 +6,7 @@ from shapely.geometry import Polygon, Point
 from src.utils import ProjectConfig
 from src.utils.logger import setup_logger
 from src.core.movement_type import HoldType
+from src.core.contour import simplify_contour
 
 logger = setup_logger("core/hold", ProjectConfig.get_log_file("core"))
 
@@ -71,12 +72,17 @@ class Hold:
     foot_order: Optional[int] = None
 
     @classmethod
-    def from_detection(cls, detection: dict) -> 'Hold':
+    def from_detection(cls, detection: dict, tolerance: float = ProjectConfig.CONTOUR_TOLERANCE) -> 'Hold':
         """
         Create a Hold object from the detection dictionary.
 
+        Note:
+            The API returns dense contours; they are simplified so that no point moves farther
+            than tolerance pixels, which cuts the vertices to draw, hit test and store.
+
         Args:
             detection (dict): Detection dictionary from the API
+            tolerance (float): Contour simplification tolerance in pixels, 0 keeps every point
 
         Returns:
             Hold: Hold object created from the detection
@@ -84,10 +90,8 @@ class Hold:
 
         # Transform points from API to HoldPoint objects
         contour_points_data = detection.get('points', [])
-        contour_points = [
-            HoldPoint(point['x'], point['y'])
-            for point in contour_points_data
-        ]
+        points = simplify_contour([(point['x'], point['y']) for point in contour_points_data], tolerance)
+        contour_points = [HoldPoint(x, y) for x, y in points.tolist()]
         return cls(
             id=uuid4(),
             x=detection['x'],
@@ -131,13 +135,15 @@ class Hold:
         points = [(p.x, p.y) for p in self.contour_points]
         return Polygon(points)
 
-    def contains_point(self, px: float, py: float) -> bool:
+    def contains_point(self, px: float, py: float, tolerance: float = 0.0) -> bool:
         """
         Check if the hold contains a given point.
 
         Args:
             px (float): X coordinate of the point
             py (float): Y coordinate of the point
+            tolerance (float): Distance in pixels the point may lie outside the contour,
+                e.g. the tolerance the contour was simplified with
 
         Returns:
             bool: True if the point is contained within the hold, False otherwise
@@ -147,9 +153,12 @@ class Hold:
 
         if polygon:
             # logger.debug("Checking if point is within the hold.")
+            if tolerance > 0:
+                return polygon.distance(point) <= tolerance
             return polygon.contains(point)
         else:
             # If no polygon is available, we use brute rectangle check
             logger.warning("No polygon available, using bounding box check.")
             x_min, y_min, x_max, y_max = self.bounds
-            return x_min <= px <= x_max and y_min <= py <= y_max  # check if point is within the bounding box
+            return (x_min - tolerance <= px <= x_max + tolerance
+                    and y_min - tolerance <= py <= y_max + tolerance)  # check if point is within the bounding box
@@ -5,7 +5,7 @@ from uuid import UUID, uuid4
 
 from src.core.connection import Connection
 from src.core.hold import Hold, logger
-from src.storage.models.route_model import RouteModel
+from src.storage.models.route_model import RouteModel, ConnectionModel
 from src.utils.logger import setup_logger
 from src.utils.config import ProjectConfig
 
@@ -27,6 +27,7 @@ class Route:
         hand_holds (List[Hold]): List of hand holds in the route
         foot_holds (List[Hold]): List of foot holds in the route
         connections (List[Connection]): List of connections between holds in the route
+        wall_hash (Optional[str]): Content hash of the wall image the route was set on
     """
     id: UUID = field(default_factory=uuid4)
     created_at: datetime = field(default_factory=datetime.now)
@@ -38,6 +39,7 @@ class Route:
     hand_holds: List[Hold] = field(default_factory=list)
     foot_holds: List[Hold] = field(default_factory=list)
     connections: List[Connection] = field(default_factory=list)
+    wall_hash: Optional[str] = None
 
     def to_model(self) -> 'RouteModel':
         """
@@ -55,7 +57,19 @@ class Route:
             created_at=self.created_at,
             difficulty=self.grade,
             description=self.description,
-            author=self.author
+            author=self.author,
+            wall_hash=self.wall_hash,
+            hand_hold_ids=[hold.id for hold in self.hand_holds],
+            foot_hold_ids=[hold.id for hold in self.foot_holds],
+            connections=[
+                ConnectionModel(
+                    hold1_id=connection.hold1.id,
+                    hold2_id=connection.hold2.id,
+                    is_curved=connection.is_curved,
+                    control_points=connection.control_points
+                )
+                for connection in self.connections
+            ]
         )
 
     @classmethod
@@ -67,4 +81,54 @@ class Route:
             foot_holds (List[Hold]): List of foot holds
             **kwargs: Additional route attributes
         """
-        hand_holds = sorted
+        hand_holds = sorted(hand_holds, key=lambda h: h.hand_order if h.hand_order is not None else float('inf'))
+        foot_holds = sorted(foot_holds, key=lambda h: h.foot_order if h.foot_order is not None else float('inf'))
+
+        # Consecutive holds of the same limb are connected, same as in the HoldViewer
+        connections = [Connection(h1, h2) for h1, h2 in zip(hand_holds, hand_holds[1:])]
+        connections.extend(Connection(h1, h2) for h1, h2 in zip(foot_holds, foot_holds[1:]))
+
+        return cls(hand_holds=hand_holds, foot_holds=foot_holds, connections=connections, **kwargs)
+
+    @classmethod
+    def from_model(cls, model: RouteModel, holds: List[Hold]) -> 'Route':
+        """
+        Recreate a Route object from its stored model and the holds of its wall.
+        Args:
+            model (RouteModel): Stored route
+            holds (List[Hold]): Holds of the wall, e.g. from its wall snapshot
+        """
+        holds_by_id = {hold.id: hold for hold in holds}
+        hand_holds = [holds_by_id[hid] for hid in model.hand_hold_ids if hid in holds_by_id]
+        foot_holds = [holds_by_id[hid] for hid in model.foot_hold_ids if hid in holds_by_id]
+        if not (model.hand_hold_ids or model.foot_hold_ids):
+            # Routes saved before roles were persisted only have hold_ids
+            hand_holds = [holds_by_id[hid] for hid in model.hold_ids if hid in holds_by_id]
+
+        connections = []
+        for connection_model in model.connections:
+            hold1 = holds_by_id.get(connection_model.hold1_id)
+            hold2 = holds_by_id.get(connection_model.hold2_id)
+            if hold1 is None or hold2 is None:
+                continue
+            connection = Connection(hold1, hold2)
+            connection.is_curved = connection_model.is_curved
+            connection.control_points = connection_model.control_points
+            connections.append(connection)
+
+        if not model.connections:
+            connections = [Connection(h1, h2) for h1, h2 in zip(hand_holds, hand_holds[1:])]
+            connections.extend(Connection(h1, h2) for h1, h2 in zip(foot_holds, foot_holds[1:]))
+
+        return cls(
+            id=model.id,
+            created_at=model.created_at,
+            name=model.name,
+            grade=model.difficulty,
+            description=model.description,
+            author=model.author,
+            hand_holds=hand_holds,
+            foot_holds=foot_holds,
+            connections=connections,
+            wall_hash=model.wall_hash
+        )
@@ -0,0 +1,86 @@
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.hold import Hold
+
+
+class HoldIndex:
+    """
+    Uniform grid over the bounding boxes of holds, for viewport culling and hit testing.
+
+    Note:
+        Every hold is registered in all grid cells its bounding box overlaps. A query only
+        visits the cells it overlaps and then filters the candidates exactly against their
+        boxes, vectorized. Results are hold indices in ascending order, i.e. the order the
+        holds are drawn in.
+
+    Attributes:
+        holds (List[Hold]): Indexed holds
+        boxes (np.ndarray): (N, 4) float64 array of x_min, y_min, x_max, y_max
+        cell_size (float): Side of a grid cell in image pixels
+    """
+
+    def __init__(self, holds: Sequence[Hold], cell_size: float = None):
+        self.holds = list(holds)
+        self.boxes = np.array([hold.bounds for hold in self.holds], dtype=np.float64).reshape(-1, 4)
+
+        if cell_size is None:
+            # A few holds per cell: twice the typical hold size
+            sizes = np.maximum(self.boxes[:, 2] - self.boxes[:, 0], self.boxes[:, 3] - self.boxes[:, 1])
+            cell_size = 2 * float(np.median(sizes)) if len(sizes) else 1.0
+        self.cell_size = max(cell_size, 1.0)
+
+        cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        cell_ranges = np.floor(self.boxes / self.cell_size).astype(np.int64)
+        for index, (cx0, cy0, cx1, cy1) in enumerate(cell_ranges.tolist()):
+            for cy in range(cy0, cy1 + 1):
+                for cx in range(cx0, cx1 + 1):
+                    cells[cx, cy].append(index)
+        self._cells = {key: np.asarray(indices, dtype=np.int64) for key, indices in cells.items()}
+
+    def __len__(self) -> int:
+        return len(self.holds)
+
+    def query_rect(self, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+        """
+        Find the holds whose bounding box overlaps a rectangle.
+        Args:
+            x_min, y_min, x_max, y_max (float): Rectangle in image coordinates
+        Returns:
+            np.ndarray: Sorted indices into holds
+        """
+        if not self.holds:
+            return np.empty(0, dtype=np.int64)
+
+        cx0, cy0 = int(np.floor(x_min / self.cell_size)), int(np.floor(y_min / self.cell_size))
+        cx1, cy1 = int(np.floor(x_max / self.cell_size)), int(np.floor(y_max / self.cell_size))
+
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) >= len(self._cells):
+            # The rectangle spans most of the wall, scanning all boxes is cheaper than the cells
+            candidates = np.arange(len(self.holds))
+        else:
+            found = [
+                self._cells[key]
+                for key in ((cx, cy) for cy in range(cy0, cy1 + 1) for cx in range(cx0, cx1 + 1))
+                if key in self._cells
+            ]
+            if not found:
+                return np.empty(0, dtype=np.int64)
+            candidates = np.unique(np.concatenate(found))
+
+        boxes = self.boxes[candidates]
+        overlaps = (boxes[:, 2] >= x_min) & (boxes[:, 0] <= x_max) & (boxes[:, 3] >= y_min) & (boxes[:, 1] <= y_max)
+        return candidates[overlaps]
+
+    def query_point(self, x: float, y: float, tolerance: float = 0.0) -> np.ndarray:
+        """
+        Find the holds whose bounding box, grown by tolerance, contains a point.
+        Args:
+            x, y (float): Point in image coordinates
+            tolerance (float): Distance in image pixels a box may be away from the point
+        Returns:
+            np.ndarray: Sorted indices into holds
+        """
+        return self.query_rect(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
@@ -1,6 +1,6 @@
 # from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout
 # from PyQt5.QtCore import Qt
-# from .widgets.hold_viewer import HoldViewer
+# from .widgets.gl_hold_viewer import create_hold_viewer
 # from .widgets.route_toolbar import RouteToolbar
 # from src.utils.logger import setup_logger
 # from src.utils.config import ProjectConfig
@@ -30,7 +30,7 @@
 #         layout.setContentsMargins(10, 10, 10, 10)
 #
 #         self.route_toolbar = RouteToolbar(self)
-#         self.hold_viewer = HoldViewer(self)
+#         self.hold_viewer = create_hold_viewer(self)
 #
 #         layout.addWidget(self.route_toolbar)
 #         layout.addWidget(self.hold_viewer, 1)
@@ -76,14 +76,14 @@
 #         self.hold_viewer.current_hold_type = hold_type
 #         logger.info(f"Set hold type to {hold_type.value}")
 from pathlib import Path
+from typing import Optional
 
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QMessageBox, QDialog
 from PyQt5.QtCore import Qt
 from datetime import datetime
 import os
-import uuid
 
-from .widgets.hold_viewer import HoldViewer
+from .widgets.gl_hold_viewer import create_hold_viewer
 from .widgets.route_toolbar import RouteToolbar
 from .widgets.route_info_dialog import RouteInfoDialog
 from src.utils.logger import setup_logger
@@ -91,7 +91,16 @@ from src.utils.config import ProjectConfig
 from src.core.movement_type import HoldType
 from src.utils.route_image_processor import RouteImageProcessor
 from src.storage.repositories.route_repository import RouteRepository
-from src.storage.models.route_model import RouteModel
+from src.storage.repositories.wall_repository import WallRepository
+from src.storage.models.wall_model import WallModel
+from src.core.route import Route
+from src.core.analysis.difficulty import DifficultyEstimator
+from src.core.analysis.hold_analyzer import HoldAnalyzer
+from src.core.analysis.beta_solver import BetaSolver
+from src.core.analysis.wall_matcher import WallMatcher, adopt_hold_ids, wall_hold_ids
+from src.utils.image_utils import compute_image_hash
+from src.utils.thumbnail_cache import ThumbnailCache
+from .workers.export_worker import ExportJob, ExportQueue
 
 logger = setup_logger("gui/main_window", ProjectConfig.get_log_file("gui"))
 
@@ -106,9 +115,31 @@ class MainWindow(QMainWindow):
 
         self.route_image_processor = RouteImageProcessor()
         self.current_image_path = None
+        self.current_image_hash = None
+        self.current_route_id = None  # Set once the route being edited was saved, so re-saves overwrite it
 
-        # Initialize route repository
+        # Previews of wall photos and exported routes, for browsing without decoding full images
+        self.thumbnail_cache = ThumbnailCache()
+
+        # Route images are rendered and encoded in the background
+        self.export_queue = ExportQueue(
+            self.route_image_processor,
+            thumbnail_cache=self.thumbnail_cache,
+            parent=self
+        )
+        self.export_queue.export_progress.connect(self.handle_export_progress)
+        self.export_queue.export_completed.connect(self.handle_export_completed)
+        self.export_queue.error_occurred.connect(self.handle_export_error)
+
+        # Initialize route and wall repositories
         self.route_repository = RouteRepository(ProjectConfig.ROUTES_DIR)
+        self.wall_repository = WallRepository(ProjectConfig.WALLS_DIR)
+
+        # Grade estimates, only once a difficulty model was fitted on the catalogue
+        self.difficulty_estimator = DifficultyEstimator.load()
+        self._hold_analyzer = None
+        self.beta_solver = BetaSolver()
+        self.wall_matcher = WallMatcher()
 
     def setup_ui(self):
         main_widget = QWidget()
@@ -118,7 +149,7 @@ class MainWindow(QMainWindow):
         layout.setContentsMargins(10, 10, 10, 10)
 
         self.route_toolbar = RouteToolbar(self)
-        self.hold_viewer = HoldViewer(self)
+        self.hold_viewer = create_hold_viewer(self)
 
         layout.addWidget(self.route_toolbar)
         layout.addWidget(self.hold_viewer, 1)
@@ -128,6 +159,7 @@ class MainWindow(QMainWindow):
     def initialize_state(self):
         self.route_toolbar.new_route_button.clicked.connect(self.start_new_route)
         self.route_toolbar.save_route_button.clicked.connect(self.show_save_dialog)
+        self.route_toolbar.suggest_beta_button.clicked.connect(self.suggest_beta)
         self.route_toolbar.hands_button.clicked.connect(lambda: self._set_hold_type(HoldType.HAND))
         self.route_toolbar.feet_button.clicked.connect(lambda: self._set_hold_type(HoldType.FEET))
         self.route_toolbar.curve_edit_button.clicked.connect(
@@ -140,6 +172,7 @@ class MainWindow(QMainWindow):
     def start_new_route(self):
         """Starts creating a new route."""
         logger.info("Starting new route creation")
+        self.current_route_id = None
         for hold in self.hold_viewer.holds:
             hold.is_hand_selected = False
             hold.is_foot_selected = False
@@ -147,15 +180,51 @@ class MainWindow(QMainWindow):
             hold.foot_order = None
         self.hold_viewer.next_hand_order = 0
         self.hold_viewer.next_foot_order = 0
+        self.hold_viewer.set_connections([])
         self.hold_viewer.update()
         self.route_toolbar.enable_route_editing()
 
+    def suggest_beta(self):
+        """Renumber the selected holds in the order proposed by the beta solver"""
+        beta = self.beta_solver.solve_selected(self.hold_viewer.holds)
+        if not (beta.hands.holds or beta.feet.holds):
+            QMessageBox.warning(self, "Warning", "No holds selected for the route.")
+            return
+        beta.apply()
+        self.hold_viewer.next_hand_order = len(beta.hands.holds)
+        self.hold_viewer.next_foot_order = len(beta.feet.holds)
+        self.hold_viewer.update()
+        if beta.feasible:
+            self.statusBar().showMessage("Holds ordered by the suggested beta", 5000)
+        else:
+            self.statusBar().showMessage("Holds ordered by the suggested beta, some moves are out of reach", 5000)
+
     def show_save_dialog(self):
         """Show dialog for entering route information"""
+        estimated_grade = self.estimate_current_grade()
+        if estimated_grade is not None:
+            self.statusBar().showMessage(f"Estimated grade: {estimated_grade}")
         dialog = RouteInfoDialog(self, self.route_toolbar.grade_selector.currentText())
         if dialog.exec_() == QDialog.Accepted:
             self.save_current_route(dialog.get_route_info())
 
+    def estimate_current_grade(self):
+        """Estimated grade of the selected holds, None without a difficulty model or selection"""
+        hand_holds = [h for h in self.hold_viewer.holds if h.is_hand_selected]
+        if self.difficulty_estimator is None or not hand_holds:
+            return None
+        try:
+            # The analyzer indexes the wall's holds once, rebuilt only when another wall is loaded
+            holds = self.hold_viewer.holds
+            if self._hold_analyzer is None or len(self._hold_analyzer.holds) != len(holds) or \
+                    any(a is not b for a, b in zip(self._hold_analyzer.holds, holds)):
+                self._hold_analyzer = HoldAnalyzer(holds)
+            foot_holds = [h for h in holds if h.is_foot_selected]
+            return self.difficulty_estimator.estimate(self._hold_analyzer, Route.from_holds(hand_holds, foot_holds))
+        except Exception as e:
+            logger.error(f"Error estimating route grade: {str(e)}")
+            return None
+
     def save_current_route(self, route_info):
         """Save the current route with provided information"""
         try:
@@ -175,24 +244,28 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "Warning", "No holds selected for the route.")
                 return
 
-            # Generate UUIDs for holds that don't have them
-            hold_ids = []
-            for hold in hand_holds + foot_holds:
-                if not hasattr(hold, 'id'):
-                    hold.id = uuid.uuid4()
-                hold_ids.append(hold.id)
+            # Make sure the hold geometry the route refers to is persisted
+            self.save_wall_snapshot()
 
-            # Create route model
-            route = RouteModel.create(
+            # Create route with hand/foot order and connections
+            route = Route.from_holds(
+                hand_holds,
+                foot_holds,
                 name=route_info["name"],
-                hold_ids=hold_ids,
-                difficulty=route_info["grade"],
+                grade=route_info["grade"],
                 description=route_info["description"],
-                author=route_info["author"]
+                author=route_info["author"],
+                wall_hash=self.current_image_hash
             )
+            # Keep the curves edited in the viewer
+            route.connections = self.hold_viewer.route_connections()
+            if self.current_route_id is not None:
+                # Saving the same route again overwrites it instead of creating a copy
+                route.id = self.current_route_id
 
             # Save route to repository
-            self.route_repository.save(route)
+            self.route_repository.save(route.to_model())
+            self.current_route_id = route.id
 
             # Create exports directory if it doesn't exist
             exports_dir = ProjectConfig.EXPORTS_DIR
@@ -200,61 +273,165 @@ class MainWindow(QMainWindow):
 
             # Generate filename based on route name and ID
             safe_name = "".join(x for x in route.name if x.isalnum() or x in (' ', '-', '_')).strip()
-            output_filename = f"{safe_name}_{str(route.id)[:8]}.jpg"
-            output_path = os.path.join(exports_dir, output_filename)
+            base_name = f"{safe_name}_{str(route.id)[:8]}"
 
             logger.debug(f"Current image path: {self.current_image_path}")
-            logger.debug(f"Output path: {output_path}")
+            logger.debug(f"Output base name: {base_name}")
             logger.debug(f"Route info: {route_info}")
 
-            input_image_path = str(self.current_image_path)
-
-            # Save image with overlay
-            # self.route_image_processor.add_route_info_overlay(
-            #     input_image_path,
-            #     {
-            #         "name": route.name,
-            #         "author": route.author,
-            #         "grade": route.difficulty,
-            #         "description": route.description
-            #     },
-            #     str(output_path),
-            #     hand_holds=hand_holds,  # selected holds
-            #     foot_holds=foot_holds # selected holds
-            # )
-
-            # Approach with passing the whole widget and selected holds
-            self.route_image_processor.add_route_info_overlay(
-                self.hold_viewer,  # whole widget
-                route_info,
-                output_path
-            )
+            # Render the route onto the original photo once and write every export profile, off the GUI thread
+            self.export_queue.submit(ExportJob.snapshot(
+                route,
+                self.hold_viewer.holds,
+                self.current_image_path,
+                exports_dir,
+                base_name
+            ))
 
-            logger.info(f"Route saved successfully to {output_path}")
-            QMessageBox.information(
-                self,
-                "Success",
-                f"Route saved successfully!\n\nRoute ID: {route.id}\nImage: {output_path}"
-            )
+            logger.info(f"Route {route.id} saved, exporting images to {exports_dir}")
+            self.statusBar().showMessage(f"Route saved, exporting images to {exports_dir}...")
 
         except Exception as e:
             logger.error(f"Error saving route: {str(e)}")
             logger.exception("Detailed error info:")
             QMessageBox.critical(self, "Error", f"Failed to save route:\n{str(e)}")
 
+    def handle_export_progress(self, route_id: str, percent: int):
+        """Show the progress of a background route export"""
+        self.statusBar().showMessage(f"Exporting route {route_id[:8]}... {percent}%")
+
+    def handle_export_completed(self, route_id: str, output_path: str):
+        """Handle a finished background route export"""
+        logger.info(f"Route image saved successfully to {output_path}")
+        self.statusBar().showMessage(f"Route image saved to {output_path}", 5000)
+        QMessageBox.information(
+            self,
+            "Success",
+            f"Route saved successfully!\n\nRoute ID: {route_id}\nImage: {output_path}"
+        )
+
+    def handle_export_error(self, route_id: str, error_message: str):
+        """Handle a failed background route export"""
+        logger.error(f"Error exporting route {route_id}: {error_message}")
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", f"Failed to export route image:\n{error_message}")
+
+    def closeEvent(self, event):
+        """Let queued route exports finish before the window closes"""
+        if self.export_queue.pending_count():
+            logger.info("Waiting for pending route exports")
+            self.export_queue.wait_for_done()
+        self.route_image_processor.close()
+        super().closeEvent(event)
+
+    def set_wall_image(self, image_path: str) -> None:
+        """Set the current wall image and remember its content hash"""
+        self.current_image_path = str(image_path)
+        self.current_image_hash = compute_image_hash(image_path)
+        logger.debug(f"Wall image {image_path} has hash {self.current_image_hash[:12]}")
+        try:
+            self.thumbnail_cache.ingest(image_path, self.current_image_hash)
+        except Exception as e:
+            logger.warning(f"Could not create thumbnail for {image_path}: {str(e)}")
+        self.hold_viewer.load_image(self.current_image_path)
+
+    def restore_wall_snapshot(self) -> bool:
+        """
+        Load the holds of the current wall image from its stored snapshot.
+        Returns:
+            bool: True if the holds were restored, False if there is no snapshot
+        """
+        if self.current_image_hash is None or not self.wall_repository.exists(self.current_image_hash):
+            return False
+
+        wall = self.wall_repository.get(self.current_image_hash)
+        if wall is None:
+            return False
+
+        self.hold_viewer.holds = wall.to_holds()
+        logger.info(f"Restored {len(wall)} holds from wall snapshot {self.current_image_hash[:12]}")
+        return True
+
+    def adopt_stored_hold_ids(self, holds) -> Optional[str]:
+        """
+        Match freshly detected holds to the most recently stored walls and give the holds found on
+        one of them their stored IDs, so routes set on an earlier photo of the wall still apply.
+        Args:
+            holds (List[Hold]): Detected holds of the current wall image, changed in place
+        Returns:
+            str: Hash of the wall the holds were matched to, None if no stored wall matches
+        """
+        best_wall, best_match = None, None
+        for image_hash in self.wall_repository.recent(ProjectConfig.WALL_MATCH_CANDIDATES + 1):
+            if image_hash == self.current_image_hash:
+                continue
+            wall = self.wall_repository.get(image_hash)
+            if wall is None:
+                continue
+            match = self.wall_matcher.match_wall(holds, wall)
+            if match is not None and (best_match is None or len(match) > len(best_match)):
+                best_wall, best_match = wall, match
+
+        if best_match is None:
+            return None
+
+        adopted = adopt_hold_ids(holds, wall_hold_ids(best_wall), best_match)
+        logger.info(f"{adopted} of {len(holds)} holds keep their IDs from wall {best_wall.image_hash[:12]}")
+        self.statusBar().showMessage(f"Recognized {adopted} holds from an earlier photo of this wall", 5000)
+        return best_wall.image_hash
+
+    def save_wall_snapshot(self) -> None:
+        """Persist the detected holds of the current wall image, if not stored yet"""
+        if self.current_image_hash is None or self.wall_repository.exists(self.current_image_hash):
+            return
+
+        wall = WallModel.from_holds(self.current_image_hash, self.current_image_path, self.hold_viewer.holds)
+        self.wall_repository.save(wall)
+
     def load_route(self, route_id: str):
         """Load a route from the repository"""
         try:
             route = self.route_repository.get(route_id)
             if route:
+                # Switch to the wall the route was set on, restoring its holds without detection,
+                # unless the current photo shows all of its holds (a re-shoot of the same wall)
+                current_ids = {hold.id for hold in self.hold_viewer.holds}
+                if route.wall_hash and route.wall_hash != self.current_image_hash and \
+                        not (route.hold_ids and current_ids.issuperset(route.hold_ids)):
+                    wall = self.wall_repository.get(route.wall_hash)
+                    if wall is None:
+                        raise FileNotFoundError(f"Wall snapshot not found for route {route_id}")
+                    self.set_wall_image(wall.image_path)
+                    self.restore_wall_snapshot()
+
                 # Clear current selection
                 self.start_new_route()
-
-                # Find and select holds
-                for hold in self.hold_viewer.holds:
-                    if hasattr(hold, 'id') and hold.id in route.hold_ids:
-                        # You might need additional logic here to determine if it's a hand or foot hold
-                        hold.is_hand_selected = True  # or is_foot_selected depending on your needs
+                self.current_route_id = route.id
+
+                holds_by_id = {hold.id: hold for hold in self.hold_viewer.holds}
+
+                if route.hand_hold_ids or route.foot_hold_ids:
+                    for order, hold_id in enumerate(route.hand_hold_ids):
+                        if hold_id in holds_by_id:
+                            holds_by_id[hold_id].is_hand_selected = True
+                            holds_by_id[hold_id].hand_order = order
+                    for order, hold_id in enumerate(route.foot_hold_ids):
+                        if hold_id in holds_by_id:
+                            holds_by_id[hold_id].is_foot_selected = True
+                            holds_by_id[hold_id].foot_order = order
+                    self.hold_viewer.next_hand_order = len(route.hand_hold_ids)
+                    self.hold_viewer.next_foot_order = len(route.foot_hold_ids)
+                else:
+                    # Routes saved before roles were persisted only have hold_ids
+                    for order, hold_id in enumerate(route.hold_ids):
+                        if hold_id in holds_by_id:
+                            holds_by_id[hold_id].is_hand_selected = True
+                            holds_by_id[hold_id].hand_order = order
+                    self.hold_viewer.next_hand_order = len(route.hold_ids)
+
+                # Restore the curves of the connections, the defaults are drawn for routes without them
+                if route.connections:
+                    self.hold_viewer.set_connections(Route.from_model(route, self.hold_viewer.holds).connections)
 
                 # Update the toolbar grade
                 self.route_toolbar.grade_selector.setCurrentText(route.difficulty)
@@ -0,0 +1,428 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import shapely
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import (QMatrix4x4, QOffscreenSurface, QOpenGLBuffer, QOpenGLContext, QOpenGLShader,
+                         QOpenGLShaderProgram, QOpenGLTexture, QOpenGLVersionProfile, QPainter, QPalette,
+                         QSurfaceFormat)
+from PyQt5.QtWidgets import QOpenGLWidget
+
+from src.core.hold import Hold
+from src.gui.widgets.hold_viewer import HoldViewer, HAND_COLOR, FOOT_COLOR, UNSELECTED_COLOR, FILL_ALPHA
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("gui/widgets/gl_hold_viewer", ProjectConfig.get_log_file("gui"))
+
+# OpenGL constants, PyQt5 only binds the functions
+GL_COLOR_BUFFER_BIT = 0x4000
+GL_BLEND = 0x0BE2
+GL_SRC_ALPHA = 0x0302
+GL_ONE_MINUS_SRC_ALPHA = 0x0303
+GL_LINES = 0x0001
+GL_TRIANGLES = 0x0004
+GL_TRIANGLE_STRIP = 0x0005
+GL_FLOAT = 0x1406
+GL_RENDERER = 0x1F01
+GL_VERSION = 0x1F02
+
+# Hold states, the value of the per vertex state attribute
+STATE_UNSELECTED = 0
+STATE_HAND = 1
+STATE_FOOT = 2
+
+HOLD_VERTEX_SHADER = """
+attribute highp vec2 position;
+attribute lowp float state;
+uniform highp mat4 matrix;
+uniform lowp vec4 unselected_color;
+uniform lowp vec4 hand_color;
+uniform lowp vec4 foot_color;
+uniform lowp float alpha;
+varying lowp vec4 color;
+void main()
+{
+    gl_Position = matrix * vec4(position, 0.0, 1.0);
+    color = state < 0.5 ? unselected_color : (state < 1.5 ? hand_color : foot_color);
+    color.a *= alpha;
+}
+"""
+
+HOLD_FRAGMENT_SHADER = """
+varying lowp vec4 color;
+void main()
+{
+    gl_FragColor = color;
+}
+"""
+
+IMAGE_VERTEX_SHADER = """
+attribute highp vec2 position;
+attribute highp vec2 texcoord;
+uniform highp mat4 matrix;
+varying highp vec2 uv;
+void main()
+{
+    gl_Position = matrix * vec4(position, 0.0, 1.0);
+    uv = texcoord;
+}
+"""
+
+IMAGE_FRAGMENT_SHADER = """
+uniform sampler2D image;
+varying highp vec2 uv;
+void main()
+{
+    gl_FragColor = texture2D(image, uv);
+}
+"""
+
+
+def opengl_available() -> bool:
+    """
+    Check if an OpenGL 2.0 context can be created, with a GPU or a software rasterizer like llvmpipe.
+    Returns:
+        bool: True if the OpenGL viewer can be used
+    """
+    context = QOpenGLContext()
+    if not context.create():
+        logger.info("No OpenGL context available")
+        return False
+
+    surface = QOffscreenSurface()
+    surface.setFormat(context.format())
+    surface.create()
+    if not context.makeCurrent(surface):
+        logger.info("OpenGL context cannot be made current")
+        return False
+
+    version = (context.format().majorVersion(), context.format().minorVersion())
+    renderer = context.functions().glGetString(GL_RENDERER)
+    context.doneCurrent()
+    logger.info(f"OpenGL {version[0]}.{version[1]} available, renderer: {renderer}")
+    return version >= (2, 0)
+
+
+def create_hold_viewer(parent=None) -> HoldViewer:
+    """
+    Create the hold viewer for the configured backend.
+    ProjectConfig.VIEWER_BACKEND "opengl" selects the GLHoldViewer when OpenGL is available,
+    otherwise (or with "raster") the QPainter based HoldViewer is used.
+    """
+    if ProjectConfig.VIEWER_BACKEND == "opengl":
+        if opengl_available():
+            return GLHoldViewer(parent)
+        logger.warning("OpenGL viewer requested but OpenGL is not available, using the raster viewer")
+    return HoldViewer(parent)
+
+
+def build_hold_geometry(holds: List[Hold]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the vertex data of all holds, in image coordinates.
+
+    Note:
+        Outlines are line segment pairs, so every hold is drawn by a single GL_LINES call.
+        Fills are constrained Delaunay triangulations of the contours (concave holds cannot be
+        drawn as triangle fans). Holds without a usable contour use their bounding box.
+
+    Args:
+        holds (List[Hold]): Holds to draw
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: (K, 2) float32 outline vertices and
+            (K,) int64 index of the hold each belongs to, then the same for the fill triangles
+    """
+    contours = []
+    for hold in holds:
+        if len(hold.contour_points) >= 3:
+            contours.append(np.array([(p.x, p.y) for p in hold.contour_points], dtype=np.float64))
+        else:
+            x_min, y_min, x_max, y_max = hold.bounds
+            contours.append(np.array([(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]))
+
+    if not contours:
+        empty = np.empty((0, 2), dtype=np.float32), np.empty(0, dtype=np.int64)
+        return empty + empty
+
+    counts = np.array([len(contour) for contour in contours], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    points = np.concatenate(contours)
+
+    # Segment from every vertex to the next one, wrapping around at the end of each contour
+    next_index = np.arange(1, len(points) + 1)
+    next_index[offsets[1:] - 1] = offsets[:-1]
+    outline = np.stack([points, points[next_index]], axis=1).reshape(-1, 2).astype(np.float32)
+    outline_holds = np.repeat(np.arange(len(holds)), 2 * counts)
+
+    hold_index = np.repeat(np.arange(len(holds)), counts)
+    polygons = shapely.make_valid(shapely.polygons(shapely.linearrings(points, indices=hold_index)))
+    try:
+        triangulations = shapely.constrained_delaunay_triangles(polygons)
+    except shapely.errors.GEOSException:
+        # One broken contour must not lose the fills of all holds
+        triangulations = np.array([_triangulate(polygon) for polygon in polygons], dtype=object)
+    triangles = shapely.get_parts(triangulations)
+    fill = shapely.get_coordinates(shapely.get_exterior_ring(triangles)).reshape(-1, 4, 2)[:, :3]
+    fill_holds = np.repeat(np.arange(len(holds)), 3 * shapely.get_num_geometries(triangulations))
+    return outline, outline_holds, fill.reshape(-1, 2).astype(np.float32), fill_holds
+
+
+def _triangulate(polygon):
+    try:
+        return shapely.constrained_delaunay_triangles(polygon)
+    except shapely.errors.GEOSException:
+        return shapely.GeometryCollection()
+
+
+def hold_states(holds: List[Hold]) -> np.ndarray:
+    """State of every hold as drawn: hand selection wins over foot selection, as in HoldViewer."""
+    return np.fromiter(
+        (STATE_HAND if hold.is_hand_selected else STATE_FOOT if hold.is_foot_selected else STATE_UNSELECTED
+         for hold in holds),
+        dtype=np.float32, count=len(holds)
+    )
+
+
+class _HoldCanvas(QOpenGLWidget):
+    """OpenGL surface covering a GLHoldViewer. Mouse input passes through to the viewer."""
+
+    def __init__(self, viewer: 'GLHoldViewer'):
+        super().__init__(viewer)
+        self.viewer = viewer
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        surface_format = QSurfaceFormat()
+        surface_format.setSamples(4)  # Multisampling instead of per primitive antialiasing
+        self.setFormat(surface_format)
+
+    def initializeGL(self) -> None:
+        self.viewer._initialize_gl()
+
+    def paintGL(self) -> None:
+        self.viewer._paint_gl()
+
+
+class GLHoldViewer(HoldViewer):
+    """
+    HoldViewer drawing through OpenGL.
+
+    Note:
+        The wall image is uploaded once as a texture and all hold outlines and fills once as
+        vertex buffers, in image coordinates. Zooming and panning only change the matrix uniform;
+        selecting holds rewrites the small per vertex state buffer, the colors come from uniforms.
+        Interaction, hit testing and exports are inherited from HoldViewer. Huge walls are still
+        drawn from their pyramid tiles, which Qt's OpenGL paint engine keeps as textures. If the
+        GL setup fails, the canvas falls back to the QPainter rendering of HoldViewer.
+    """
+
+    def __init__(self, parent=None) -> None:
+        self._canvas = None  # HoldViewer.__init__ already triggers update()
+        super().__init__(parent)
+        self._canvas = _HoldCanvas(self)
+        self._gl = None  # OpenGL 2.0 functions, None until initialized or if OpenGL failed
+        self._hold_program: Optional[QOpenGLShaderProgram] = None
+        self._image_program: Optional[QOpenGLShaderProgram] = None
+        self._buffers = {}  # Name -> QOpenGLBuffer
+        self._outline_holds = np.empty(0, dtype=np.int64)  # Hold index of every outline vertex
+        self._fill_holds = np.empty(0, dtype=np.int64)
+        self._geometry_holds: Optional[List[Hold]] = None  # Holds the vertex buffers were built from
+        self._geometry_count = 0
+        self._states: Optional[np.ndarray] = None  # Hold states written to the state buffers
+        self._texture: Optional[QOpenGLTexture] = None
+        self._texture_key = None  # cacheKey of the pixmap the texture was made from
+
+    @HoldViewer.holds.setter
+    def holds(self, holds: List[Hold]) -> None:
+        HoldViewer.holds.fset(self, holds)
+        self._geometry_holds = None
+
+    def update(self) -> None:
+        """Schedules a redraw of the canvas, the viewer itself paints nothing."""
+        if self._canvas is not None:
+            self._canvas.update()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._canvas.resize(self.size())
+
+    def paintEvent(self, event) -> None:
+        pass  # Covered by the canvas
+
+    def _initialize_gl(self) -> None:
+        try:
+            profile = QOpenGLVersionProfile()
+            profile.setVersion(2, 0)
+            gl = self._canvas.context().versionFunctions(profile)
+            if gl is None:
+                raise RuntimeError("OpenGL 2.0 functions are not available")
+
+            self._hold_program = self._build_program(HOLD_VERTEX_SHADER, HOLD_FRAGMENT_SHADER)
+            self._image_program = self._build_program(IMAGE_VERTEX_SHADER, IMAGE_FRAGMENT_SHADER)
+            for name in ("outline", "outline_state", "fill", "fill_state", "image"):
+                buffer = QOpenGLBuffer(QOpenGLBuffer.VertexBuffer)
+                buffer.create()
+                self._buffers[name] = buffer
+            self._buffers["outline_state"].setUsagePattern(QOpenGLBuffer.DynamicDraw)
+            self._buffers["fill_state"].setUsagePattern(QOpenGLBuffer.DynamicDraw)
+
+            self._gl = gl
+            self._geometry_holds = None
+            self._texture_key = None
+            logger.info(f"OpenGL viewer initialized: {gl.glGetString(GL_VERSION)}")
+
+        except Exception as e:
+            logger.error(f"OpenGL initialization failed, falling back to QPainter rendering: {str(e)}")
+            self._gl = None
+
+    @staticmethod
+    def _build_program(vertex_source: str, fragment_source: str) -> QOpenGLShaderProgram:
+        program = QOpenGLShaderProgram()
+        if not program.addShaderFromSourceCode(QOpenGLShader.Vertex, vertex_source):
+            raise RuntimeError(f"Vertex shader: {program.log()}")
+        if not program.addShaderFromSourceCode(QOpenGLShader.Fragment, fragment_source):
+            raise RuntimeError(f"Fragment shader: {program.log()}")
+        if not program.link():
+            raise RuntimeError(f"Shader link: {program.log()}")
+        return program
+
+    def _paint_gl(self) -> None:
+        if self._gl is None:
+            painter = QPainter(self._canvas)
+            painter.fillRect(self._canvas.rect(), self.palette().color(QPalette.Window))
+            self.render_view(painter)
+            painter.end()
+            return
+
+        try:
+            with metrics.timer("hold_viewer_paint_seconds"):
+                self._paint_native()
+        except Exception as e:
+            logger.error(f"OpenGL drawing failed, falling back to QPainter rendering: {str(e)}")
+            self._gl = None
+            self._canvas.update()
+
+    def _paint_native(self) -> None:
+        gl = self._gl
+        background = self.palette().color(QPalette.Window)
+        gl.glClearColor(background.redF(), background.greenF(), background.blueF(), 1.0)
+        gl.glClear(GL_COLOR_BUFFER_BIT)
+
+        transform = self.view_transform()
+        painter = QPainter(self._canvas)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.pyramid:
+            # Tiles are cached as pixmaps, the paint engine keeps them as textures
+            self._draw_pyramid(painter, self._image_rect())
+
+        painter.beginNativePainting()
+        matrix = QMatrix4x4()
+        matrix.ortho(0, self.width(), self.height(), 0, -1, 1)
+        matrix = matrix * QMatrix4x4(transform)
+        gl.glEnable(GL_BLEND)
+        gl.glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        if not self.pyramid and self.wall_image and self.image_size:
+            self._draw_texture(matrix)
+        if self._holds:
+            self._draw_holds(matrix)
+        painter.endNativePainting()
+
+        # Only the route is drawn with QPainter, a handful of curves and numbers
+        painter.setTransform(transform)
+        self.draw_route_connections(painter, self.holds)
+        painter.end()
+
+    def _draw_texture(self, matrix: QMatrix4x4) -> None:
+        if self._texture is None or self._texture_key != self.wall_image.cacheKey():
+            # Uploaded once per decoded image, not per frame
+            if self._texture is not None:
+                self._texture.destroy()
+            self._texture = QOpenGLTexture(self.wall_image.toImage())
+            self._texture.setMinificationFilter(QOpenGLTexture.LinearMipMapLinear)
+            self._texture.setMagnificationFilter(QOpenGLTexture.Linear)
+            self._texture.setWrapMode(QOpenGLTexture.ClampToEdge)
+            self._texture_key = self.wall_image.cacheKey()
+
+            width, height = self.image_size.width(), self.image_size.height()
+            quad = np.array([
+                0, 0, 0, 0,
+                width, 0, 1, 0,
+                0, height, 0, 1,
+                width, height, 1, 1,
+            ], dtype=np.float32)
+            self._upload(self._buffers["image"], quad)
+
+        program = self._image_program
+        program.bind()
+        program.setUniformValue("matrix", matrix)
+        program.setUniformValue("image", 0)
+        self._texture.bind(0)
+        buffer = self._buffers["image"]
+        buffer.bind()
+        program.enableAttributeArray("position")
+        program.setAttributeBuffer("position", GL_FLOAT, 0, 2, 16)
+        program.enableAttributeArray("texcoord")
+        program.setAttributeBuffer("texcoord", GL_FLOAT, 8, 2, 16)
+        self._gl.glDrawArrays(GL_TRIANGLE_STRIP, 0, 4)
+        program.disableAttributeArray("position")
+        program.disableAttributeArray("texcoord")
+        buffer.release()
+        self._texture.release()
+        program.release()
+
+    def _draw_holds(self, matrix: QMatrix4x4) -> None:
+        if self._geometry_holds is not self._holds or self._geometry_count != len(self._holds):
+            outline, self._outline_holds, fill, self._fill_holds = build_hold_geometry(self._holds)
+            self._upload(self._buffers["outline"], outline)
+            self._upload(self._buffers["fill"], fill)
+            self._geometry_holds = self._holds
+            self._geometry_count = len(self._holds)
+            self._states = None
+            logger.info(f"Uploaded {len(outline) // 2} outline segments and {len(fill) // 3} fill triangles "
+                        f"for {len(self._holds)} holds")
+
+        states = hold_states(self._holds)
+        if self._states is None or not np.array_equal(states, self._states):
+            # Selection changed: only the state attribute is rewritten
+            self._upload(self._buffers["outline_state"], states[self._outline_holds])
+            self._upload(self._buffers["fill_state"], states[self._fill_holds])
+            self._states = states
+
+        program = self._hold_program
+        program.bind()
+        program.setUniformValue("matrix", matrix)
+        program.setUniformValue("unselected_color", UNSELECTED_COLOR)
+        program.setUniformValue("hand_color", HAND_COLOR)
+        program.setUniformValue("foot_color", FOOT_COLOR)
+        program.enableAttributeArray("position")
+        program.enableAttributeArray("state")
+
+        program.setUniformValue("alpha", FILL_ALPHA / 255)
+        self._bind_vertices(program, "fill")
+        self._gl.glDrawArrays(GL_TRIANGLES, 0, len(self._fill_holds))
+
+        program.setUniformValue("alpha", 1.0)
+        self._gl.glLineWidth(2.0 * self.devicePixelRatioF())
+        self._bind_vertices(program, "outline")
+        self._gl.glDrawArrays(GL_LINES, 0, len(self._outline_holds))
+
+        program.disableAttributeArray("position")
+        program.disableAttributeArray("state")
+        self._buffers["outline_state"].release()
+        program.release()
+
+    def _bind_vertices(self, program: QOpenGLShaderProgram, name: str) -> None:
+        self._buffers[name].bind()
+        program.setAttributeBuffer("position", GL_FLOAT, 0, 2)
+        self._buffers[f"{name}_state"].bind()
+        program.setAttributeBuffer("state", GL_FLOAT, 0, 1)
+
+    @staticmethod
+    def _upload(buffer: QOpenGLBuffer, data: np.ndarray) -> None:
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        buffer.bind()
+        if buffer.size() == data.nbytes:
+            buffer.write(0, data, data.nbytes)
+        else:
+            buffer.allocate(data, data.nbytes)
+        buffer.release()
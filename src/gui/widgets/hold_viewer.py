@@ -1,16 +1,70 @@
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap, QPainterPath
-from PyQt5.QtCore import Qt, QPoint, QSize
-from typing import List, Optional
+from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap, QPainterPath, QPolygonF, QTransform
+from PyQt5.QtCore import Qt, QPoint, QPointF, QSize, QRect, QRectF
+from PyQt5.QtGui import QImage
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import math
+
+import numpy as np
 
 from src.core.connection import Connection
+from src.core.contour import simplify_contour
 from src.core.hold import Hold
 from src.core.movement_type import HoldType
+from src.core.spatial_index import HoldIndex
+from src.gui.workers.image_load_worker import ImageLoadWorker
+from src.storage.models.image_pyramid import ImagePyramid
+from src.storage.repositories.pyramid_repository import PyramidRepository
+from src.utils.image_utils import get_oriented_size
+from src.utils.route_renderer import default_control_point
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 from src.utils.config import ProjectConfig
 
 logger = setup_logger("gui/widgets/hold_viewer", ProjectConfig.get_log_file("gui"))
 
+# Colors of the holds: outline and transparent fill
+HAND_COLOR = QColor(255, 165, 0)  # Orange dla rąk
+FOOT_COLOR = QColor(255, 0, 0)  # Red dla nóg
+UNSELECTED_COLOR = QColor(200, 200, 200)  # szary dla niezaznaczonych
+FILL_ALPHA = 30
+
+# Level of detail, chosen by the size of a hold on screen in pixels
+LOD_BOX = 0  # Bounding box only
+LOD_SIMPLIFIED = 1  # Contour simplified to about one screen pixel
+LOD_FULL = 2  # Full contour
+BOX_LOD_SIZE = 6  # Holds smaller than this are drawn as boxes
+FULL_LOD_SIZE = 48  # Holds smaller than this are drawn simplified
+
+ZOOM_STEP = 1.25  # Zoom factor of one mouse wheel notch or key press
+
+
+_pens = {}  # (rgb, width) -> QPen, pens are reused across frames
+
+
+def _outline_pen(color: QColor, width: int = 2) -> QPen:
+    """
+    Pen of a fixed width on screen, whatever the zoom.
+    1 px outlines are rasterized on a much faster path than wider ones, they are used for holds
+    drawn with less detail.
+    """
+    key = (color.rgb(), width)
+    pen = _pens.get(key)
+    if pen is None:
+        pen = QPen(color, width, Qt.SolidLine)
+        pen.setCosmetic(True)
+        pen.setJoinStyle(Qt.RoundJoin)  # Round line corners
+        pen.setCapStyle(Qt.RoundCap)  # Round line endings
+        _pens[key] = pen
+    return pen
+
+
+def _fill_color(color: QColor) -> QColor:
+    return QColor(color.red(), color.green(), color.blue(), FILL_ALPHA)
+
 
 class HoldViewer(QWidget):
     """
@@ -21,6 +75,13 @@ class HoldViewer(QWidget):
     2. Drawing detected holds on the image
     3. Highlighting holds on the image when selected
     4. Displaying the currently crated route on the image
+
+    Note:
+        Everything is drawn through one view transform from image to widget coordinates: the
+        fitted image scaled by scale_factor (zoom, 1.0 = whole image visible) and shifted by
+        pan. Holds are drawn in image coordinates with cosmetic pens; only the ones inside the
+        viewport are found through a HoldIndex, and small ones on screen are drawn with less
+        detail. Contour paths are built once per hold and level of detail.
     """
 
     def __init__(self, parent=None) -> None:
@@ -28,13 +89,26 @@ class HoldViewer(QWidget):
         self.next_hand_order = 0  # Counter for the order of the next hand in the route
         self.next_foot_order = 0  # Counter for the order of the next hand in the route
         self.next_hold_order = 0  # Counter for the order of the next hold in the route, old
-        self.scale_factor = 1.0
+        self.scale_factor = 1.0  # Zoom relative to the fitted image
+        self.pan = QPointF(0, 0)  # Shift of the zoomed image in widget pixels
         self.current_hold_type = HoldType.HAND  # Default hold type
-        self.holds: List[Hold] = []
-        self.scaled_points_cache = {}
+        self._holds: List[Hold] = []
+        self._hold_index: Optional[HoldIndex] = None  # Built lazily, dropped when the holds change
+        self._hold_paths = {}  # (hold ID, level of detail, zoom level) -> QPainterPath in image coordinates
         self.arrow_points = {}  # Arrow ID -> dict that contains control points, not used
-        self.wall_image: Optional[QPixmap] = None  # Image of the climbing wall
+        self.wall_image: Optional[QPixmap] = None  # Image of the climbing wall, decoded at display size
+        self.image_path: Optional[str] = None
+        self.image_size: Optional[QSize] = None  # Full resolution size, hold coordinates are in this space
+        self._scaled_wall_image: Optional[QPixmap] = None  # wall_image scaled to the widget, rebuilt on resize
+        self._load_request = 0  # Id of the latest decode request, older results are dropped
+        self._requested_side: Optional[int] = None  # Long side of the latest decode request, None for full size
+        self._image_loaders = set()  # Running decode workers, kept alive until they finish
+        self.pyramid: Optional[ImagePyramid] = None  # Tiled pyramid, used instead of wall_image for huge walls
+        self._tile_cache = OrderedDict()  # (level, tile_x, tile_y) -> QPixmap, least recently used first
+        self._pyramid_repository: Optional[PyramidRepository] = None
+        self._pan_origin: Optional[QPoint] = None  # Last mouse position while panning
         self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.StrongFocus)  # Keyboard zoom
         self.arrow_edit_mode = False
         self.show_numbers = False
         self.selected_arrow = None
@@ -43,64 +117,324 @@ class HoldViewer(QWidget):
         self.dragged_connection = None # Connection being dragged
         self.drag_point = None  # Point on the connection being dragged
         self.active_connection = None  # Connection being edited
+        # Connections of the route by (hold1 ID, hold2 ID), kept so curve edits outlive a repaint
+        self._connections: Dict[Tuple[UUID, UUID], Connection] = {}
+
+    @property
+    def holds(self) -> List[Hold]:
+        return self._holds
+
+    @holds.setter
+    def holds(self, holds: List[Hold]) -> None:
+        self._holds = holds
+        self._hold_index = None
+        self._hold_paths.clear()
+        self._connections.clear()
+
+    def connection_between(self, hold1: Hold, hold2: Hold) -> Connection:
+        """Connection of two consecutive route holds, created straight from the defaults on first use"""
+        key = (hold1.id, hold2.id)
+        connection = self._connections.get(key)
+        if connection is None or connection.hold1 is not hold1 or connection.hold2 is not hold2:
+            connection = Connection(hold1, hold2)
+            self._connections[key] = connection
+        return connection
+
+    def route_connections(self) -> List[Connection]:
+        """Connections between consecutive selected hand holds, then between consecutive foot holds"""
+        return self._limb_connections("hand") + self._limb_connections("foot")
+
+    def _limb_connections(self, limb: str) -> List[Connection]:
+        """Connections between consecutive selected holds of one limb (hand or foot)"""
+        order = f"{limb}_order"
+        holds = sorted((h for h in self.holds if getattr(h, f"is_{limb}_selected") and getattr(h, order) is not None),
+                       key=lambda h: getattr(h, order))
+        return [self.connection_between(a, b) for a, b in zip(holds, holds[1:])]
+
+    def set_connections(self, connections: Iterable[Connection]) -> None:
+        """Replace the connections, e.g. with the curves of a loaded route"""
+        self._connections = {(c.hold1.id, c.hold2.id): c for c in connections}
+
+    def _get_hold_index(self) -> HoldIndex:
+        """Spatial index of the holds, rebuilt when holds were replaced or appended."""
+        if self._hold_index is None or len(self._hold_index) != len(self._holds):
+            self._hold_index = HoldIndex(self._holds)
+        return self._hold_index
 
     def load_image(self, image_path: str) -> None:
-        """Loads the climbing wall image"""
+        """
+        Loads the climbing wall image.
+        Only the header is read here; the pixels are decoded in a worker thread, upright and at
+        the size the widget displays them, and shown once ready.
+        """
         try:
-            self.wall_image = QPixmap(image_path)
-            if self.wall_image.isNull():
-                logger.error(f"Failed to load image: {image_path}")
-                return
-            logger.info(f"Successfully loaded image: {image_path}")
+            width, height = get_oriented_size(image_path)
+            self.image_path = str(image_path)
+            self.image_size = QSize(width, height)
+            self.wall_image = None
+            self._scaled_wall_image = None
+            self.pyramid = None
+            self._tile_cache.clear()
+            self._hold_paths.clear()
+            self.scale_factor = 1.0
+            self.pan = QPointF(0, 0)
+
+            if max(width, height) > ProjectConfig.MAX_IMAGE_SIZE:
+                # Too large for one pixmap: tiles of the visible part are read from the pyramid
+                if self._pyramid_repository is None:
+                    self._pyramid_repository = PyramidRepository(ProjectConfig.PYRAMIDS_DIR)
+                self._request_image(ProjectConfig.DISPLAY_IMAGE_SIZE, self._pyramid_repository)
+            else:
+                self._request_image(self._required_image_size())
+            logger.info(f"Loading image {image_path} ({width}x{height})")
             self.update()
         except Exception as e:
             logger.error(f"Error loading image: {e}")
 
+    def ensure_resolution(self, long_side: int) -> None:
+        """
+        Decodes the image again at a higher resolution if the displayed one is too coarse.
+        Args:
+            long_side: Long side in pixels the image is displayed at
+        """
+        if self.image_size is None or self.wall_image is None or self.pyramid is not None:
+            return
+
+        full_side = max(self.image_size.width(), self.image_size.height())
+        decoded_side = max(self.wall_image.width(), self.wall_image.height())
+        # A decode already on its way counts as done, zooming step by step must not restart it
+        requested_side = full_side if self._requested_side is None else self._requested_side
+        if max(decoded_side, requested_side) < min(long_side, full_side):
+            logger.debug(f"Upgrading wall image from {decoded_side} px to {min(long_side, full_side)} px")
+            self._request_image(self._required_image_size(long_side))
+
+    def _required_image_size(self, long_side: Optional[int] = None) -> Optional[int]:
+        """Long side to decode the image at, None for full resolution."""
+        if long_side is None:
+            long_side = int(max(self.width(), self.height()) * self.devicePixelRatioF())
+        long_side = max(long_side, ProjectConfig.DISPLAY_IMAGE_SIZE)
+
+        full_side = max(self.image_size.width(), self.image_size.height())
+        return long_side if long_side < full_side else None
+
+    def _request_image(self, max_size: Optional[int], pyramid_repository: Optional[PyramidRepository] = None) -> None:
+        self._load_request += 1
+        self._requested_side = max_size
+        worker = ImageLoadWorker(self.image_path, max_size, self._load_request, pyramid_repository)
+        worker.image_loaded.connect(self._on_image_loaded)
+        worker.pyramid_loaded.connect(self._on_pyramid_loaded)
+        worker.error_occurred.connect(self._on_image_error)
+        worker.finished.connect(lambda: self._image_loaders.discard(worker))
+        self._image_loaders.add(worker)
+        worker.start()
+
+    def _on_image_loaded(self, image, request_id: int) -> None:
+        if request_id != self._load_request:
+            return  # A newer image or resolution was requested meanwhile
+        self.wall_image = QPixmap.fromImage(image)
+        self._scaled_wall_image = None
+        logger.info(f"Successfully loaded image: {self.image_path} at {image.width()}x{image.height()}")
+        self.update()
+
+    def _on_pyramid_loaded(self, pyramid_path: str, request_id: int) -> None:
+        if request_id != self._load_request:
+            return
+        self.pyramid = ImagePyramid(pyramid_path)
+        self._tile_cache.clear()
+        logger.info(f"Opened {self.pyramid.level_count}-level image pyramid for {self.image_path}")
+        self.update()
+
+    def _tile_pixmap(self, level: int, tile_x: int, tile_y: int) -> QPixmap:
+        """Get a pyramid tile as a pixmap, converted once and kept in an LRU cache."""
+        key = (level, tile_x, tile_y)
+        pixmap = self._tile_cache.get(key)
+        if pixmap is not None:
+            self._tile_cache.move_to_end(key)
+            return pixmap
+
+        size = self.pyramid.tile_size
+        data = self.pyramid.tile(level, tile_x, tile_y).tobytes()
+        pixmap = QPixmap.fromImage(QImage(data, size, size, 3 * size, QImage.Format_RGB888))
+        self._tile_cache[key] = pixmap
+        while len(self._tile_cache) > ProjectConfig.TILE_CACHE_SIZE:
+            self._tile_cache.popitem(last=False)
+        return pixmap
+
+    def _draw_pyramid(self, painter: QPainter, rect: QRectF) -> None:
+        """Draws the visible tiles of the pyramid level matching the display scale."""
+        scale = rect.width() / self.image_size.width()  # Widget pixels per image pixel
+        level = self.pyramid.level_for_scale(scale * self.devicePixelRatioF())
+        level_scale = scale * 2 ** level  # Widget pixels per level pixel
+        level_width, level_height = self.pyramid.level_size(level)
+        size = self.pyramid.tile_size
+
+        visible = rect.intersected(QRectF(self.rect()))
+        tiles = self.pyramid.tiles_in_region(
+            level,
+            (visible.x() - rect.x()) / level_scale,
+            (visible.y() - rect.y()) / level_scale,
+            visible.width() / level_scale,
+            visible.height() / level_scale
+        )
+        for tile_x, tile_y in tiles:
+            # Edge tiles are padded, only their valid part is drawn
+            source_width = min(size, level_width - tile_x * size)
+            source_height = min(size, level_height - tile_y * size)
+            # Edges snapped to whole pixels shared with the neighbour tiles, so no seams show
+            left = round(rect.x() + tile_x * size * level_scale)
+            top = round(rect.y() + tile_y * size * level_scale)
+            right = round(rect.x() + (tile_x * size + source_width) * level_scale)
+            bottom = round(rect.y() + (tile_y * size + source_height) * level_scale)
+            target = QRect(left, top, right - left, bottom - top)
+            painter.drawPixmap(target, self._tile_pixmap(level, tile_x, tile_y),
+                               QRect(0, 0, source_width, source_height))
+
+    def _draw_wall_image(self, painter: QPainter, transform: QTransform) -> None:
+        """Draws the decoded wall image, only the part of it inside the widget when zoomed in."""
+        image_rect = self._image_rect()
+        if self.scale_factor == 1.0 and self.pan.isNull():
+            # Whole image visible: blit the copy scaled once per widget size
+            rect = image_rect.toRect()
+            if self._scaled_wall_image is None or self._scaled_wall_image.size() != rect.size():
+                self._scaled_wall_image = self.wall_image.scaled(
+                    rect.size(),
+                    Qt.IgnoreAspectRatio,
+                    Qt.SmoothTransformation
+                )
+            painter.drawPixmap(rect.topLeft(), self._scaled_wall_image)
+            return
+
+        visible = transform.inverted()[0].mapRect(QRectF(self.rect())).intersected(
+            QRectF(0, 0, self.image_size.width(), self.image_size.height()))
+        if visible.isEmpty():
+            return
+        pixmap_scale = self.wall_image.width() / self.image_size.width()  # Decoded pixels per image pixel
+        source = QRectF(visible.x() * pixmap_scale, visible.y() * pixmap_scale,
+                        visible.width() * pixmap_scale, visible.height() * pixmap_scale)
+        painter.drawPixmap(transform.mapRect(visible), self.wall_image, source)
+
+    def _on_image_error(self, error_message: str, request_id: int) -> None:
+        if request_id == self._load_request:
+            logger.error(f"Failed to load image: {self.image_path}: {error_message}")
+
+    def fit_transform(self) -> QTransform:
+        """Transform from image to widget coordinates showing the whole image, centered."""
+        if not self.image_size:
+            return QTransform()
+        scale = min(self.width() / self.image_size.width(), self.height() / self.image_size.height())
+        return QTransform(
+            scale, 0, 0, scale,
+            (self.width() - self.image_size.width() * scale) / 2,
+            (self.height() - self.image_size.height() * scale) / 2
+        )
+
+    def view_transform(self) -> QTransform:
+        """Transform from image to widget coordinates, with the current zoom and pan."""
+        fit = self.fit_transform()
+        scale = fit.m11() * self.scale_factor
+        if not self.image_size:
+            return fit
+        return QTransform(
+            scale, 0, 0, scale,
+            (self.width() - self.image_size.width() * scale) / 2 + self.pan.x(),
+            (self.height() - self.image_size.height() * scale) / 2 + self.pan.y()
+        )
+
+    def _image_rect(self) -> QRectF:
+        """Rectangle of the widget the image is displayed in, may exceed the widget when zoomed in."""
+        return self.view_transform().mapRect(QRectF(0, 0, self.image_size.width(), self.image_size.height()))
+
+    def _clamp_pan(self) -> None:
+        """Keeps the zoomed image covering the widget, a smaller image stays centered."""
+        scale = self.fit_transform().m11() * self.scale_factor
+        max_x = max(0.0, (self.image_size.width() * scale - self.width()) / 2)
+        max_y = max(0.0, (self.image_size.height() * scale - self.height()) / 2)
+        self.pan = QPointF(min(max(self.pan.x(), -max_x), max_x), min(max(self.pan.y(), -max_y), max_y))
+
+    def zoom_at(self, pos: QPointF, factor: float) -> None:
+        """
+        Zooms in or out keeping the image point under pos in place.
+        Args:
+            pos: Widget position, e.g. the mouse cursor
+            factor: Zoom multiplier, above 1 zooms in
+        """
+        if not self.image_size:
+            return
+
+        zoom = min(max(self.scale_factor * factor, 1.0), ProjectConfig.MAX_VIEW_ZOOM)
+        if zoom == self.scale_factor:
+            return
+        image_point = self.view_transform().inverted()[0].map(QPointF(pos))
+        self.scale_factor = zoom
+        self.pan = QPointF(0, 0)
+        self.pan = QPointF(pos) - self.view_transform().map(image_point)
+        self._clamp_pan()
+        self._on_view_changed()
+
+    def pan_by(self, dx: float, dy: float) -> None:
+        """Moves the zoomed image by dx, dy widget pixels."""
+        if not self.image_size:
+            return
+        self.pan += QPointF(dx, dy)
+        self._clamp_pan()
+        self.update()
+
+    def reset_view(self) -> None:
+        """Shows the whole image again."""
+        self.scale_factor = 1.0
+        self.pan = QPointF(0, 0)
+        self._on_view_changed()
+
+    def _on_view_changed(self) -> None:
+        fit = self.fit_transform().m11()
+        long_side = max(self.image_size.width(), self.image_size.height())
+        self.ensure_resolution(int(long_side * fit * self.scale_factor * self.devicePixelRatioF()))
+        self.update()
+
     def sizeHint(self) -> QSize:
         """Sugerowany rozmiar widgetu"""
-        if self.wall_image:
-            return self.wall_image.size()
+        if self.image_size:
+            return self.image_size
         return QSize(1080, 880)
 
     def resizeEvent(self, event) -> None:
         """Clear cache and update the widget when resized."""
-        self.scaled_points_cache.clear()
+        self._scaled_wall_image = None
         super().resizeEvent(event)
+        if self.image_size:
+            self._clamp_pan()
+        self.ensure_resolution(int(max(self.width(), self.height()) * self.scale_factor * self.devicePixelRatioF()))
 
     def paintEvent(self, event) -> None:
         """
         Draws the image and the holds on the widget.
         Method called by the Qt framework whenever the widget needs to be redrawn.
         """
-        logger.debug("paintEvent called")
+        with metrics.timer("hold_viewer_paint_seconds"):
+            painter = QPainter(self)
+            self.render_view(painter)
+            painter.end()
 
-        painter = QPainter(self)
+    def render_view(self, painter: QPainter) -> None:
+        """
+        Draws the wall, the holds and the route with a painter on any paint device of the widget size.
+        """
         painter.setRenderHint(QPainter.Antialiasing)
-        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        # Exact filtering only when idle, panning must stay fluid
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self._pan_origin is None)
 
         painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        transform = self.view_transform()
 
         # First draw the wall image if available
-        if self.wall_image:
-            logger.debug("Wall image is available")
-            # Skalujemy obraz do wymiarów widgetu zachowując proporcje
-            scaled_image = self.wall_image.scaled(
-                self.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            # Centrujemy obraz w widgecie
-            x = (self.width() - scaled_image.width()) // 2
-            y = (self.height() - scaled_image.height()) // 2
-            logger.debug(f"Drawing wall image at position ({x}, {y})") # TODO fixme shows 136, 0 every time
-            painter.drawPixmap(x, y, scaled_image)
-        else:
-            logger.debug("No wall image to draw")
+        if self.pyramid:
+            self._draw_pyramid(painter, self._image_rect())
+        elif self.wall_image:
+            self._draw_wall_image(painter, transform)
 
-        # Draw the holds
-        for hold in self.holds:
-            # logger.debug(f"Drawing hold: {hold}")
-            self.draw_hold(painter, hold)
+        # Holds and connections are drawn in image coordinates
+        painter.setTransform(transform)
+        self.draw_visible_holds(painter, transform.inverted()[0].mapRect(QRectF(self.rect())), transform.m11())
 
         # # Draw route connections
         # selected_holds = [h for h in self.holds if h.is_selected]
@@ -112,169 +446,139 @@ class HoldViewer(QWidget):
         """
         Converts widget coordinates to image coordinates.
         """
-        if not self.wall_image:
+        if not self.image_size:
             return widget_x, widget_y
 
-        # Similar setup as get_scaled_coordinates
-        scaled_image = self.wall_image.scaled(
-            self.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-
-        x_offset = (self.width() - scaled_image.width()) // 2
-        y_offset = (self.height() - scaled_image.height()) // 2
-
-        # Remove offset
-        image_x = widget_x - x_offset
-        image_y = widget_y - y_offset
-
-        # Convert back to original scale
-        scale_x = self.wall_image.width() / scaled_image.width()
-        scale_y = self.wall_image.height() / scaled_image.height()
-
-        return image_x * scale_x, image_y * scale_y
+        point = self.view_transform().inverted()[0].map(QPointF(widget_x, widget_y))
+        return point.x(), point.y()
 
     def get_scaled_coordinates(self, x: float, y: float) -> tuple[float, float]:
         """
-        Scales the point coordinates based on the current scale factor.
+        Converts image coordinates to widget coordinates, with the current zoom and pan.
         """
-        if not self.wall_image:
+        if not self.image_size:
             logger.warning("No wall image available for scaling")
             return x, y
 
-        # Get original and scaled image dimensions
-        orig_width = self.wall_image.width()
-        orig_height = self.wall_image.height()
-
-        scaled_image = self.wall_image.scaled(
-            self.size(),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-        scaled_width = scaled_image.width()
-        scaled_height = scaled_image.height()
-
-        # Calculate scale factors
-        scale_x = scaled_width / orig_width
-        scale_y = scaled_height / orig_height
-
-        # Calculate offsets for centering
-        x_offset = (self.width() - scaled_width) // 2
-        y_offset = (self.height() - scaled_height) // 2
+        point = self.view_transform().map(QPointF(x, y))
+        return point.x(), point.y()
 
-        # Scale coordinates
-        new_x = (x * scale_x) + x_offset
-        new_y = (y * scale_y) + y_offset
-
-        return new_x, new_y
-
-    def get_scaled_points_for_hold(self, hold: Hold) -> List[QPoint]:
-        """Get the scaled contour points for a hold."""
-        # Id of the hold used as a key in the cache
-        cache_key = hold.id
-        if cache_key in self.scaled_points_cache:
-            return self.scaled_points_cache[cache_key]
-
-        scaled_points = []
-        for p in hold.contour_points:
-            x, y = self.get_scaled_coordinates(p.x, p.y)
-            scaled_points.append(QPoint(int(x), int(y)))
-
-        # Save the scaled points in the cache
-        self.scaled_points_cache[cache_key] = scaled_points
-        return scaled_points
-
-    def draw_hold(self, painter: QPainter, hold: Hold) -> None:
-        """Draws a single hold with antialiasing and optimized rendering."""
+    @staticmethod
+    def _hold_color(hold: Hold) -> QColor:
         if hold.is_hand_selected:
-            color = QColor(255, 165, 0)  # Orange dla rąk
-        elif hold.is_foot_selected:
-            color = QColor(255, 0, 0)  # Red dla nóg
-        else:
-            color = QColor(200, 200, 200)  # szary dla niezaznaczonych
+            return HAND_COLOR
+        if hold.is_foot_selected:
+            return FOOT_COLOR
+        return UNSELECTED_COLOR
 
-        # Better quality rendering
-        pen = QPen(color, 2, Qt.SolidLine)
-        pen.setJoinStyle(Qt.RoundJoin)  # Round line corners
-        pen.setCapStyle(Qt.RoundCap)  # Round line endings
-        painter.setPen(pen)
+    def _hold_path(self, hold: Hold, lod: int, zoom_level: int = 0) -> QPainterPath:
+        """
+        Get the outline of a hold in image coordinates, built once per level of detail.
+        Simplified outlines are cached per zoom level: at level k the contour may deviate by 2**k
+        image pixels, zoom levels are powers of two apart so panning and small zoom steps reuse them.
+        """
+        key = (hold.id, lod, zoom_level if lod == LOD_SIMPLIFIED else 0)
+        path = self._hold_paths.get(key)
+        if path is not None:
+            return path
+
+        path = QPainterPath()
+        points = hold.contour_points
+        if lod == LOD_BOX or not points:
+            x_min, y_min, x_max, y_max = hold.bounds
+            path.addRect(QRectF(x_min, y_min, x_max - x_min, y_max - y_min))
+        else:
+            points = [(p.x, p.y) for p in points]
+            if lod == LOD_SIMPLIFIED:
+                points = simplify_contour(points, 2.0 ** zoom_level).tolist()
+            path.addPolygon(QPolygonF([QPointF(x, y) for x, y in points]))
+            path.closeSubpath()
 
-        if hold.contour_points:
-            points = self.get_scaled_points_for_hold(hold)
-            path = QPainterPath()
-            if points:
-                path.moveTo(points[0])
-                for point in points[1:]:
-                    path.lineTo(point)
-                path.lineTo(points[0])
-
-            # Filler color for selected holds
-            if hold.is_hand_selected:  # new color for hands
-                painter.fillPath(path, QColor(255, 165, 0, 30))  # Orange with transparency
-            elif hold.is_foot_selected:
-                painter.fillPath(path, QColor(255, 0, 0, 30))  # Red with transparency
-            else:
-                painter.fillPath(path, QColor(200, 200, 200, 30))  # Default color
+        self._hold_paths[key] = path
+        return path
 
-            painter.drawPath(path)
+    def draw_hold(self, painter: QPainter, hold: Hold, lod: int = LOD_FULL) -> None:
+        """
+        Draws a single hold, the painter has to map image coordinates.
+        Args:
+            painter: Painter with the view transform set
+            hold: Hold to draw
+            lod: Level of detail of the outline
+        """
+        color = self._hold_color(hold)
+        # Outline and transparent fill in one call
+        painter.setPen(_outline_pen(color, 2 if lod == LOD_FULL else 1))
+        painter.setBrush(_fill_color(color))
+        painter.drawPath(self._hold_path(hold, lod))
+        painter.setBrush(Qt.NoBrush)
+
+    def draw_visible_holds(self, painter: QPainter, visible: QRectF, scale: float) -> None:
+        """
+        Draws the holds overlapping a rectangle, with detail matching their size on screen.
+        Args:
+            painter: Painter with the view transform set
+            visible: Visible part of the image, in image coordinates
+            scale: Widget pixels per image pixel
+        """
+        if not self._holds:
+            return
 
+        index = self._get_hold_index()
+        indices = index.query_rect(visible.left(), visible.top(), visible.right(), visible.bottom())
+        boxes = index.boxes[indices]
+        screen_sizes = np.maximum(boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]) * scale
+        zoom_level = math.floor(math.log2(1 / scale))  # Simplification of at most one screen pixel
+
+        # Holds are grouped by color and level of detail, so pen and brush are set once per group.
+        # Holds too small to show their shape are drawn with a single drawRects call per color.
+        small_holds = defaultdict(list)
+        shaped_holds = defaultdict(list)
+        for i, screen_size in zip(indices.tolist(), screen_sizes.tolist()):
+            hold = self._holds[i]
+            if screen_size < BOX_LOD_SIZE:
+                x_min, y_min, x_max, y_max = index.boxes[i]
+                small_holds[self._hold_color(hold).rgb()].append(QRectF(x_min, y_min, x_max - x_min, y_max - y_min))
+            else:
+                lod = LOD_FULL if screen_size >= FULL_LOD_SIZE else LOD_SIMPLIFIED
+                shaped_holds[self._hold_color(hold).rgb(), lod].append(self._hold_path(hold, lod, zoom_level))
+
+        for rgb, rects in small_holds.items():
+            color = QColor.fromRgb(rgb)
+            painter.setPen(_outline_pen(color, 1))
+            painter.setBrush(_fill_color(color))
+            painter.drawRects(rects)
+        for (rgb, lod), paths in shaped_holds.items():
+            color = QColor.fromRgb(rgb)
+            painter.setPen(_outline_pen(color, 2 if lod == LOD_FULL else 1))
+            painter.setBrush(_fill_color(color))
+            for path in paths:
+                painter.drawPath(path)
+        painter.setBrush(Qt.NoBrush)
 
     def draw_route_connections(self, painter: QPainter, selected_holds: List[Hold]) -> None:
         """
         Draws connections between the selected holds to represent the climbing route.
+        The painter has to map image coordinates.
         """
-
-        # Draw connections between the selected hand holds
-        hand_holds = [h for h in self.holds if h.is_hand_selected]
-        hand_holds.sort(key=lambda h: h.hand_order if h.hand_order is not None else float('inf'))
-
-        if len(hand_holds) >= 2:
-            painter.setPen(QPen(QColor(255, 165, 0), 2))  # orange
-            for i in range(len(hand_holds) - 1):
-                hold1, hold2 = hand_holds[i], hand_holds[i + 1]
-                if hold1.hand_order is not None and hold2.hand_order is not None:  # check if they have order
-                    connection = Connection(hold1, hold2)
-                    self.draw_single_connection(painter, connection)
-
-                    # x1, y1 = self.get_scaled_coordinates(hold1.x, hold1.y)
-                    # x2, y2 = self.get_scaled_coordinates(hold2.x, hold2.y)
-                    # painter.drawLine(int(x1), int(y1), int(x2), int(y2))
-
-        # Draw connections between the selected foot holds
-        foot_holds = [h for h in self.holds if h.is_foot_selected]
-        foot_holds.sort(key=lambda h: h.foot_order if h.foot_order is not None else float('inf'))
-
-        if len(foot_holds) >= 2:
-            painter.setPen(QPen(QColor(255, 0, 0), 2))  # red
-            for i in range(len(foot_holds) - 1):
-                hold1, hold2 = foot_holds[i], foot_holds[i + 1]
-                if hold1.foot_order is not None and hold2.foot_order is not None:  # check if they have order
-                    connection = Connection(hold1, hold2)
-                    self.draw_single_connection(painter, connection)
-
-                    # x1, y1 = self.get_scaled_coordinates(hold1.x, hold1.y)
-                    # x2, y2 = self.get_scaled_coordinates(hold2.x, hold2.y)
-                    # painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+        # Hand holds in orange, foot holds in red
+        for limb, color in (("hand", HAND_COLOR), ("foot", FOOT_COLOR)):
+            painter.setPen(_outline_pen(color))
+            for connection in self._limb_connections(limb):
+                self.draw_single_connection(painter, connection)
 
     def draw_single_connection(self, painter: QPainter, connection: Connection) -> None:
         """
-        Draws a single connection between two holds.
+        Draws a single connection between two holds, in image coordinates.
+        Markers and numbers keep their size on screen.
         """
-        x1, y1 = self.get_scaled_coordinates(connection.hold1.x, connection.hold1.y)
-        x2, y2 = self.get_scaled_coordinates(connection.hold2.x, connection.hold2.y)
+        x1, y1 = connection.hold1.x, connection.hold1.y
+        x2, y2 = connection.hold2.x, connection.hold2.y
 
         if connection.is_curved:
             if not connection.control_points:
-                # Calculate the scaled control point perpendicularly to the line between the holds
-                mid_x = (x1 + x2) / 2
-                mid_y = (y1 + y2) / 2
-                dx = -(y2 - y1) * 0.2  # perpendicularly placed vector
-                dy = (x2 - x1) * 0.2
-                connection.control_points = (mid_x + dx, mid_y + dy)
-
+                # Control point perpendicular to the line between the holds
+                connection.control_points = default_control_point(connection)
 
-            # Get the scaled control point
             control_x, control_y = connection.control_points
 
             # Draw the curved connection Bezier curve
@@ -285,25 +589,54 @@ class HoldViewer(QWidget):
 
             # Draw control point if in edit mode
             if self.current_mode == "curve_edit":
+                center = painter.transform().map(QPointF(control_x, control_y))
+                painter.save()
+                painter.resetTransform()
                 painter.setPen(QPen(Qt.red, 1))
-                painter.drawEllipse(
-                    int(control_x - 5),
-                    int(control_y - 5),
-                    10, 10
-                )
+                painter.drawEllipse(center, 5, 5)
+                painter.restore()
         else:
             # Draw straight line
-            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+            painter.drawLine(QPointF(x1, y1), QPointF(x2, y2))
 
         # Draw number if exists
         if connection.number is not None:
-            mid_x = (x1 + x2) / 2
-            mid_y = (y1 + y2) / 2
-            painter.drawText(
-                int(mid_x - 10),
-                int(mid_y - 10),
-                str(connection.number)
-            )
+            mid = painter.transform().map(QPointF((x1 + x2) / 2, (y1 + y2) / 2))
+            painter.save()
+            painter.resetTransform()
+            painter.drawText(int(mid.x() - 10), int(mid.y() - 10), str(connection.number))
+            painter.restore()
+
+    def wheelEvent(self, event) -> None:
+        """Zooms around the mouse cursor."""
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom_at(event.pos(), ZOOM_STEP ** steps)
+        event.accept()
+
+    def keyPressEvent(self, event) -> None:
+        """+ and - zoom around the widget center, 0 shows the whole image."""
+        center = QPointF(self.width() / 2, self.height() / 2)
+        if event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.zoom_at(center, ZOOM_STEP)
+        elif event.key() == Qt.Key_Minus:
+            self.zoom_at(center, 1 / ZOOM_STEP)
+        elif event.key() == Qt.Key_0:
+            self.reset_view()
+        else:
+            super().keyPressEvent(event)
+
+    def mouseMoveEvent(self, event) -> None:
+        """Pans the image while the middle button (or Ctrl + left button) is held."""
+        if self._pan_origin is not None:
+            delta = event.pos() - self._pan_origin
+            self._pan_origin = event.pos()
+            self.pan_by(delta.x(), delta.y())
+
+    def mouseReleaseEvent(self, event) -> None:
+        if self._pan_origin is not None:
+            self._pan_origin = None
+            self.update()  # Redraw with exact filtering
 
     def mousePressEvent(self, event) -> None:
         """
@@ -311,31 +644,24 @@ class HoldViewer(QWidget):
         When a user clicks on a hold:
         - if the hold wasn't selected - selects it and gives it the next order number
         - if the hold was selected - deselects it
+        Middle button or Ctrl + left button starts panning.
         """
 
-        if not self.wall_image:
+        if not self.image_size:
             return
 
         if not self.rect().contains(event.pos()):
             return  # Ignore clicks outside the widget
 
+        if event.button() == Qt.MiddleButton or (
+                event.button() == Qt.LeftButton and event.modifiers() & Qt.ControlModifier):
+            self._pan_origin = event.pos()
+            return
+
         # New curve editing mode
         if self.current_mode == "curve_edit":
-            # Get active connections from current holds
-            hand_holds = [h for h in self.holds if h.is_hand_selected]
-            foot_holds = [h for h in self.holds if h.is_foot_selected]
-
-            active_connections = [] # List of active connections
-
-            # Add hand connections
-            for i in range(len(hand_holds) - 1):
-                if hand_holds[i].hand_order is not None and hand_holds[i + 1].hand_order is not None:
-                    active_connections.append(Connection(hand_holds[i], hand_holds[i + 1]))
-
-            # Add foot connections
-            for i in range(len(foot_holds) - 1):
-                if foot_holds[i].foot_order is not None and foot_holds[i + 1].foot_order is not None:
-                    active_connections.append(Connection(foot_holds[i], foot_holds[i + 1]))
+            # Active connections of the current holds, the same objects that are drawn and saved
+            active_connections = self.route_connections()
 
             # Check for clicks on control points or connection midpoints
             for connection in active_connections:
@@ -365,29 +691,49 @@ class HoldViewer(QWidget):
         # Convert click coordinates to image coordinates
         image_x, image_y = self.get_image_coordinates(widget_x, widget_y)
 
-        for hold in self.holds:
+        with metrics.timer("hold_viewer_hit_test_seconds"):
+            hold = self.hold_at(image_x, image_y)
+        if hold is not None:
+            if self.current_hold_type == HoldType.HAND:
+                if not hold.is_hand_selected:
+                    hold.is_hand_selected = True
+                    hold.hand_order = self.next_hand_order  # ustawiamy kolejność
+                    self.next_hand_order += 1
+                else:
+                    hold.is_hand_selected = False
+                    hold.hand_order = None
+                    self._update_hand_order()
+            else:  # FOOT
+                if not hold.is_foot_selected:
+                    hold.is_foot_selected = True
+                    hold.foot_order = self.next_foot_order  # ustawiamy kolejność
+                    self.next_foot_order += 1
+                else:
+                    hold.is_foot_selected = False
+                    hold.foot_order = None
+                    self._update_foot_order()
+
+            self.update()
+
+    def hold_at(self, image_x: float, image_y: float) -> Optional[Hold]:
+        """
+        Find the hold under a point. Contours are simplified by up to ProjectConfig.CONTOUR_TOLERANCE
+        pixels, so a point that close to a hold counts as on it when no hold contains it exactly.
+        Args:
+            image_x, image_y: Point in image coordinates
+        Returns:
+            Hold: The hold under the point, None if there is none
+        """
+        tolerance = ProjectConfig.CONTOUR_TOLERANCE
+        # Only holds whose box (grown by the tolerance) contains the point are tested against their contour
+        candidates = [self.holds[i] for i in self._get_hold_index().query_point(image_x, image_y, tolerance).tolist()]
+        for hold in candidates:
             if hold.contains_point(image_x, image_y):
-                if self.current_hold_type == HoldType.HAND:
-                    if not hold.is_hand_selected:
-                        hold.is_hand_selected = True
-                        hold.hand_order = self.next_hand_order  # ustawiamy kolejność
-                        self.next_hand_order += 1
-                    else:
-                        hold.is_hand_selected = False
-                        hold.hand_order = None
-                        self._update_hand_order()
-                else:  # FOOT
-                    if not hold.is_foot_selected:
-                        hold.is_foot_selected = True
-                        hold.foot_order = self.next_foot_order  # ustawiamy kolejność
-                        self.next_foot_order += 1
-                    else:
-                        hold.is_foot_selected = False
-                        hold.foot_order = None
-                        self._update_foot_order()
-
-                self.update()
-                break
+                return hold
+        for hold in candidates:
+            if hold.contains_point(image_x, image_y, tolerance):
+                return hold
+        return None
 
     def _set_mode(self, mode: str) -> None:
         """Sets the current mode of the hold viewer."""
@@ -398,22 +744,18 @@ class HoldViewer(QWidget):
     def _update_hand_order(self) -> None:
         """Updates the order of hand holds."""
         selected_hand_holds = [h for h in self.holds if h.is_hand_selected]
-        logger.debug(f"Updating order for {len(selected_hand_holds)} hand holds")
-
         for i, hold in enumerate(selected_hand_holds):
             hold.hand_order = i
-            logger.debug(f"Hand hold {hold.id} set to order {i}")
+        logger.debug("Renumbered %d hand holds", len(selected_hand_holds))
 
         self.next_hand_order = len(selected_hand_holds)
 
     def _update_foot_order(self) -> None:
         """Updates the order of foot holds."""
         selected_foot_holds = [h for h in self.holds if h.is_foot_selected]
-        logger.debug(f"Updating order for {len(selected_foot_holds)} foot holds")
-
         for i, hold in enumerate(selected_foot_holds):
             hold.foot_order = i
-            logger.debug(f"Foot hold {hold.id} set to order {i}")
+        logger.debug("Renumbered %d foot holds", len(selected_foot_holds))
 
         self.next_foot_order = len(selected_foot_holds)
 
@@ -20,11 +20,14 @@ class RouteToolbar(QWidget):
         # Route Controls Group
         route_group = self.create_button_group([
             ("New Route", "plus.png", False),
-            ("Save Route", "save.png", False)
+            ("Save Route", "save.png", False),
+            ("Suggest Beta", "beta.png", False)
         ])
         self.new_route_button = route_group.findChild(QPushButton, "New Route")
         self.save_route_button = route_group.findChild(QPushButton, "Save Route")
         self.save_route_button.setEnabled(True)
+        self.suggest_beta_button = route_group.findChild(QPushButton, "Suggest Beta")
+        self.suggest_beta_button.setToolTip("Order the selected holds automatically")
         layout.addWidget(route_group)
 
         layout.addWidget(self.create_vertical_separator())
@@ -1,6 +1,10 @@
+from PIL import Image
 from PyQt5.QtCore import QThread, pyqtSignal
 from src.core.hold import Hold
+from src.storage.repositories.pyramid_repository import PyramidRepository
+from src.utils.image_utils import compute_image_hash, get_oriented_size, oriented_image_path
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 from src.utils.config import ProjectConfig
 
 logger = setup_logger("detection_worker", ProjectConfig.get_log_file("detection"))
@@ -28,16 +32,52 @@ class DetectionWorker(QThread):
         try:
             logger.info(f"Starting hold detection for image {self.image_path}")
 
-            detection_result = self.roboflow_client.detect_holds(self.image_path)
+            with metrics.timer("detection_seconds"):
+                detection_path, scale = self._detection_image()
+                detection_result = self.roboflow_client.detect_holds(detection_path)
 
-            holds = []
-            for prediction in detection_result['predictions']:
-                hold = Hold.from_detection(prediction)
-                holds.append(hold)
+                with metrics.timer("hold_construction_seconds"):
+                    holds = []
+                    for prediction in detection_result['predictions']:
+                        if scale != 1.0:
+                            prediction = self._scale_prediction(prediction, scale)
+                        hold = Hold.from_detection(prediction)
+                        holds.append(hold)
 
             logger.info(f"Detected {len(holds)} holds in image {self.image_path}")
             self.detection_completed.emit(holds)
 
         except Exception as e:
+            metrics.increment("detection_errors_total")
             logger.error(f"Error during hold detection: {str(e)}")
             self.error_occurred.emit(str(e))
+
+    def _detection_image(self):
+        """
+        Image sent for detection, and the factor mapping its coordinates to the full image.
+        Detection runs on the upright image so hold coordinates match what the HoldViewer displays.
+        Huge walls are read from their pyramid at a bounded size instead of being decoded whole.
+        """
+        width, height = get_oriented_size(self.image_path)
+        if max(width, height) <= ProjectConfig.MAX_IMAGE_SIZE:
+            return oriented_image_path(self.image_path), 1.0
+
+        image_hash = compute_image_hash(self.image_path)
+        detection_path = ProjectConfig.CACHE_DIR / f"{image_hash}_detect_{ProjectConfig.MAX_IMAGE_SIZE}.jpg"
+        pyramid = PyramidRepository(ProjectConfig.PYRAMIDS_DIR).get_or_build(self.image_path, image_hash)
+        if not detection_path.exists():
+            pyramid.read_image(ProjectConfig.MAX_IMAGE_SIZE).save(detection_path, "JPEG", quality=95)
+
+        with Image.open(detection_path) as image:
+            scale = pyramid.width / image.width
+        logger.info(f"Detecting on {detection_path}, coordinates scaled by {scale:.2f}")
+        return detection_path, scale
+
+    @staticmethod
+    def _scale_prediction(prediction: dict, scale: float) -> dict:
+        """Map a prediction made on a downscaled image back to full resolution coordinates."""
+        scaled = dict(prediction)
+        for key in ('x', 'y', 'width', 'height'):
+            scaled[key] = prediction[key] * scale
+        scaled['points'] = [{**p, 'x': p['x'] * scale, 'y': p['y'] * scale} for p in prediction.get('points', [])]
+        return scaled
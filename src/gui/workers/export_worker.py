@@ -0,0 +1,184 @@
+import copy
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from src.core.hold import Hold
+from src.core.route import Route
+from src.utils.image_utils import load_image
+from src.utils.metrics import metrics
+from src.utils.route_image_processor import RouteImageProcessor
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("export_worker", ProjectConfig.get_log_file("export"))
+
+
+@dataclass
+class ExportJob:
+    """
+    Snapshot of everything needed to export the images of one route.
+
+    Attributes:
+        route (Route): Copy of the route, bound to the copied holds
+        holds (List[Hold]): Copies of all holds of the wall
+        image_path (str): Wall photo
+        output_dir (str): Directory the images are written to
+        base_name (str): File name stem, the export profile name and extension are appended
+    """
+    route: Route
+    holds: List[Hold]
+    image_path: str
+    output_dir: str
+    base_name: str
+
+    @property
+    def key(self) -> str:
+        return str(self.route.id)
+
+    @classmethod
+    def snapshot(cls, route: Route, holds: List[Hold], image_path: str, output_dir: str,
+                 base_name: str) -> 'ExportJob':
+        """
+        Copy the route state so the GUI can keep editing while the export runs.
+        Args:
+            route (Route): Route built from the live holds of the HoldViewer
+            holds (List[Hold]): Live holds of the HoldViewer
+            image_path (str): Wall photo
+            output_dir (str): Directory the images are written to
+            base_name (str): File name stem of the images
+        Returns:
+            ExportJob: Job that shares no mutable state with the GUI
+        """
+        # Shallow copies are enough, the GUI only changes selection flags and orders of a hold
+        hold_copies = [copy.copy(hold) for hold in holds]
+        route_copy = Route.from_model(route.to_model(), hold_copies)
+        return cls(route=route_copy, holds=hold_copies, image_path=str(image_path),
+                   output_dir=str(output_dir), base_name=base_name)
+
+
+class _ExportRunnable(QRunnable):
+    """Pool task running the latest pending job of one route."""
+
+    def __init__(self, queue: 'ExportQueue', key: str):
+        super().__init__()
+        self.queue = queue
+        self.key = key
+
+    def run(self):
+        self.queue._run(self.key)
+
+
+class ExportQueue(QObject):
+    """
+    Queue rendering and encoding route images on a worker pool, off the GUI thread.
+
+    Note:
+        Every job renders the route once and writes all export profiles of the processor,
+        see RouteImageProcessor.write_profiles.
+        Jobs are coalesced per route: a save submitted while an older job of the same route is
+        still waiting replaces it, and a save submitted while one is running is exported once
+        the running one finishes. Intermediate states of a route are never rendered.
+        Signals are emitted from pool threads and delivered to GUI slots as queued connections.
+    """
+
+    export_started = pyqtSignal(str)  # route id
+    export_progress = pyqtSignal(str, int)  # route id, percent
+    export_completed = pyqtSignal(str, str)  # route id, path of the largest image
+    error_occurred = pyqtSignal(str, str)  # route id, error message
+
+    def __init__(self, processor: RouteImageProcessor, max_workers: Optional[int] = None,
+                 thumbnail_cache: Optional[ThumbnailCache] = None, parent: QObject = None):
+        super().__init__(parent)
+        self.processor = processor
+        self.thumbnail_cache = thumbnail_cache
+        self.pool = QThreadPool(self)
+        if max_workers is not None:
+            self.pool.setMaxThreadCount(max_workers)
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, ExportJob] = {}
+        self._running: Set[str] = set()
+
+    def submit(self, job: ExportJob) -> bool:
+        """
+        Queue a route export.
+        Args:
+            job (ExportJob): Snapshot of the route to export
+        Returns:
+            bool: True if a new task was scheduled, False if the job was merged into a queued one
+        """
+        with self._lock:
+            queued = job.key in self._pending
+            self._pending[job.key] = job
+            schedule = not queued and job.key not in self._running
+
+        if schedule:
+            self.pool.start(_ExportRunnable(self, job.key))
+            logger.info(f"Queued export of route {job.key} to {job.output_dir}")
+        else:
+            logger.debug(f"Coalesced export of route {job.key} with a pending one")
+        return schedule
+
+    def pending_count(self) -> int:
+        """Number of routes waiting for or being exported."""
+        with self._lock:
+            return len(self._pending.keys() | self._running)
+
+    def wait_for_done(self, timeout_ms: int = -1) -> bool:
+        """
+        Block until all queued exports are written.
+        Args:
+            timeout_ms (int): Maximum time to wait, -1 waits forever
+        Returns:
+            bool: True if all exports finished
+        """
+        return self.pool.waitForDone(timeout_ms)
+
+    def _run(self, key: str) -> None:
+        with self._lock:
+            job = self._pending.pop(key)
+            self._running.add(key)
+
+        try:
+            self.export_started.emit(key)
+            output_path = self._export(job)
+            logger.info(f"Exported route {key} to {job.output_dir}")
+            self.export_completed.emit(key, str(output_path))
+
+        except Exception as e:
+            logger.error(f"Error exporting route {key}: {str(e)}")
+            self.error_occurred.emit(key, str(e))
+
+        finally:
+            with self._lock:
+                self._running.discard(key)
+                reschedule = key in self._pending
+            if reschedule:
+                self.pool.start(_ExportRunnable(self, key))
+
+    def _export(self, job: ExportJob) -> Path:
+        """Render and write all profiles of a job, returns the path of the largest image"""
+        key = job.key
+        image = load_image(job.image_path)
+        self.export_progress.emit(key, 30)
+
+        with metrics.timer("route_export_render_seconds"):
+            rendered = self.processor.renderer.render(image, job.route, job.holds)
+        self.export_progress.emit(key, 60)
+
+        written = self.processor.write_profiles(rendered, job.output_dir, job.base_name)
+        if not written:
+            raise ValueError("No export profiles configured")
+        output_path = next(iter(written.values()))
+        self.export_progress.emit(key, 90)
+
+        if self.thumbnail_cache is not None:
+            # Downscaled from the render in memory, the written image is not decoded again
+            self.thumbnail_cache.ingest(output_path, image=rendered)
+        self.export_progress.emit(key, 100)
+        return output_path
@@ -0,0 +1,51 @@
+from typing import Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from src.storage.repositories.pyramid_repository import PyramidRepository
+from src.utils.image_utils import load_image
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("image_load_worker", ProjectConfig.get_log_file("gui"))
+
+
+class ImageLoadWorker(QThread):
+    """
+    Worker class decoding a wall image off the GUI thread.
+    Produces a QImage (QPixmaps can only be created on the GUI thread).
+    With a pyramid repository, the tiled pyramid of the image is opened (built on first use)
+    and the QImage is a downscaled overview read from it.
+    """
+
+    image_loaded = pyqtSignal(QImage, int)  # decoded image, request id
+    pyramid_loaded = pyqtSignal(str, int)  # pyramid directory, request id
+    error_occurred = pyqtSignal(str, int)  # error message, request id
+
+    def __init__(self, image_path: str, max_size: Optional[int], request_id: int,
+                 pyramid_repository: Optional[PyramidRepository] = None):
+        super().__init__()
+        self.image_path = image_path
+        self.max_size = max_size
+        self.request_id = request_id
+        self.pyramid_repository = pyramid_repository
+
+    def run(self):
+        try:
+            if self.pyramid_repository is not None:
+                pyramid = self.pyramid_repository.get_or_build(self.image_path)
+                self.pyramid_loaded.emit(str(pyramid.path), self.request_id)
+                image = pyramid.read_image(self.max_size)
+            else:
+                image = load_image(self.image_path, self.max_size)
+            data = image.tobytes("raw", "RGB")
+            # copy() makes the QImage own its pixels, data goes out of scope with this thread
+            qimage = QImage(data, image.width, image.height, 3 * image.width, QImage.Format_RGB888).copy()
+
+            logger.info(f"Decoded {self.image_path} at {image.width}x{image.height}")
+            self.image_loaded.emit(qimage, self.request_id)
+
+        except Exception as e:
+            logger.error(f"Error decoding image {self.image_path}: {str(e)}")
+            self.error_occurred.emit(str(e), self.request_id)
@@ -193,22 +193,37 @@
 #     app = ClimbingApp()
 #     sys.exit(app.run())
 
+import argparse
 import sys
-from PyQt5.QtWidgets import QApplication, QMessageBox
+from typing import Optional
+from PyQt5.QtWidgets import QApplication, QMessageBox, QShortcut
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
 from src.gui.main_window import MainWindow
 from src.gui.widgets.startup_window import StartupWindow
 from src.gui.widgets.loading_window import LoadingWindow
 from src.gui.workers.detection_worker import DetectionWorker
 from src.api.roboflow_client import RoboflowClient
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.profiler import AppProfiler, PROFILE_MODES
 from src.utils.config import ProjectConfig
 
 logger = setup_logger("main", ProjectConfig.get_log_file("main"))
 
 
 class ClimbingApp:
-    def __init__(self):
+    def __init__(self, profile_mode: Optional[str] = None):
+        """
+        Args:
+            profile_mode: "cprofile" or "sampling" profiles the application from launch,
+                None only profiles after the profiling hotkey is pressed
+        """
+        # Started first so the startup is profiled too
+        self.profiler = AppProfiler(profile_mode) if profile_mode else None
+        if self.profiler:
+            self.profiler.start()
+
         logger.info("Initializing ClimbingApp...")
         self.app = QApplication(sys.argv)
 
@@ -238,11 +253,32 @@ class ClimbingApp:
         logger.info("Connecting signals...")
         self.startup_window.image_uploaded.connect(self.handle_image_upload)
 
+        # Profiling hotkey, active in every window of the application
+        self.profile_shortcut = QShortcut(QKeySequence(ProjectConfig.PROFILE_HOTKEY), self.main_window)
+        self.profile_shortcut.setContext(Qt.ApplicationShortcut)
+        self.profile_shortcut.activated.connect(self.toggle_profiling)
+
     def run(self):
         """Starts the application."""
         logger.info("Starting application...")
         self.startup_window.show()
-        return self.app.exec_()
+        exit_code = self.app.exec_()
+
+        if self.profiler:
+            self.profiler.dump()
+        if metrics.enabled:
+            metrics.dump(ProjectConfig.LOGS_DIR / "metrics.prom")
+        return exit_code
+
+    def toggle_profiling(self):
+        """Starts, pauses or resumes profiling, the results are written on exit."""
+        if self.profiler is None:
+            self.profiler = AppProfiler(ProjectConfig.PROFILE_MODE or "cprofile")
+        running = self.profiler.toggle()
+        self.main_window.statusBar().showMessage(
+            f"Profiling {'running' if running else 'paused'}, results are written to {ProjectConfig.LOGS_DIR} on exit",
+            5000
+        )
 
     def handle_image_upload(self, image_path):
         """Handles the image upload event using worker thread."""
@@ -256,9 +292,16 @@ class ClimbingApp:
             image_path = str(image_path)
 
             # Set image in main window
-            self.main_window.current_image_path = image_path
             logger.debug(f"Setting main window image path to: {image_path}")
-            self.main_window.hold_viewer.load_image(image_path)
+            self.main_window.set_wall_image(image_path)
+
+            # Walls seen before are restored from their snapshot, keeping hold IDs stable
+            if self.main_window.restore_wall_snapshot():
+                logger.info("Holds restored from wall snapshot, skipping detection")
+                self.loading_window.hide()
+                self.main_window.show()
+                self.main_window.hold_viewer.update()
+                return
 
             # Create and configure detection worker
             self.detection_worker = DetectionWorker(self.roboflow_client, image_path)
@@ -283,7 +326,10 @@ class ClimbingApp:
         """Handle successful hold detection."""
         try:
             logger.info("Hold detection completed successfully")
+            # Holds seen on an earlier photo of the wall keep their IDs, so saved routes still apply
+            self.main_window.adopt_stored_hold_ids(holds)
             self.main_window.hold_viewer.holds = holds
+            self.main_window.save_wall_snapshot()
             self.main_window.hold_viewer.update()
 
             # Hide loading window and show main window
@@ -311,7 +357,20 @@ class ClimbingApp:
         )
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Climbing Route Creator")
+    parser.add_argument(
+        "--profile", nargs="?", const="cprofile", default=ProjectConfig.PROFILE_MODE or None, choices=PROFILE_MODES,
+        help=f"Profile the application from launch (default profiler: cprofile), {ProjectConfig.PROFILE_HOTKEY} "
+             f"pauses and resumes. Results are written to the logs directory on exit."
+    )
+    # Anything else is left to Qt
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
 if __name__ == "__main__":
     logger.info("Launching Climbing Route Creator...")
-    app = ClimbingApp()
+    args = parse_args()
+    app = ClimbingApp(profile_mode=args.profile)
     sys.exit(app.run())
\ No newline at end of file
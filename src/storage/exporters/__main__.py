@@ -0,0 +1,91 @@
+"""
+Export the route catalogue, or a subset of it, to CSV, newline-delimited JSON or Parquet.
+
+Usage:
+    python -m src.storage.exporters --format ndjson --output data/exports/routes.ndjson --gzip
+    python -m src.storage.exporters --format csv --output routes.csv --author Floressek --since 2024-01-01
+    python -m src.storage.exporters --format parquet --output data/exports/analytics
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from src.storage.exporters.base import RouteExporter
+from src.storage.exporters.csv_exporter import CsvExporter
+from src.storage.exporters.json_exporter import JsonExporter
+from src.storage.exporters.parquet_exporter import ParquetExporter
+from src.storage.models.route_model import RouteModel
+from src.storage.repositories.route_repository import RouteRepository
+from src.storage.repositories.wall_repository import WallRepository
+from src.utils.config import ProjectConfig
+
+EXPORTERS = {
+    "csv": CsvExporter,
+    "ndjson": JsonExporter,
+    "parquet": ParquetExporter,
+}
+
+
+def build_query(args: argparse.Namespace) -> Optional[Callable[[RouteModel], bool]]:
+    """Build a route predicate from the filter arguments, None if no filter was given."""
+    conditions: List[Callable[[RouteModel], bool]] = []
+    if args.author:
+        conditions.append(lambda route: route.author == args.author)
+    if args.grade:
+        conditions.append(lambda route: route.difficulty in args.grade)
+    if args.wall:
+        conditions.append(lambda route: route.wall_hash == args.wall)
+    if args.since:
+        conditions.append(lambda route: route.created_at >= args.since)
+    if args.until:
+        conditions.append(lambda route: route.created_at < args.until)
+
+    if not conditions:
+        return None
+    return lambda route: all(condition(route) for condition in conditions)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(EXPORTERS), default="ndjson", help="Output format")
+    parser.add_argument("--output", type=Path, help="Output file (default: EXPORTS_DIR/routes.<format>)")
+    parser.add_argument("--routes-dir", type=Path, default=ProjectConfig.ROUTES_DIR, help="Route repository directory")
+    parser.add_argument("--walls-dir", type=Path, default=ProjectConfig.WALLS_DIR,
+                        help="Wall snapshot directory (Parquet hold data)")
+    parser.add_argument("--gzip", action="store_true", help="Compress the output (gzip, zstd for Parquet)")
+    parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    parser.add_argument("--author", help="Only export routes by this author")
+    parser.add_argument("--grade", action="append", help="Only export routes of this grade (repeatable)")
+    parser.add_argument("--wall", help="Only export routes set on the wall with this image hash")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only export routes created at or after (ISO date)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Only export routes created before (ISO date)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    exporter_cls = EXPORTERS[args.format]
+    output = args.output or ProjectConfig.EXPORTS_DIR / f"routes{exporter_cls.extension}"
+
+    def print_progress(count: int) -> None:
+        print(f"\rExported {count} routes", end="", file=sys.stderr, flush=True)
+
+    options = dict(compress=args.gzip, progress_callback=None if args.quiet else print_progress)
+    if exporter_cls is ParquetExporter:
+        output = args.output or ProjectConfig.EXPORTS_DIR / "analytics"
+        options["wall_repository"] = WallRepository(args.walls_dir)
+
+    exporter: RouteExporter = exporter_cls(**options)
+    repository = RouteRepository(args.routes_dir)
+    count = exporter.export(repository.iter_all(build_query(args)), output)
+
+    if not args.quiet:
+        print(f"\nWrote {count} routes to {exporter.resolve_path(output)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
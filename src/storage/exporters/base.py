@@ -0,0 +1,84 @@
+import gzip
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Optional, Union
+
+from src.storage.models.route_model import RouteModel
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("storage/exporters", ProjectConfig.get_log_file("storage/export"))
+
+ProgressCallback = Callable[[int], None]  # Called with the number of routes written so far
+
+
+class RouteExporter:
+    """
+    Base class for streaming route exporters.
+
+    Note:
+        Routes are consumed from an iterable and written one by one, so memory use does not
+        depend on the size of the catalogue. Subclasses implement _write().
+
+    Attributes:
+        extension (str): File extension of the export format
+        compress (bool): Flag indicating whether the output is gzip compressed
+        progress_callback (Optional[ProgressCallback]): Called every progress_interval routes and at the end
+        progress_interval (int): Number of routes between progress callbacks
+    """
+    extension = ""
+
+    def __init__(self, compress: bool = False, progress_callback: Optional[ProgressCallback] = None,
+                 progress_interval: int = 1000):
+        self.compress = compress
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+    def resolve_path(self, output_path: Union[Path, str]) -> Path:
+        """
+        Add the .gz suffix to the output path when compressing.
+        Args:
+            output_path (Union[Path, str]): Requested output path
+        Returns:
+            Path: Path the export is written to
+        """
+        path = Path(output_path)
+        if self.compress and path.suffix != ".gz":
+            path = path.with_name(path.name + ".gz")
+        return path
+
+    def export(self, routes: Iterable[RouteModel], output_path: Union[Path, str]) -> int:
+        """
+        Write routes to a file.
+        Args:
+            routes (Iterable[RouteModel]): Routes to export, e.g. RouteRepository.iter_all()
+            output_path (Union[Path, str]): Path of the output file
+        Returns:
+            int: Number of routes written
+        """
+        path = self.resolve_path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Exporting routes to {path}")
+
+        try:
+            with self._open(path) as stream:
+                count = self._write(routes, stream)
+        except Exception as e:
+            logger.error(f"Failed to export routes to {path}: {str(e)}")
+            raise
+
+        self._report_progress(count, force=True)
+        logger.info(f"Exported {count} routes to {path}")
+        return count
+
+    def _open(self, path: Path) -> BinaryIO:
+        if self.compress:
+            # Level 6 is a good trade-off, the default 9 is several times slower for a few percent
+            return gzip.open(path, "wb", compresslevel=6)
+        return path.open("wb")
+
+    def _report_progress(self, count: int, force: bool = False) -> None:
+        if self.progress_callback and (force or count % self.progress_interval == 0):
+            self.progress_callback(count)
+
+    def _write(self, routes: Iterable[RouteModel], stream: BinaryIO) -> int:
+        raise NotImplementedError
@@ -0,0 +1,92 @@
+import csv
+import io
+from typing import BinaryIO, Dict, Iterable, List
+
+from pydantic import TypeAdapter
+
+from src.storage.exporters.base import RouteExporter
+from src.storage.models.route_model import RouteModel, ConnectionModel
+
+# Column order of the CSV export
+CSV_FIELDS = [
+    "id", "name", "created_at", "difficulty", "description", "author",
+    "wall_hash", "hold_ids", "hand_hold_ids", "foot_hold_ids", "connections",
+]
+LIST_SEPARATOR = ";"  # Separator of UUIDs inside a single cell
+
+_connections_adapter = TypeAdapter(List[ConnectionModel])
+
+
+def route_to_row(route: RouteModel) -> Dict[str, str]:
+    """
+    Flatten a route into a CSV row.
+
+    Args:
+        route (RouteModel): Route to flatten
+
+    Returns:
+        Dict[str, str]: Row keyed by CSV_FIELDS, lists joined with LIST_SEPARATOR, connections as JSON
+    """
+    return {
+        "id": str(route.id),
+        "name": route.name,
+        "created_at": route.created_at.isoformat(),
+        "difficulty": route.difficulty or "",
+        "description": route.description or "",
+        "author": route.author or "",
+        "wall_hash": route.wall_hash or "",
+        "hold_ids": LIST_SEPARATOR.join(map(str, route.hold_ids)),
+        "hand_hold_ids": LIST_SEPARATOR.join(map(str, route.hand_hold_ids)),
+        "foot_hold_ids": LIST_SEPARATOR.join(map(str, route.foot_hold_ids)),
+        "connections": _connections_adapter.dump_json(route.connections).decode("utf-8") if route.connections else "",
+    }
+
+
+def row_to_record(row: Dict[str, str]) -> Dict[str, object]:
+    """
+    Turn a CSV row written by route_to_row back into a route record for validation.
+
+    Args:
+        row (Dict[str, str]): Row keyed by CSV_FIELDS
+
+    Returns:
+        Dict[str, object]: Route dictionary with JSON-compatible values
+    """
+    record: Dict[str, object] = {
+        "id": row["id"],
+        "name": row["name"],
+        "created_at": row["created_at"],
+    }
+    for key in ("difficulty", "description", "author", "wall_hash"):
+        record[key] = row.get(key) or None
+    for key in ("hold_ids", "hand_hold_ids", "foot_hold_ids"):
+        value = row.get(key)
+        record[key] = value.split(LIST_SEPARATOR) if value else []
+    if row.get("connections"):
+        record["connections"] = _connections_adapter.validate_json(row["connections"])
+    return record
+
+
+class CsvExporter(RouteExporter):
+    """
+    Streaming exporter writing one route per CSV row.
+    """
+    extension = ".csv"
+
+    def _write(self, routes: Iterable[RouteModel], stream: BinaryIO) -> int:
+        # newline='' lets the csv module control line endings
+        text_stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            writer = csv.DictWriter(text_stream, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+
+            count = 0
+            for route in routes:
+                writer.writerow(route_to_row(route))
+                count += 1
+                self._report_progress(count)
+            return count
+        finally:
+            # Flush the text layer but leave closing the underlying stream to export()
+            text_stream.flush()
+            text_stream.detach()
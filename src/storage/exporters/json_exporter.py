@@ -0,0 +1,21 @@
+from typing import BinaryIO, Iterable
+
+from src.storage.exporters.base import RouteExporter
+from src.storage.models.route_model import RouteModel
+from src.storage.serialization import encode_route
+
+
+class JsonExporter(RouteExporter):
+    """
+    Streaming exporter writing routes as newline-delimited JSON (one route document per line).
+    """
+    extension = ".ndjson"
+
+    def _write(self, routes: Iterable[RouteModel], stream: BinaryIO) -> int:
+        count = 0
+        for route in routes:
+            stream.write(encode_route(route))
+            stream.write(b"\n")
+            count += 1
+            self._report_progress(count)
+        return count
@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency, only needed for analytics exports
+    pa = None
+    pq = None
+
+from src.storage.exporters.base import RouteExporter, ProgressCallback, logger
+from src.storage.models.route_model import RouteModel
+from src.storage.models.wall_model import WallModel
+from src.storage.repositories.wall_repository import WallRepository
+
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"  # Partition value for routes without a wall snapshot
+
+
+class _WallIndex:
+    """Columns of one wall snapshot prepared for gathering per-route hold rows."""
+
+    def __init__(self, wall: WallModel):
+        self.wall = wall
+        self.row_by_id = {wall.hold_ids[i].tobytes(): i for i in range(len(wall))}
+        self.areas = wall.contour_areas()
+
+
+class ParquetExporter(RouteExporter):
+    """
+    Columnar exporter writing routes and their holds as Parquet datasets for analytics.
+
+    Note:
+        Two hive-partitioned datasets are written under the output directory:
+        routes/wall_hash=<hash>/date=<YYYY-MM-DD>/part-<n>.parquet with one row per route and
+        holds/... with one row per hold of a route (role, order, position, size, confidence, area).
+        Hold columns are gathered from the NumPy arrays of the wall snapshot and handed to Arrow
+        without a python-object round trip; Arrow wraps the numeric buffers zero-copy.
+
+    Attributes:
+        wall_repository (WallRepository): Source of hold geometry
+        batch_size (int): Number of buffered routes per partition before a record batch is written
+        max_open_files (int): Maximum number of partition files kept open at once
+    """
+    extension = ""
+
+    ROUTE_SCHEMA = None if pa is None else pa.schema([
+        ("route_id", pa.string()),
+        ("name", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("difficulty", pa.string()),
+        ("description", pa.string()),
+        ("author", pa.string()),
+        ("hand_count", pa.int32()),
+        ("foot_count", pa.int32()),
+    ])
+
+    HOLD_SCHEMA = None if pa is None else pa.schema([
+        ("route_id", pa.string()),
+        ("hold_id", pa.binary(16)),
+        ("role", pa.dictionary(pa.int8(), pa.string())),
+        ("order", pa.int32()),
+        ("x", pa.float64()),
+        ("y", pa.float64()),
+        ("width", pa.float64()),
+        ("height", pa.float64()),
+        ("confidence", pa.float32()),
+        ("area", pa.float64()),
+    ])
+
+    def __init__(self, wall_repository: WallRepository, compress: bool = False,
+                 progress_callback: Optional[ProgressCallback] = None, progress_interval: int = 1000,
+                 batch_size: int = 4096, max_open_files: int = 64):
+        if pa is None:
+            raise ImportError("ParquetExporter requires pyarrow: pip install pyarrow")
+        super().__init__(compress, progress_callback, progress_interval)
+        self.wall_repository = wall_repository
+        self.batch_size = batch_size
+        self.max_open_files = max_open_files
+
+    def resolve_path(self, output_path: Union[Path, str]) -> Path:
+        return Path(output_path)
+
+    def export(self, routes: Iterable[RouteModel], output_path: Union[Path, str]) -> int:
+        """
+        Write routes and their holds to partitioned Parquet datasets.
+        Args:
+            routes (Iterable[RouteModel]): Routes to export, e.g. RouteRepository.iter_all()
+            output_path (Union[Path, str]): Output directory
+        Returns:
+            int: Number of routes written
+        """
+        output_dir = self.resolve_path(output_path)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Exporting routes to Parquet dataset {output_dir}")
+
+        self._output_dir = output_dir
+        self._walls: Dict[str, Optional[_WallIndex]] = {}
+        self._buffers: Dict[Tuple[str, str], List[RouteModel]] = {}
+        self._writers: "OrderedDict[Tuple[str, str, str], pq.ParquetWriter]" = OrderedDict()
+        self._part_numbers: Dict[Tuple[str, str, str], int] = {}
+
+        count = 0
+        try:
+            for route in routes:
+                partition = (route.wall_hash or NULL_PARTITION, route.created_at.date().isoformat())
+                buffer = self._buffers.setdefault(partition, [])
+                buffer.append(route)
+                if len(buffer) >= self.batch_size:
+                    self._flush(partition)
+
+                count += 1
+                self._report_progress(count)
+
+            for partition in list(self._buffers):
+                self._flush(partition)
+
+        except Exception as e:
+            logger.error(f"Failed to export routes to {output_dir}: {str(e)}")
+            raise
+
+        finally:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+
+        self._report_progress(count, force=True)
+        logger.info(f"Exported {count} routes to {output_dir}")
+        return count
+
+    def _wall_index(self, wall_hash: Optional[str]) -> Optional[_WallIndex]:
+        if wall_hash is None:
+            return None
+        if wall_hash not in self._walls:
+            wall = self.wall_repository.get(wall_hash)
+            self._walls[wall_hash] = _WallIndex(wall) if wall is not None else None
+        return self._walls[wall_hash]
+
+    def _flush(self, partition: Tuple[str, str]) -> None:
+        routes = self._buffers.pop(partition, [])
+        if not routes:
+            return
+
+        self._write_batch("routes", partition, self._route_batch(routes))
+
+        wall_index = self._wall_index(routes[0].wall_hash)
+        if wall_index is None:
+            if routes[0].wall_hash is not None:
+                logger.warning(f"No wall snapshot for {routes[0].wall_hash[:12]}, skipping hold rows")
+            return
+
+        holds = self._hold_batch(routes, wall_index)
+        if holds.num_rows:
+            self._write_batch("holds", partition, holds)
+
+    def _route_batch(self, routes: List[RouteModel]) -> "pa.RecordBatch":
+        return pa.RecordBatch.from_arrays([
+            pa.array([str(r.id) for r in routes], pa.string()),
+            pa.array([r.name for r in routes], pa.string()),
+            pa.array([r.created_at for r in routes], pa.timestamp("us")),
+            pa.array([r.difficulty for r in routes], pa.string()),
+            pa.array([r.description for r in routes], pa.string()),
+            pa.array([r.author for r in routes], pa.string()),
+            pa.array(np.fromiter((len(r.hand_hold_ids) for r in routes), np.int32, len(routes))),
+            pa.array(np.fromiter((len(r.foot_hold_ids) for r in routes), np.int32, len(routes))),
+        ], schema=self.ROUTE_SCHEMA)
+
+    def _hold_batch(self, routes: List[RouteModel], wall_index: _WallIndex) -> "pa.RecordBatch":
+        rows: List[int] = []
+        orders: List[int] = []
+        roles: List[int] = []  # 0 = hand, 1 = foot (dictionary indices)
+        route_ids: List[str] = []
+
+        for route in routes:
+            route_id = str(route.id)
+            for role, hold_ids in ((0, route.hand_hold_ids), (1, route.foot_hold_ids)):
+                for order, hold_id in enumerate(hold_ids):
+                    row = wall_index.row_by_id.get(hold_id.bytes)
+                    if row is None:
+                        continue
+                    rows.append(row)
+                    orders.append(order)
+                    roles.append(role)
+                    route_ids.append(route_id)
+
+        wall = wall_index.wall
+        index = np.asarray(rows, dtype=np.int64)
+        # One gather per column; the resulting contiguous arrays are wrapped by Arrow without copying
+        boxes = np.ascontiguousarray(wall.boxes[index].T)
+        hold_ids = np.ascontiguousarray(wall.hold_ids[index])
+
+        return pa.RecordBatch.from_arrays([
+            pa.array(route_ids, pa.string()),
+            pa.FixedSizeBinaryArray.from_buffers(pa.binary(16), len(index), [None, pa.py_buffer(hold_ids)]),
+            pa.DictionaryArray.from_arrays(
+                pa.array(np.asarray(roles, dtype=np.int8)), pa.array(["hand", "foot"])
+            ),
+            pa.array(np.asarray(orders, dtype=np.int32)),
+            pa.array(boxes[0]),
+            pa.array(boxes[1]),
+            pa.array(boxes[2]),
+            pa.array(boxes[3]),
+            pa.array(wall.confidences[index]),
+            pa.array(wall_index.areas[index]),
+        ], schema=self.HOLD_SCHEMA)
+
+    def _write_batch(self, dataset: str, partition: Tuple[str, str], batch: "pa.RecordBatch") -> None:
+        key = (dataset, *partition)
+        writer = self._writers.get(key)
+
+        if writer is None:
+            # Bound the number of open files, a closed partition continues in a new part file
+            if len(self._writers) >= self.max_open_files:
+                _, oldest = self._writers.popitem(last=False)
+                oldest.close()
+
+            part = self._part_numbers.get(key, -1) + 1
+            self._part_numbers[key] = part
+            wall_hash, date = partition
+            path = self._output_dir / dataset / f"wall_hash={wall_hash}" / f"date={date}" / f"part-{part}.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            writer = pq.ParquetWriter(path, batch.schema, compression="zstd" if self.compress else "snappy")
+            self._writers[key] = writer
+        else:
+            self._writers.move_to_end(key)
+
+        writer.write_batch(batch)
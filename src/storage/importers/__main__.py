@@ -0,0 +1,56 @@
+"""
+Bulk import route exports (CSV, NDJSON or JSON arrays, optionally gzipped) into the route repository.
+
+Usage:
+    python -m src.storage.importers data/exports/routes.ndjson.gz
+    python -m src.storage.importers backup.csv other.json --overwrite
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from src.storage.importers.route_importer import RouteImporter, ImportResult
+from src.storage.repositories.route_repository import RouteRepository
+from src.utils.config import ProjectConfig
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="+", type=Path, help="Export files to import")
+    parser.add_argument("--format", choices=["csv", "ndjson", "json"], help="Input format (default: from file name)")
+    parser.add_argument("--routes-dir", type=Path, default=ProjectConfig.ROUTES_DIR, help="Route repository directory")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records validated and written at once")
+    parser.add_argument("--overwrite", action="store_true", help="Replace routes that are already stored")
+    parser.add_argument("--quiet", action="store_true", help="Do not print progress")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+
+    def print_progress(count: int) -> None:
+        print(f"\rProcessed {count} records", end="", file=sys.stderr, flush=True)
+
+    importer = RouteImporter(
+        RouteRepository(args.routes_dir),
+        batch_size=args.batch_size,
+        overwrite=args.overwrite,
+        progress_callback=None if args.quiet else print_progress,
+    )
+
+    total = ImportResult()
+    for path in args.files:
+        result = importer.import_file(path, args.format)
+        total.imported += result.imported
+        total.duplicates += result.duplicates
+        total.invalid += result.invalid
+
+    if not args.quiet:
+        print(f"\nImported {total.imported} routes ({total.duplicates} duplicates, {total.invalid} invalid)",
+              file=sys.stderr)
+    return 0 if total.invalid == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
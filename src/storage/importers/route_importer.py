@@ -0,0 +1,222 @@
+import csv
+import gzip
+import io
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Union
+
+from src.storage.exporters.base import ProgressCallback
+from src.storage.exporters.csv_exporter import row_to_record
+from src.storage.models.route_model import RouteModel
+from src.storage.repositories.route_repository import RouteRepository
+from src.storage.serialization import decode_route, decode_routes, validate_route, validate_routes
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("storage/importers", ProjectConfig.get_log_file("storage/import"))
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+}
+READ_CHUNK_SIZE = 1024 * 1024  # Bytes read at a time from JSON array files
+
+
+@dataclass
+class ImportResult:
+    """
+    Summary of an import run.
+    Attributes:
+        imported (int): Routes written to the repository
+        duplicates (int): Routes skipped because their ID was already imported or stored
+        invalid (int): Records that failed validation
+    """
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+
+def detect_format(path: Union[Path, str]) -> str:
+    """
+    Detect the export format from the file name, ignoring a .gz suffix.
+    Args:
+        path (Union[Path, str]): Path of the export file
+    Returns:
+        str: One of "csv", "ndjson", "json"
+    Raises:
+        ValueError: If the format is not recognized
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".gz":
+        suffix = Path(path.stem).suffix.lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Unsupported import format: {path.name}. Supported: {', '.join(FORMATS)}")
+    return FORMATS[suffix]
+
+
+def _open(path: Path) -> BinaryIO:
+    if path.suffix.lower() == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def _iter_json_array(stream: BinaryIO) -> Iterator[Any]:
+    """
+    Incrementally parse the items of a top-level JSON array (or a single object) from a stream.
+    Only one chunk plus the item being parsed is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(stream, encoding="utf-8")
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+
+    while True:
+        # Skip whitespace and separators between items
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] == "[":
+                position += 1
+                started = True
+                continue
+            # A single object instead of an array
+            started = True
+        if position < len(buffer) and buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                if buffer[position:].strip():
+                    raise
+                return
+            chunk = reader.read(READ_CHUNK_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield item
+        position = end
+
+
+class RouteImporter:
+    """
+    Bulk importer loading route exports (CSV, NDJSON or JSON arrays, optionally gzipped) into a repository.
+
+    Note:
+        Files are read as streams and validated in batches; a batch that fails validation is
+        re-validated record by record so only the bad records are dropped. Each batch is written
+        through RouteRepository.save_many, so it either lands completely or not at all.
+
+    Attributes:
+        repository (RouteRepository): Repository the routes are written to
+        batch_size (int): Number of records validated and written at once
+        overwrite (bool): Replace routes already stored in the repository instead of skipping them
+        progress_callback (Optional[ProgressCallback]): Called with the number of records processed after each batch
+    """
+
+    def __init__(self, repository: RouteRepository, batch_size: int = 5000, overwrite: bool = False,
+                 progress_callback: Optional[ProgressCallback] = None):
+        self.repository = repository
+        self.batch_size = batch_size
+        self.overwrite = overwrite
+        self.progress_callback = progress_callback
+
+    def import_file(self, path: Union[Path, str], fmt: Optional[str] = None) -> ImportResult:
+        """
+        Import all routes from an export file.
+        Args:
+            path (Union[Path, str]): Path of the export file
+            fmt (Optional[str]): "csv", "ndjson" or "json", detected from the file name if None
+        Returns:
+            ImportResult: Summary of the import
+        """
+        path = Path(path)
+        fmt = fmt or detect_format(path)
+        logger.info(f"Importing {fmt} routes from {path}")
+
+        # IDs already in the repository, unless they are going to be replaced
+        self._seen = set() if self.overwrite else self.repository.route_ids()
+        result = ImportResult()
+        processed = 0
+
+        with _open(path) as stream:
+            for records, parse_batch, parse_one in self._read_batches(stream, fmt):
+                processed += len(records)
+                routes = self._validate(records, parse_batch, parse_one, result)
+                unique = self._deduplicate(routes, result)
+                if unique:
+                    result.imported += self.repository.save_many(unique)
+                if self.progress_callback:
+                    self.progress_callback(processed)
+
+        logger.info(
+            f"Imported {result.imported} routes from {path} "
+            f"({result.duplicates} duplicates, {result.invalid} invalid)"
+        )
+        return result
+
+    def _read_batches(self, stream: BinaryIO, fmt: str) -> Iterator[tuple]:
+        """Yield (records, parse_batch, parse_one) tuples of at most batch_size raw records."""
+        if fmt == "ndjson":
+            # Lines are validated straight from bytes by joining them into one JSON array
+            records = (line for line in stream if line.strip())
+            parse_batch: Callable[[List[Any]], List[RouteModel]] = \
+                lambda lines: decode_routes(b"[" + b",".join(lines) + b"]")
+            parse_one: Callable[[Any], RouteModel] = decode_route
+        elif fmt == "csv":
+            # Rows are converted while parsing, so a malformed row only invalidates itself
+            records = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+            parse_batch = lambda rows: validate_routes([row_to_record(row) for row in rows])
+            parse_one = lambda row: validate_route(row_to_record(row))
+        elif fmt == "json":
+            records = _iter_json_array(stream)
+            parse_batch, parse_one = validate_routes, validate_route
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                yield batch, parse_batch, parse_one
+                batch = []
+        if batch:
+            yield batch, parse_batch, parse_one
+
+    def _validate(self, records: List[Any], parse_batch: Callable, parse_one: Callable,
+                  result: ImportResult) -> List[RouteModel]:
+        try:
+            return parse_batch(records)
+        except (ValueError, KeyError):
+            pass
+
+        # Slow path: find the invalid records and keep the rest
+        routes = []
+        for record in records:
+            try:
+                routes.append(parse_one(record))
+            except (ValueError, KeyError) as e:
+                result.invalid += 1
+                message = f"missing field {e}" if isinstance(e, KeyError) else str(e).splitlines()[0]
+                logger.warning(f"Skipping invalid route record: {message}")
+        return routes
+
+    def _deduplicate(self, routes: List[RouteModel], result: ImportResult) -> List[RouteModel]:
+        unique = []
+        for route in routes:
+            route_id = str(route.id)
+            if route_id in self._seen:
+                result.duplicates += 1
+                continue
+            self._seen.add(route_id)
+            unique.append(route)
+        return unique
@@ -0,0 +1,237 @@
+import json
+import math
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+
+class ImagePyramid:
+    """
+    Tiled multi-resolution copy of a wall image, read through memory maps.
+
+    Note:
+        Level 0 is the full resolution image, every next level halves both sides, down to a
+        single tile. Each level is one .npy file of shape (tiles_y, tiles_x, T, T, 3), so the
+        pixels of a tile are contiguous on disk and reading a tile only touches its own pages.
+        Edge tiles are padded by repeating the last row/column. Only the tiles that are read
+        are ever paged in, so memory use does not depend on the size of the wall.
+
+    Attributes:
+        path (Path): Directory holding meta.json and the level files
+        width (int): Width of the full resolution image
+        height (int): Height of the full resolution image
+        tile_size (int): Side of a tile in pixels
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+        meta = json.loads((self.path / "meta.json").read_text())
+        if meta["version"] != self.FORMAT_VERSION:
+            raise ValueError(f"Unsupported pyramid version: {meta['version']}")
+
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.tile_size = meta["tile_size"]
+        self._levels = [
+            np.load(self.path / f"level_{level}.npy", mmap_mode="r", allow_pickle=False)
+            for level in range(meta["levels"])
+        ]
+
+    @property
+    def level_count(self) -> int:
+        return len(self._levels)
+
+    def level_size(self, level: int) -> Tuple[int, int]:
+        """Width and height of a level in pixels."""
+        return _level_size(self.width, self.height, level)
+
+    def tile_count(self, level: int) -> Tuple[int, int]:
+        """Number of tile columns and rows of a level."""
+        tiles_y, tiles_x = self._levels[level].shape[:2]
+        return tiles_x, tiles_y
+
+    def level_for_scale(self, scale: float) -> int:
+        """
+        Pick the coarsest level that still has at least one pixel per displayed pixel.
+        Args:
+            scale (float): Displayed pixels per full resolution pixel
+        Returns:
+            int: Pyramid level
+        """
+        if scale >= 1:
+            return 0
+        return min(int(math.floor(math.log2(1 / scale))), self.level_count - 1)
+
+    def tile(self, level: int, tile_x: int, tile_y: int) -> np.ndarray:
+        """
+        Get one tile without copying it.
+        Returns:
+            np.ndarray: (T, T, 3) uint8 read-only view into the memory map
+        """
+        return self._levels[level][tile_y, tile_x]
+
+    def tiles_in_region(self, level: int, x: float, y: float, width: float, height: float) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate over the tiles of a level overlapping a region given in level pixels.
+        Yields:
+            Tuple[int, int]: Tile column and row
+        """
+        tiles_x, tiles_y = self.tile_count(level)
+        size = self.tile_size
+        first_x, first_y = max(int(x // size), 0), max(int(y // size), 0)
+        last_x = min(int(math.ceil((x + width) / size)), tiles_x)
+        last_y = min(int(math.ceil((y + height) / size)), tiles_y)
+        for tile_y in range(first_y, last_y):
+            for tile_x in range(first_x, last_x):
+                yield tile_x, tile_y
+
+    def read_region(self, x: int, y: int, width: int, height: int, level: int = 0) -> np.ndarray:
+        """
+        Read a rectangle of a level, touching only the tiles it overlaps.
+        Args:
+            x (int): Left edge in level pixels
+            y (int): Top edge in level pixels
+            width (int): Width in level pixels
+            height (int): Height in level pixels
+            level (int): Pyramid level
+        Returns:
+            np.ndarray: (h, w, 3) uint8 array, clipped to the level bounds
+        """
+        level_width, level_height = self.level_size(level)
+        x0, y0 = max(int(x), 0), max(int(y), 0)
+        x1, y1 = min(int(x + width), level_width), min(int(y + height), level_height)
+        region = np.empty((max(y1 - y0, 0), max(x1 - x0, 0), 3), dtype=np.uint8)
+        if region.size == 0:
+            return region
+
+        size = self.tile_size
+        for tile_x, tile_y in self.tiles_in_region(level, x0, y0, x1 - x0, y1 - y0):
+            left, top = tile_x * size, tile_y * size
+            sx0, sy0 = max(x0 - left, 0), max(y0 - top, 0)
+            sx1, sy1 = min(x1 - left, size), min(y1 - top, size)
+            region[top + sy0 - y0:top + sy1 - y0, left + sx0 - x0:left + sx1 - x0] = \
+                self._levels[level][tile_y, tile_x, sy0:sy1, sx0:sx1]
+        return region
+
+    def read_image(self, max_size: Optional[int] = None,
+                   region: Optional[Tuple[int, int, int, int]] = None) -> Image.Image:
+        """
+        Read a region of interest, from the coarsest level that still fills max_size.
+        Args:
+            max_size (Optional[int]): Longest side of the result, full resolution if None
+            region (Optional[Tuple[int, int, int, int]]): x, y, width, height in full resolution pixels,
+                the whole image if None
+        Returns:
+            Image.Image: RGB image of the region
+        """
+        x, y, width, height = region or (0, 0, self.width, self.height)
+        scale = min(1.0, max_size / max(width, height)) if max_size else 1.0
+        level = self.level_for_scale(scale)
+        factor = 2 ** level
+
+        pixels = self.read_region(
+            x // factor, y // factor,
+            int(math.ceil(width / factor)), int(math.ceil(height / factor)),
+            level
+        )
+        image = Image.fromarray(pixels, "RGB")
+        if max_size and max(image.size) > max_size:
+            image.thumbnail((max_size, max_size), Image.LANCZOS)
+        return image
+
+    @classmethod
+    def build(cls, image: Image.Image, path: Union[Path, str], tile_size: int = 512) -> 'ImagePyramid':
+        """
+        Write the pyramid of an image held in memory.
+        Args:
+            image (Image.Image): Upright RGB source image
+            path (Union[Path, str]): Directory to write
+            tile_size (int): Side of a tile in pixels
+        Returns:
+            ImagePyramid: The written pyramid
+        """
+        return cls.build_from_regions(image.size, lambda box: np.asarray(image.crop(box)), path, tile_size)
+
+    @classmethod
+    def build_from_regions(cls, size: Tuple[int, int], read_region: Callable[[Tuple[int, int, int, int]], np.ndarray],
+                           path: Union[Path, str], tile_size: int = 512) -> 'ImagePyramid':
+        """
+        Write the pyramid of an image read one strip at a time.
+
+        Note:
+            Level 0 is read in strips of one tile row, every next level is downsampled 2x2
+            from two tile rows of the previous level's memory map, so no level is ever held
+            in memory as a whole.
+
+        Args:
+            size (Tuple[int, int]): Width and height of the source image
+            read_region (Callable): Reads a (left, top, right, bottom) box of the source image as
+                an (h, w, 3) uint8 array, e.g. from image_utils.open_mapped_image
+            path (Union[Path, str]): Directory to write
+            tile_size (int): Side of a tile in pixels
+        Returns:
+            ImagePyramid: The written pyramid
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        width, height = size
+
+        level = 0
+        previous = cls._create_level(path, level, width, height, tile_size)
+        for tile_y in range(previous.shape[0]):
+            top = tile_y * tile_size
+            cls._write_strip(previous, tile_y, read_region((0, top, width, min(top + tile_size, height))))
+        previous.flush()
+
+        while max(_level_size(width, height, level)) > tile_size:
+            level += 1
+            level_width, level_height = _level_size(width, height, level)
+            current = cls._create_level(path, level, level_width, level_height, tile_size)
+            for tile_y in range(current.shape[0]):
+                # Two tile rows of the previous level become one tile row of this one
+                rows = previous[2 * tile_y:2 * tile_y + 2]
+                strip = np.concatenate([np.concatenate(list(row), axis=1) for row in rows], axis=0)
+                strip = strip[:, :2 * level_width]
+                if strip.shape[0] % 2:
+                    strip = np.concatenate([strip, strip[-1:]], axis=0)
+                if strip.shape[1] % 2:
+                    strip = np.concatenate([strip, strip[:, -1:]], axis=1)
+                # 2x2 box filter, summed in uint16 to keep the temporary small
+                quads = strip.reshape(strip.shape[0] // 2, 2, strip.shape[1] // 2, 2, 3)
+                halved = (quads.sum(axis=(1, 3), dtype=np.uint16) + 2) // 4
+                cls._write_strip(current, tile_y, halved.astype(np.uint8)[:, :level_width])
+            current.flush()
+            previous = current
+
+        (path / "meta.json").write_text(json.dumps({
+            "version": cls.FORMAT_VERSION,
+            "width": width,
+            "height": height,
+            "tile_size": tile_size,
+            "levels": level + 1,
+        }))
+        return cls(path)
+
+    @staticmethod
+    def _create_level(path: Path, level: int, width: int, height: int, tile_size: int) -> np.memmap:
+        shape = (math.ceil(height / tile_size), math.ceil(width / tile_size), tile_size, tile_size, 3)
+        return np.lib.format.open_memmap(path / f"level_{level}.npy", mode="w+", dtype=np.uint8, shape=shape)
+
+    @staticmethod
+    def _write_strip(level: np.memmap, tile_y: int, strip: np.ndarray) -> None:
+        """Cut one row of pixels into tiles, padding the edges by repetition."""
+        tiles_y, tiles_x, tile_size = level.shape[:3]
+        pad_y = tile_size - strip.shape[0]
+        pad_x = tiles_x * tile_size - strip.shape[1]
+        if pad_y or pad_x:
+            strip = np.pad(strip, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+        level[tile_y] = strip.reshape(tile_size, tiles_x, tile_size, 3).swapaxes(0, 1)
+
+
+def _level_size(width: int, height: int, level: int) -> Tuple[int, int]:
+    factor = 2 ** level
+    return max(1, math.ceil(width / factor)), max(1, math.ceil(height / factor))
@@ -1,9 +1,25 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID, uuid4
 
 
+@dataclass
+class ConnectionModel:
+    """
+    Connection model class.
+    Attributes:
+        hold1_id (UUID): ID of the first hold in the connection
+        hold2_id (UUID): ID of the second hold in the connection
+        is_curved (bool): Flag indicating whether the connection is curved
+        control_points (Optional[Tuple[float, float]]): Bezier control point, None for the default curve
+    """
+    hold1_id: UUID
+    hold2_id: UUID
+    is_curved: bool = True
+    control_points: Optional[Tuple[float, float]] = None
+
+
 @dataclass
 class RouteModel:
     """
@@ -16,6 +32,10 @@ class RouteModel:
         difficulty (Optional[str]): Route difficulty
         description (Optional[str]): Route description
         author (Optional[str]): Route author
+        wall_hash (Optional[str]): Content hash of the wall image, key of the wall snapshot
+        hand_hold_ids (List[UUID]): Hand hold IDs in climbing order
+        foot_hold_ids (List[UUID]): Foot hold IDs in climbing order
+        connections (List[ConnectionModel]): Connections between consecutive holds
     """
     name: str
     hold_ids: List[UUID]  # Hold IDs associated with the route
@@ -24,6 +44,10 @@ class RouteModel:
     difficulty: Optional[str] = None
     description: Optional[str] = None
     author: Optional[str] = None
+    wall_hash: Optional[str] = None
+    hand_hold_ids: List[UUID] = field(default_factory=list)
+    foot_hold_ids: List[UUID] = field(default_factory=list)
+    connections: List[ConnectionModel] = field(default_factory=list)
 
     @classmethod
     def create(cls, name: str, hold_ids: List[UUID], difficulty: str, description: str, author: str):
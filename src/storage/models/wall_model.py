@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import List
+from uuid import UUID
+
+import numpy as np
+
+from src.core.hold import Hold, HoldPoint
+
+
+@dataclass
+class WallModel:
+    """
+    Wall snapshot model class. Stores the detected holds of one wall photo in columnar form.
+
+    Note:
+        Contours of all holds are packed into one (M, 2) array, hold i owns the rows
+        contour_offsets[i]:contour_offsets[i + 1]. This keeps the on-disk format compact
+        and lets it be loaded without re-running detection.
+
+    Attributes:
+        image_hash (str): Content hash of the wall image
+        image_path (str): Path to the wall image when the snapshot was taken
+        hold_ids (np.ndarray): (N, 16) uint8 array of hold UUID bytes
+        boxes (np.ndarray): (N, 4) float64 array of x, y, width, height (box centers)
+        confidences (np.ndarray): (N,) float32 array of detection confidences
+        contour_offsets (np.ndarray): (N + 1,) int64 array of offsets into contour_points
+        contour_points (np.ndarray): (M, 2) float32 array of all contour points
+    """
+    image_hash: str
+    image_path: str
+    hold_ids: np.ndarray
+    boxes: np.ndarray
+    confidences: np.ndarray
+    contour_offsets: np.ndarray
+    contour_points: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.hold_ids)
+
+    @property
+    def contour_counts(self) -> np.ndarray:
+        """Number of contour points of each hold."""
+        return np.diff(self.contour_offsets)
+
+    def contour_areas(self) -> np.ndarray:
+        """
+        Compute the polygon area of every hold in one vectorized pass (shoelace formula).
+
+        Note:
+            Holds without a contour fall back to their bounding box area.
+
+        Returns:
+            np.ndarray: (N,) float64 array of areas in square pixels
+        """
+        areas = self.boxes[:, 2] * self.boxes[:, 3]
+        has_contour = self.contour_counts > 0
+        if not has_contour.any():
+            return areas
+
+        points = self.contour_points.astype(np.float64)
+        starts = self.contour_offsets[:-1][has_contour]
+        ends = self.contour_offsets[1:][has_contour]
+
+        # Index of the next vertex of each point, wrapping around at the end of every polygon
+        next_index = np.arange(1, len(points) + 1)
+        next_index[ends - 1] = starts
+
+        cross = points[:, 0] * points[next_index, 1] - points[next_index, 0] * points[:, 1]
+        areas[has_contour] = np.abs(np.add.reduceat(cross, starts)) / 2
+        return areas
+
+    @classmethod
+    def from_holds(cls, image_hash: str, image_path: str, holds: List[Hold]) -> 'WallModel':
+        """
+        Create a WallModel from detected holds.
+
+        Args:
+            image_hash (str): Content hash of the wall image
+            image_path (str): Path to the wall image
+            holds (List[Hold]): Holds detected on the wall
+
+        Returns:
+            WallModel: Columnar snapshot of the holds
+        """
+        counts = np.fromiter((len(h.contour_points) for h in holds), dtype=np.int64, count=len(holds))
+        contour_offsets = np.zeros(len(holds) + 1, dtype=np.int64)
+        np.cumsum(counts, out=contour_offsets[1:])
+
+        contour_points = np.fromiter(
+            (c for h in holds for p in h.contour_points for c in (p.x, p.y)),
+            dtype=np.float32,
+            count=int(contour_offsets[-1]) * 2,
+        ).reshape(-1, 2)
+
+        return cls(
+            image_hash=image_hash,
+            image_path=str(image_path),
+            hold_ids=np.frombuffer(b"".join(h.id.bytes for h in holds), dtype=np.uint8).reshape(-1, 16),
+            boxes=np.array([(h.x, h.y, h.width, h.height) for h in holds], dtype=np.float64).reshape(-1, 4),
+            confidences=np.array([h.confidence for h in holds], dtype=np.float32),
+            contour_offsets=contour_offsets,
+            contour_points=contour_points,
+        )
+
+    def to_holds(self) -> List[Hold]:
+        """
+        Recreate Hold objects from the snapshot, keeping their original IDs.
+
+        Returns:
+            List[Hold]: Holds with no selection state
+        """
+        # tolist() gives plain python floats, which HoldPoint validation expects
+        boxes = self.boxes.tolist()
+        confidences = self.confidences.tolist()
+        offsets = self.contour_offsets.tolist()
+        points = self.contour_points.tolist()
+
+        holds = []
+        for i, (x, y, width, height) in enumerate(boxes):
+            holds.append(Hold(
+                id=UUID(bytes=self.hold_ids[i].tobytes()),
+                x=x,
+                y=y,
+                width=width,
+                height=height,
+                confidence=confidences[i],
+                contour_points=[HoldPoint(px, py) for px, py in points[offsets[i]:offsets[i + 1]]],
+            ))
+        return holds
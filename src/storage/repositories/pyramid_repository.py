@@ -0,0 +1,105 @@
+import shutil
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Union
+
+from src.storage.models.image_pyramid import ImagePyramid
+from src.utils.image_utils import compute_image_hash, open_mapped_image
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("storage/repositories/pyramid", ProjectConfig.get_log_file("storage/pyramid"))
+
+
+class PyramidRepository:
+    """
+    Repository class for managing tiled image pyramids.
+    Stores one directory per wall image, keyed by the image content hash.
+    """
+
+    # Builds of the same image from different threads (viewer, detection) wait for each other
+    _build_locks = defaultdict(threading.Lock)
+    _build_locks_guard = threading.Lock()
+
+    def __init__(self, storage_path: Union[Path, str], tile_size: int = 512):
+        # Convert to Path object if string is passed
+        self.storage_path = Path(storage_path)
+        # Create directory if it doesn't exist
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.tile_size = tile_size
+        logger.info(f"Initialized PyramidRepository with storage path: {self.storage_path}")
+
+    def _pyramid_path(self, image_hash: str) -> Path:
+        return self.storage_path / image_hash
+
+    def exists(self, image_hash: str) -> bool:
+        """
+        Check if a pyramid for the image is stored.
+        Args:
+            image_hash (str): Content hash of the image
+        Returns:
+            bool: True if the pyramid exists, False otherwise
+        """
+        return (self._pyramid_path(image_hash) / "meta.json").exists()
+
+    def get(self, image_hash: str) -> Optional[ImagePyramid]:
+        """
+        Open a stored pyramid.
+        Args:
+            image_hash (str): Content hash of the image
+        Returns:
+            ImagePyramid: Pyramid if found, None otherwise
+        """
+        if not self.exists(image_hash):
+            return None
+
+        try:
+            return ImagePyramid(self._pyramid_path(image_hash))
+        except Exception as e:
+            logger.error(f"Error opening pyramid {image_hash[:12]}: {str(e)}")
+            return None
+
+    def get_or_build(self, image_path: Union[Path, str], image_hash: Optional[str] = None) -> ImagePyramid:
+        """
+        Open the pyramid of an image, building it first if needed.
+        Args:
+            image_path (Union[Path, str]): Path to the image file
+            image_hash (Optional[str]): Content hash of the image, computed if None
+        Returns:
+            ImagePyramid: Pyramid of the upright image
+        """
+        image_hash = image_hash or compute_image_hash(image_path)
+        with self._build_locks_guard:
+            lock = self._build_locks[str(self._pyramid_path(image_hash))]
+
+        with lock:
+            pyramid = self.get(image_hash)
+            if pyramid is not None:
+                return pyramid
+            return self._build(image_path, image_hash)
+
+    def _build(self, image_path: Union[Path, str], image_hash: str) -> ImagePyramid:
+        pyramid_path = self._pyramid_path(image_hash)
+        build_path = pyramid_path.with_name(f"{image_hash}.building")
+        logger.info(f"Building image pyramid for {image_path}")
+
+        try:
+            shutil.rmtree(build_path, ignore_errors=True)
+            build_path.mkdir(parents=True)
+            # Decoded into a scratch memory map and tiled strip by strip, memory use does not grow with the wall
+            with open_mapped_image(image_path, build_path / "decoded.raw") as (size, read_region):
+                ImagePyramid.build_from_regions(size, read_region, build_path, self.tile_size)
+
+            # Publish atomically, a pyramid directory is only ever complete
+            shutil.rmtree(pyramid_path, ignore_errors=True)
+            build_path.rename(pyramid_path)
+            pyramid = ImagePyramid(pyramid_path)
+            logger.info(f"Built {pyramid.level_count}-level pyramid {image_hash[:12]} "
+                        f"for {pyramid.width}x{pyramid.height} image")
+            return pyramid
+
+        except Exception as e:
+            logger.error(f"Error building pyramid for {image_path}: {str(e)}")
+            shutil.rmtree(build_path, ignore_errors=True)
+            raise
@@ -1,11 +1,13 @@
-from datetime import datetime
-from typing import List, Optional, Union
+import os
+import shutil
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Union
 from pathlib import Path
-import json
-from uuid import UUID
 
 from src.storage.models.route_model import RouteModel
+from src.storage.serialization import encode_route, decode_route
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 from src.utils.config import ProjectConfig
 
 logger = setup_logger("storage/repositories/route", ProjectConfig.get_log_file("storage/route"))
@@ -24,6 +26,7 @@ class RouteRepository:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         logger.info(f"Initialized RouteRepository with storage path: {self.storage_path}")
 
+    @metrics.timed("route_repository_save_seconds")
     def save(self, route: RouteModel) -> None:
         """
         Save a route to the repository.
@@ -36,24 +39,12 @@ class RouteRepository:
 
         logger.info(f"Saving route to file: {route_path}")
 
-        # Prepare route data
-        route_data = {
-            "id": route_id,
-            "name": route.name,
-            "hold_ids": [str(hid) for hid in route.hold_ids],
-            "created_at": route.created_at.isoformat(),
-            "difficulty": route.difficulty,
-            "description": route.description,
-            "author": route.author
-        }
-
         try:
             # Ensure the directory exists
             route_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Write the file
-            with route_path.open('w', encoding='utf-8') as f:
-                json.dump(route_data, f, indent=2)
+            route_path.write_bytes(encode_route(route))
 
             logger.info(f"Successfully saved route {route_id} to {route_path}")
 
@@ -61,6 +52,88 @@ class RouteRepository:
             logger.error(f"Failed to save route {route_id}: {str(e)}")
             raise
 
+    @metrics.timed("route_repository_save_many_seconds")
+    def save_many(self, routes: Iterable[RouteModel]) -> int:
+        """
+        Save a batch of routes as one unit.
+
+        Note:
+            All routes are first written to a staging directory and only moved into the repository
+            once the whole batch was written, so a failure while writing leaves none of the batch
+            behind. Moving is a rename on the same filesystem, which is atomic per file. Routes being
+            replaced are kept as hard links until every file was moved, so a failure while moving
+            restores the previous files and removes the new ones (copies are kept instead where the
+            filesystem has no hard links). Only a crash of the process while moving can leave part of
+            a batch in place. Files are written with raw os calls, per-file overhead dominates the
+            cost of small route documents.
+
+        Args:
+            routes (Iterable[RouteModel]): Routes to save, the last one wins for repeated IDs
+        Returns:
+            int: Number of routes saved
+        """
+        storage_dir = str(self.storage_path)
+        staging_dir = tempfile.mkdtemp(prefix=".batch-", dir=storage_dir)
+        backup_dir = f"{staging_dir}/previous"
+        os.mkdir(backup_dir)
+        moved = []
+        try:
+            names = {}
+            for route in routes:
+                name = f"{route.id}.json"
+                fd = os.open(f"{staging_dir}/{name}", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, encode_route(route))
+                finally:
+                    os.close(fd)
+                names[name] = None
+
+            for name in names:
+                target = f"{storage_dir}/{name}"
+                try:
+                    os.link(target, f"{backup_dir}/{name}")
+                except FileNotFoundError:
+                    pass  # New route, nothing to keep
+                except OSError:
+                    # Filesystems without hard links (FAT/exFAT, some network shares)
+                    shutil.copy2(target, f"{backup_dir}/{name}")
+                os.replace(f"{staging_dir}/{name}", target)
+                moved.append(name)
+
+            logger.info(f"Saved batch of {len(names)} routes to {self.storage_path}")
+            return len(names)
+
+        except Exception as e:
+            logger.error(f"Failed to save batch of routes: {str(e)}")
+            self._restore(moved, backup_dir)
+            raise
+
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _restore(self, names: List[str], backup_dir: str) -> None:
+        """Undo the moves of a failed batch: put back replaced routes and remove new ones"""
+        for name in reversed(names):
+            target = f"{self.storage_path}/{name}"
+            try:
+                if os.path.exists(f"{backup_dir}/{name}"):
+                    os.replace(f"{backup_dir}/{name}", target)
+                else:
+                    os.remove(target)
+            except OSError as e:
+                logger.error(f"Failed to roll back route file {target}: {str(e)}")
+        if names:
+            logger.warning(f"Rolled back {len(names)} routes of the failed batch")
+
+    def route_ids(self) -> Set[str]:
+        """
+        Get the IDs of all stored routes without loading them.
+        Returns:
+            Set[str]: Route IDs
+        """
+        return {route_file.stem for route_file in self.storage_path.glob("*.json")}
+
+    @metrics.timed("route_repository_get_seconds")
     def get(self, route_id: str) -> Optional[RouteModel]:
         """
         Retrieve a route from the repository.
@@ -77,59 +150,42 @@ class RouteRepository:
 
         try:
             logger.info(f"Loading route from file: {route_path}")
-            with route_path.open('r', encoding='utf-8') as f:
-                route_data = json.load(f)
-
-            # Convert string date to datetime object
-            created_at = datetime.fromisoformat(route_data["created_at"])
-
-            return RouteModel(
-                id=UUID(route_data["id"]),
-                name=route_data["name"],
-                hold_ids=[UUID(hold_id) for hold_id in route_data["hold_ids"]],
-                created_at=created_at,
-                difficulty=route_data["difficulty"],
-                description=route_data["description"],
-                author=route_data["author"]
-            )
+            return decode_route(route_path.read_bytes())
 
         except Exception as e:
             logger.error(f"Error loading route {route_id}: {str(e)}")
             return None
 
+    @metrics.timed("route_repository_get_all_seconds")
     def get_all(self) -> List[RouteModel]:
         """
         Retrieve all routes from the repository.
         Returns:
             List[RouteModel]: List of all routes
         """
-        routes = []
         try:
-            # Use glob() to find all .json files
-            for route_file in self.storage_path.glob("*.json"):
-                try:
-                    with route_file.open('r', encoding='utf-8') as f:
-                        route_data = json.load(f)
-
-                    created_at = datetime.fromisoformat(route_data["created_at"])
-
-                    route = RouteModel(
-                        id=UUID(route_data["id"]),
-                        name=route_data["name"],
-                        hold_ids=[UUID(hold_id) for hold_id in route_data["hold_ids"]],
-                        created_at=created_at,
-                        difficulty=route_data["difficulty"],
-                        description=route_data["description"],
-                        author=route_data["author"]
-                    )
-                    routes.append(route)
-
-                except Exception as e:
-                    logger.error(f"Error loading route from {route_file}: {str(e)}")
-                    continue
-
-            return routes
+            return list(self.iter_all())
 
         except Exception as e:
             logger.error(f"Error loading routes: {str(e)}")
-            return []
\ No newline at end of file
+            return []
+
+    def iter_all(self, predicate: Optional[Callable[[RouteModel], bool]] = None) -> Iterator[RouteModel]:
+        """
+        Lazily iterate over routes in the repository, one file at a time.
+        Args:
+            predicate (Optional[Callable[[RouteModel], bool]]): Only yield routes for which it returns True
+        Yields:
+            RouteModel: Routes matching the predicate
+        """
+        # Use glob() to find all .json files
+        for route_file in self.storage_path.glob("*.json"):
+            try:
+                route = decode_route(route_file.read_bytes())
+            except Exception as e:
+                metrics.increment("route_repository_load_errors_total")
+                logger.error(f"Error loading route from {route_file}: {str(e)}")
+                continue
+
+            if predicate is None or predicate(route):
+                yield route
@@ -0,0 +1,131 @@
+from typing import List, Optional, Union
+from pathlib import Path
+
+import numpy as np
+
+from src.core.contour import encode_contours, decode_contours
+from src.storage.models.wall_model import WallModel
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("storage/repositories/wall", ProjectConfig.get_log_file("storage/wall"))
+
+
+class WallRepository:
+    """
+    Repository class for managing wall snapshots.
+    Stores one binary .npz file per wall image, keyed by the image content hash.
+    Since version 2 contours are stored as int16 deltas (see src.core.contour.encode_contours)
+    and the file is zip-compressed; version 1 files with float32 contours are still read.
+    """
+
+    FORMAT_VERSION = 2
+
+    def __init__(self, storage_path: Union[Path, str]):
+        # Convert to Path object if string is passed
+        self.storage_path = Path(storage_path)
+        # Create directory if it doesn't exist
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Initialized WallRepository with storage path: {self.storage_path}")
+
+    def _wall_path(self, image_hash: str) -> Path:
+        return self.storage_path / f"{image_hash}.npz"
+
+    def exists(self, image_hash: str) -> bool:
+        """
+        Check if a snapshot for the wall image is stored.
+        Args:
+            image_hash (str): Content hash of the wall image
+        Returns:
+            bool: True if the snapshot exists, False otherwise
+        """
+        return self._wall_path(image_hash).exists()
+
+    def recent(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Image hashes of the stored snapshots, most recently saved first.
+        Args:
+            limit (Optional[int]): Largest number of hashes returned, all if None
+        Returns:
+            List[str]: Image hashes
+        """
+        paths = sorted(self.storage_path.glob("*.npz"), key=lambda path: path.stat().st_mtime, reverse=True)
+        return [path.stem for path in paths[:limit]]
+
+    def save(self, wall: WallModel) -> None:
+        """
+        Save a wall snapshot to the repository.
+        Args:
+            wall (WallModel): Wall snapshot to save
+        """
+        wall_path = self._wall_path(wall.image_hash)
+        logger.info(f"Saving wall snapshot with {len(wall)} holds to file: {wall_path}")
+
+        try:
+            origins, deltas, scale = encode_contours(wall.contour_points, wall.contour_offsets)
+
+            # Write to a temporary file first so a crash never leaves a truncated snapshot
+            tmp_path = wall_path.with_suffix(".tmp")
+            with tmp_path.open('wb') as f:
+                np.savez_compressed(
+                    f,
+                    version=np.array(self.FORMAT_VERSION),
+                    image_hash=np.array(wall.image_hash),
+                    image_path=np.array(wall.image_path),
+                    hold_ids=wall.hold_ids,
+                    boxes=wall.boxes,
+                    confidences=wall.confidences,
+                    contour_offsets=wall.contour_offsets,
+                    contour_origins=origins,
+                    contour_deltas=deltas,
+                    contour_scale=np.array(scale),
+                )
+            tmp_path.replace(wall_path)
+
+            logger.info(f"Successfully saved wall snapshot {wall.image_hash[:12]} to {wall_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to save wall snapshot {wall.image_hash[:12]}: {str(e)}")
+            raise
+
+    def get(self, image_hash: str) -> Optional[WallModel]:
+        """
+        Retrieve a wall snapshot from the repository.
+        Args:
+            image_hash (str): Content hash of the wall image
+        Returns:
+            WallModel: Wall snapshot if found, None otherwise
+        """
+        wall_path = self._wall_path(image_hash)
+
+        if not wall_path.exists():
+            logger.warning(f"Wall snapshot not found: {image_hash[:12]}")
+            return None
+
+        try:
+            logger.info(f"Loading wall snapshot from file: {wall_path}")
+            with np.load(wall_path, allow_pickle=False) as data:
+                version = int(data["version"])
+                if version == 1:
+                    contour_points = data["contour_points"]
+                elif version == self.FORMAT_VERSION:
+                    contour_points = decode_contours(
+                        data["contour_origins"], data["contour_deltas"],
+                        data["contour_offsets"], float(data["contour_scale"])
+                    )
+                else:
+                    raise ValueError(f"Unsupported wall snapshot version: {version}")
+
+                return WallModel(
+                    image_hash=str(data["image_hash"]),
+                    image_path=str(data["image_path"]),
+                    hold_ids=data["hold_ids"],
+                    boxes=data["boxes"],
+                    confidences=data["confidences"],
+                    contour_offsets=data["contour_offsets"],
+                    contour_points=contour_points.reshape(-1, 2),
+                )
+
+        except Exception as e:
+            logger.error(f"Error loading wall snapshot {image_hash[:12]}: {str(e)}")
+            return None
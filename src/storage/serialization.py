@@ -0,0 +1,188 @@
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter
+
+from src.storage.models.route_model import RouteModel
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("storage/serialization", ProjectConfig.get_log_file("storage/route"))
+
+# Single schema definition for the persisted route format. The RouteModel dataclass is the schema,
+# pydantic handles validation and str -> UUID/datetime coercion on the way back in.
+_route_adapter = TypeAdapter(RouteModel)
+_routes_adapter = TypeAdapter(List[RouteModel])
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Stdlib encoder, needs the JSON-compatible python representation first."""
+    adapter = _routes_adapter if isinstance(obj, list) else _route_adapter
+    return json.dumps(adapter.dump_python(obj, mode="json"), separators=(",", ":")).encode("utf-8")
+
+
+def _load_backends() -> Dict[str, Callable[[Any], bytes]]:
+    """
+    Collect the available JSON encoders, fastest first.
+
+    Note:
+        Decoding always goes through pydantic-core's native JSON parser, which validates straight from
+        bytes and beats parsing to dicts with a third-party library and validating them afterwards.
+
+    Returns:
+        Dict[str, Callable[[Any], bytes]]: Backend name -> encoder
+    """
+    backends = {}
+
+    try:
+        import orjson
+        # orjson serializes dataclasses, UUID and datetime natively
+        backends["orjson"] = orjson.dumps
+    except ImportError:
+        pass
+
+    try:
+        import msgspec
+        # msgspec handles dataclasses, UUID and datetime natively as well
+        backends["msgspec"] = msgspec.json.encode
+    except ImportError:
+        pass
+
+    backends["json"] = _stdlib_dumps
+    return backends
+
+
+_BACKENDS = _load_backends()
+_backend_name = next(iter(_BACKENDS))
+_encode = _BACKENDS[_backend_name]
+logger.info(f"Using '{_backend_name}' JSON backend for route serialization")
+
+
+def available_backends() -> List[str]:
+    """
+    Get the names of the installed JSON backends.
+
+    Returns:
+        List[str]: Backend names, fastest first
+    """
+    return list(_BACKENDS)
+
+
+def get_backend() -> str:
+    """
+    Get the name of the JSON backend currently in use.
+
+    Returns:
+        str: Backend name
+    """
+    return _backend_name
+
+
+def set_backend(name: Optional[str] = None) -> None:
+    """
+    Select the JSON backend used for encoding routes.
+
+    Args:
+        name (Optional[str]): Backend name, None selects the fastest available one
+
+    Raises:
+        ValueError: If the backend is not installed
+    """
+    global _backend_name, _encode
+
+    if name is None:
+        name = next(iter(_BACKENDS))
+    if name not in _BACKENDS:
+        logger.error(f"JSON backend not available: {name}")
+        raise ValueError(f"JSON backend '{name}' is not available. Installed: {', '.join(_BACKENDS)}")
+
+    _backend_name = name
+    _encode = _BACKENDS[name]
+    logger.info(f"Switched route serialization backend to '{name}'")
+
+
+def encode_route(route: RouteModel) -> bytes:
+    """
+    Serialize a route to JSON.
+
+    Args:
+        route (RouteModel): Route to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON document
+    """
+    return _encode(route)
+
+
+def decode_route(data: bytes) -> RouteModel:
+    """
+    Deserialize and validate a route from JSON.
+
+    Args:
+        data (bytes): UTF-8 encoded JSON document
+
+    Returns:
+        RouteModel: Validated route
+
+    Raises:
+        ValueError: If the document does not match the route schema
+    """
+    return _route_adapter.validate_json(data)
+
+
+def encode_routes(routes: List[RouteModel]) -> bytes:
+    """
+    Serialize a list of routes to a single JSON array.
+
+    Args:
+        routes (List[RouteModel]): Routes to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON array
+    """
+    return _encode(routes)
+
+
+def decode_routes(data: bytes) -> List[RouteModel]:
+    """
+    Deserialize and validate a JSON array of routes.
+
+    Args:
+        data (bytes): UTF-8 encoded JSON array
+
+    Returns:
+        List[RouteModel]: Validated routes
+    """
+    return _routes_adapter.validate_json(data)
+
+
+def validate_routes(records: List[Any]) -> List[RouteModel]:
+    """
+    Validate already parsed route records (e.g. CSV rows or JSON objects) in one pass.
+
+    Args:
+        records (List[Any]): Route dictionaries with JSON-compatible values
+
+    Returns:
+        List[RouteModel]: Validated routes
+
+    Raises:
+        ValueError: If any record does not match the route schema
+    """
+    return _routes_adapter.validate_python(records)
+
+
+def validate_route(record: Any) -> RouteModel:
+    """
+    Validate a single parsed route record.
+
+    Args:
+        record (Any): Route dictionary with JSON-compatible values
+
+    Returns:
+        RouteModel: Validated route
+
+    Raises:
+        ValueError: If the record does not match the route schema
+    """
+    return _route_adapter.validate_python(record)
@@ -1,9 +1,12 @@
-from .logger import setup_logger, CustomFormatter
+from .logger import setup_logger, configure_logging, shutdown_logging, CustomFormatter, JsonFormatter
 from .config import ProjectConfig, RoboflowConfig
 
 __all__ = [
     "setup_logger",
+    "configure_logging",
+    "shutdown_logging",
     "CustomFormatter",
+    "JsonFormatter",
     "ProjectConfig",
     "RoboflowConfig",
 ]
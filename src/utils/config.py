@@ -40,14 +40,56 @@ class ProjectConfig:
     LOGS_DIR = PROJECT_ROOT / "logs"
     DATA_DIR = PROJECT_ROOT / "data"
     CACHE_DIR = DATA_DIR / "cache"
+    THUMBNAILS_DIR = CACHE_DIR / "thumbnails"
     ROUTES_DIR = DATA_DIR / "routes"
     IMAGES_DIR = DATA_DIR / "images"
     EXPORTS_DIR = DATA_DIR / "exports"
+    WALLS_DIR = DATA_DIR / "walls"
+    PYRAMIDS_DIR = CACHE_DIR / "pyramids"
+    MODELS_DIR = DATA_DIR / "models"
 
     # Application settings
     MAX_IMAGE_SIZE = 4096  # Maximum image size for display
+    DISPLAY_IMAGE_SIZE = 1280  # Minimum long side wall images are decoded at for display
+    MAX_VIEW_ZOOM = 16.0  # Largest HoldViewer zoom, relative to the image fitted to the widget
+    VIEWER_BACKEND = os.environ.get("HOLD_VIEWER_BACKEND", "raster")  # "opengl" draws the wall with OpenGL when available
+    CONTOUR_TOLERANCE = 1.0  # Pixels hold contours may deviate from the detection, also the click tolerance
+    MAX_WALL_PIXELS = 1_000_000_000  # Largest wall image accepted, larger files are treated as decompression bombs
     SUPPORTED_IMAGE_FORMATS = [".png", ".jpg", ".jpeg"]
     MAX_CACHE_SIZE = 500  # Maximum number of items in cache
+    TILE_CACHE_SIZE = 64  # Pyramid tiles kept as pixmaps by the HoldViewer
+    THUMBNAIL_SIZE = 256  # Longest side of cached thumbnails
+
+    # Route analysis
+    DIFFICULTY_MODEL_PATH = MODELS_DIR / "difficulty.json"  # Fitted with python -m src.core.analysis
+    DIFFICULTY_ALPHA = 1.0  # L2 regularization of the difficulty model
+    DIFFICULTY_CACHE_SIZE = 10_000  # Routes whose difficulty features are kept for re-scoring
+    BETA_HAND_REACH = 8.0  # Longest comfortable hand move of the beta solver, in median hold sizes
+    BETA_FOOT_REACH = 6.0  # Longest comfortable foot move of the beta solver, in median hold sizes
+    BETA_WINDOW = 6  # A hold is climbed before every hold ranked this many or more above it by height, larger is slower
+    BETA_DOWN_PENALTY = 2.0  # Extra cost per unit of a move downwards
+    BETA_REACH_PENALTY = 10.0  # Extra cost per unit of a move beyond reach
+    WALL_MATCH_CANDIDATES = 5  # Most recently stored walls a new detection is matched against
+    WALL_MATCH_MAX_ERROR = 0.5  # Largest distance of matched holds after alignment, in median hold sizes
+    WALL_MATCH_MIN_RATIO = 0.3  # Share of holds that must align for two photos to show the same wall
+    WALL_MATCH_MIN_HOLDS = 8  # Fewest aligned holds for two photos to show the same wall
+    WALL_MATCH_ITERATIONS = 256  # RANSAC hypotheses tried per match
+
+    # Logging
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()  # Lowest level module loggers emit, "DEBUG" for everything
+    LOG_CONSOLE_LEVEL = os.environ.get("LOG_CONSOLE_LEVEL", "INFO").upper()  # Lowest level also printed to the console
+    LOG_LEVELS = os.environ.get("LOG_LEVELS", "")  # Per-logger levels, e.g. "gui/hold_viewer=DEBUG,core/hold=WARNING"
+    LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")  # Log file format, "json" writes one JSON object per line
+    LOG_MAX_BYTES = 5 * 1024 * 1024  # Size at which a log file is rotated
+    LOG_BACKUP_COUNT = 2  # Rotated log files kept next to the current one
+
+    # Instrumentation
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "0") == "1"  # Record hot-path timings and counters
+    METRICS_WINDOW = 4096  # Latest observations per metric used for p50/p95/p99
+    PROFILE_MODE = os.environ.get("PROFILE_MODE", "")  # "cprofile" or "sampling" profiles from launch, like --profile
+    PROFILE_HOTKEY = "Ctrl+Shift+P"  # Starts, pauses and resumes profiling
+    PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples of the sampling profiler
+    PROFILE_TOP_FUNCTIONS = 30  # Functions and stacks listed in the profile summary
 
     # Logger for the conf module
     logger = None  # not needed, but can be used for debugging
@@ -72,9 +114,12 @@ class ProjectConfig:
             cls.LOGS_DIR,
             cls.DATA_DIR,
             cls.CACHE_DIR,
+            cls.THUMBNAILS_DIR,
+            cls.PYRAMIDS_DIR,
             cls.ROUTES_DIR,
             cls.IMAGES_DIR,
-            cls.EXPORTS_DIR
+            cls.EXPORTS_DIR,
+            cls.WALLS_DIR
         ]
 
         for directory in directories:
@@ -0,0 +1,217 @@
+import hashlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("utils/image", ProjectConfig.get_log_file("utils/image"))
+
+HASH_CHUNK_SIZE = 1024 * 1024  # Read images in 1 MB chunks when hashing
+EXIF_ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)  # EXIF orientations that swap width and height
+
+# Transpose turning a stored image upright, per EXIF orientation (same as ImageOps.exif_transpose)
+ORIENTATION_TRANSPOSES = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
+# Bytes per pixel of Pillow's in-memory storage, 4 for the modes not listed
+STORAGE_PIXEL_BYTES = {"1": 1, "L": 1, "P": 1, "I;16": 2, "I;16L": 2, "I;16B": 2}
+
+# Stitched walls are far beyond Pillow's default decompression bomb limit (~89 Mpx)
+Image.MAX_IMAGE_PIXELS = ProjectConfig.MAX_WALL_PIXELS
+
+
+def compute_image_hash(image_path: Union[str, Path]) -> str:
+    """
+    Compute a content hash of an image file.
+
+    Note:
+        Used as a stable key for a wall photo, independent of the file name or location.
+
+    Args:
+        image_path (Union[str, Path]): Path to the image file
+
+    Returns:
+        str: Hex encoded SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with Path(image_path).open('rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    image_hash = digest.hexdigest()
+    logger.debug(f"Computed hash {image_hash[:12]} for image {image_path}")
+    return image_hash
+
+
+def get_exif_orientation(image: Image.Image) -> int:
+    """
+    Read the EXIF orientation of an opened image.
+
+    Args:
+        image (Image.Image): Image opened with Image.open
+
+    Returns:
+        int: EXIF orientation (1-8), 1 if the image has none
+    """
+    orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    return orientation if orientation in range(1, 9) else 1
+
+
+def get_oriented_size(image_path: Union[str, Path]) -> Tuple[int, int]:
+    """
+    Get the size of an image as displayed, after EXIF orientation, without decoding the pixels.
+
+    Args:
+        image_path (Union[str, Path]): Path to the image file
+
+    Returns:
+        Tuple[int, int]: Width and height in pixels
+    """
+    with Image.open(image_path) as image:
+        width, height = image.size
+        if get_exif_orientation(image) in TRANSPOSED_ORIENTATIONS:
+            return height, width
+        return width, height
+
+
+def load_image(image_path: Union[str, Path], max_size: Optional[int] = None) -> Image.Image:
+    """
+    Decode an image upright (EXIF orientation applied), optionally at a reduced size.
+
+    Note:
+        With max_size set, JPEGs are decoded in draft mode: libjpeg scales by 1/2, 1/4 or 1/8
+        while decoding, so a phone photo shown at ~1000 px never allocates its full resolution.
+        This is the single place images are oriented, so display, detection and exports agree.
+
+    Args:
+        image_path (Union[str, Path]): Path to the image file
+        max_size (Optional[int]): Longest side of the result, full resolution if None
+
+    Returns:
+        Image.Image: RGB image
+    """
+    with Image.open(image_path) as image:
+        if max_size is not None:
+            # Draft size is checked against the stored (unrotated) size, a square box fits both
+            image.draft("RGB", (max_size, max_size))
+        oriented = ImageOps.exif_transpose(image)
+        result = oriented.convert("RGB") if oriented.mode != "RGB" else oriented
+        if result is image:
+            result = image.copy()  # Detach from the file before it is closed
+
+    if max_size is not None and max(result.size) > max_size:
+        result.thumbnail((max_size, max_size), Image.LANCZOS, reducing_gap=3.0)
+    return result
+
+
+@contextmanager
+def open_mapped_image(image_path: Union[str, Path], scratch_path: Union[str, Path]
+                      ) -> Iterator[Tuple[Tuple[int, int], Callable[[Tuple[int, int, int, int]], np.ndarray]]]:
+    """
+    Decode an image once into a memory-mapped scratch file and read upright regions of it.
+
+    Note:
+        The decoder writes straight into the file-backed map, so decoding a wall of any size
+        allocates no image-sized heap memory and the kernel writes pages back to the scratch file
+        under memory pressure. Regions are cut from the stored image and turned upright one at a
+        time. Images in modes Pillow cannot map are decoded in memory instead.
+
+    Args:
+        image_path (Union[str, Path]): Path to the image file
+        scratch_path (Union[str, Path]): File holding the decoded pixels, removed on exit
+
+    Yields:
+        Tuple: Upright width and height, and a function reading a (left, top, right, bottom)
+            box of the upright image as an (h, w, 3) uint8 RGB array
+    """
+    scratch_path = Path(scratch_path)
+    try:
+        with Image.open(image_path) as source:
+            orientation = get_exif_orientation(source)
+            width, height = source.size
+            stride = width * STORAGE_PIXEL_BYTES.get(source.mode, 4)
+            scratch = np.memmap(scratch_path, dtype=np.uint8, mode="w+", shape=(height, stride))
+            try:
+                source.im = Image.core.map_buffer(scratch, source.size, "raw", 0, (source.mode, stride, 1))
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Decoding {image_path} in memory, {source.mode} images cannot be mapped: {str(e)}")
+            source.load()
+
+            def read_region(box: Tuple[int, int, int, int]) -> np.ndarray:
+                region = source.crop(_stored_box(orientation, box, width, height))
+                if orientation in ORIENTATION_TRANSPOSES:
+                    region = region.transpose(ORIENTATION_TRANSPOSES[orientation])
+                return np.asarray(region if region.mode == "RGB" else region.convert("RGB"))
+
+            upright_size = (height, width) if orientation in TRANSPOSED_ORIENTATIONS else (width, height)
+            yield upright_size, read_region
+            del scratch
+    finally:
+        scratch_path.unlink(missing_ok=True)
+
+
+def _stored_box(orientation: int, box: Tuple[int, int, int, int], width: int, height: int) -> Tuple[int, int, int, int]:
+    """Box of the stored image (width x height) that becomes the given box of the upright image"""
+    left, top, right, bottom = box
+    corners = [_stored_point(orientation, x, y, width, height) for x, y in ((left, top), (right, bottom))]
+    (x0, y0), (x1, y1) = corners
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def _stored_point(orientation: int, x: int, y: int, width: int, height: int) -> Tuple[int, int]:
+    """Point of the stored image that is at (x, y) in the upright image, in pixel edge coordinates"""
+    return {
+        1: (x, y),
+        2: (width - x, y),
+        3: (width - x, height - y),
+        4: (x, height - y),
+        5: (y, x),
+        6: (y, height - x),
+        7: (width - y, height - x),
+        8: (width - y, x),
+    }[orientation]
+
+
+def oriented_image_path(image_path: Union[str, Path], cache_dir: Union[str, Path] = ProjectConfig.CACHE_DIR) -> Path:
+    """
+    Path of an upright version of an image, for consumers that ignore EXIF orientation.
+
+    Note:
+        Used for detection, so hold coordinates are in the same pixel space as the displayed image.
+        Upright images are returned as they are; rotated ones are written once to the cache,
+        keyed by their content hash.
+
+    Args:
+        image_path (Union[str, Path]): Path to the image file
+        cache_dir (Union[str, Path]): Directory for the rotated copies
+
+    Returns:
+        Path: Path to an image without EXIF rotation
+    """
+    image_path = Path(image_path)
+    with Image.open(image_path) as image:
+        if get_exif_orientation(image) == 1:
+            return image_path
+
+    cached_path = Path(cache_dir) / f"{compute_image_hash(image_path)}_upright.jpg"
+    if not cached_path.exists():
+        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cached_path.with_suffix(".tmp")
+        load_image(image_path).save(tmp_path, "JPEG", quality=95)
+        tmp_path.replace(cached_path)
+        logger.info(f"Wrote upright copy of {image_path} to {cached_path}")
+
+    return cached_path
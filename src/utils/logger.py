@@ -1,6 +1,12 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Union
 import os
 
 
@@ -20,8 +26,9 @@ class CustomFormatter(logging.Formatter):
         self.fmt = fmt or '%(asctime)s - %(levelname)s - %(name)s - [%(filename)s:%(lineno)d] - %(message)s'
 
     def format(self, record):
-        # Zachowaj oryginalny format
-        format_orig = self._style._fmt
+        # Treść i czas liczone tutaj, nie zakładamy że inny formatter zrobił to wcześniej
+        record.message = record.getMessage()
+        record.asctime = self.formatTime(record)
 
         # Dodaj kolory do różnych części komunikatu
         timestamp = self.grey + record.asctime + self.reset
@@ -47,47 +54,319 @@ class CustomFormatter(logging.Formatter):
         return self.grey
 
 
-def setup_logger(name: str, log_file: str, level: int = logging.DEBUG) -> logging.Logger:
+# Attributes every LogRecord has, anything else was passed through extra=
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
     """
-    Return a logger with the specified name and level.
+    Formats records as one JSON object per line, for log shipping.
+    Values passed with extra= are added as fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": record.filename,
+            "line": record.lineno,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# Format dla pliku (bez kolorów)
+_FILE_FORMAT = '[%(asctime)s] - %(levelname)s - %(name)s - [%(filename)s:%(lineno)d] - %(message)s'
+
+# Formats of the log files, selected by name in ProjectConfig.LOG_FORMAT
+LOG_FORMATTERS = {
+    "text": lambda: logging.Formatter(_FILE_FORMAT),
+    "json": JsonFormatter,
+}
+
+
+def parse_levels(spec: str) -> Dict[str, str]:
+    """
+    Parse per-logger levels written as "name=LEVEL,name=LEVEL".
 
     Args:
-        name (str): Name of the logger.
-        log_file (str): Path to the log file.
-        level (int): Logging level (default: logging.INFO).
+        spec (str): Level overrides, e.g. "gui/hold_viewer=DEBUG,core/hold=WARNING"
 
     Returns:
-        logging.Logger: Configured logger.
+        Dict[str, str]: Logger name -> level name
+    """
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        if not level:
+            raise ValueError(f"Invalid logger level '{item}', expected name=LEVEL")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class _DestinationQueueHandler(QueueHandler):
+    """
+    Hands records of one logger to the writer thread, tagged with the logger's log file.
+
+    Note:
+        The stdlib QueueHandler formats the message in prepare(), i.e. in the logging thread.
+        Here the record is queued as is, message arguments are only merged and the line only
+        formatted when the writer thread writes it. Pass values that are not mutated afterwards.
+    """
+
+    def __init__(self, registry: "LoggingRegistry", log_file: str):
+        super().__init__(registry.queue)
+        self.registry = registry
+        self.log_file = log_file
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        self.registry.submit(self.log_file, record)
+
+
+class _LogWriter(QueueListener):
+    """
+    The single background thread writing queued records to their destinations.
+    """
+
+    def __init__(self, registry: "LoggingRegistry"):
+        super().__init__(registry.queue, respect_handler_level=True)
+        self.registry = registry
+
+    def handle(self, item) -> None:
+        self.registry.write(*item)
+
+
+class LoggingRegistry:
     """
+    Owns every logging destination of the process and the thread writing to them.
 
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    Note:
+        Loggers are registered with a log file and get a queue handler, nothing else happens at
+        import time. Each log file gets exactly one rotating handler, shared by all loggers
+        writing to it and opened by the writer thread when its first record arrives. The writer
+        thread is started by the first record as well. The previous run's log is rotated away
+        instead of truncated.
 
-    # Format dla pliku (bez kolorów)
-    file_formatter = logging.Formatter(
-        '[%(asctime)s] - %(levelname)s - %(name)s - [%(filename)s:%(lineno)d] - %(message)s'
-    )
+    Attributes:
+        queue (queue.SimpleQueue): Records waiting for the writer thread, as (log file, record)
+        loggers (Dict[str, str]): Registered logger name -> log file
+    """
+
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.loggers: Dict[str, str] = {}
+        self._default_levels: Dict[str, Union[int, str]] = {}  # Levels passed to setup_logger
+        self._settings: Optional[dict] = None
+        self._file_handlers: Dict[str, logging.Handler] = {}
+        self._console_handler: Optional[logging.Handler] = None
+        self._writer: Optional[_LogWriter] = None
+        self._stopped = False
+        self._lock = threading.RLock()
+
+    @property
+    def settings(self) -> dict:
+        """Active settings, ProjectConfig defaults until configure() is called"""
+        if self._settings is None:
+            self.configure()
+        return self._settings
+
+    def configure(self, level: Optional[Union[int, str]] = None, console_level: Optional[Union[int, str]] = None,
+                  levels: Optional[Dict[str, Union[int, str]]] = None, log_format: Optional[str] = None,
+                  max_bytes: Optional[int] = None, backup_count: Optional[int] = None) -> None:
+        """
+        Apply logging settings to every registered and future logger.
+        Calling it again replaces the settings, handlers are never duplicated.
+
+        Args:
+            level: Default logger level (default: ProjectConfig.LOG_LEVEL)
+            console_level: Lowest level printed to the console (default: ProjectConfig.LOG_CONSOLE_LEVEL)
+            levels: Per-logger levels overriding the default (default: ProjectConfig.LOG_LEVELS)
+            log_format: Log file format, a key of LOG_FORMATTERS (default: ProjectConfig.LOG_FORMAT)
+            max_bytes: Size at which a log file is rotated (default: ProjectConfig.LOG_MAX_BYTES)
+            backup_count: Rotated files kept (default: ProjectConfig.LOG_BACKUP_COUNT)
+        """
+        from .config import ProjectConfig  # config imports this module
+
+        settings = {
+            "level": level if level is not None else ProjectConfig.LOG_LEVEL,
+            "console_level": console_level if console_level is not None else ProjectConfig.LOG_CONSOLE_LEVEL,
+            "levels": dict(levels) if levels is not None else parse_levels(ProjectConfig.LOG_LEVELS),
+            "log_format": log_format or ProjectConfig.LOG_FORMAT,
+            "max_bytes": max_bytes if max_bytes is not None else ProjectConfig.LOG_MAX_BYTES,
+            "backup_count": backup_count if backup_count is not None else ProjectConfig.LOG_BACKUP_COUNT,
+        }
+        if settings["log_format"] not in LOG_FORMATTERS:
+            raise ValueError(f"Unknown log format '{settings['log_format']}', "
+                             f"expected one of: {', '.join(LOG_FORMATTERS)}")
+
+        with self._lock:
+            self._settings = settings
+            for name in self.loggers:
+                logging.getLogger(name).setLevel(self.level_of(name))
+            if self._console_handler is not None:
+                self._console_handler.setLevel(settings["console_level"])
+            for handler in self._file_handlers.values():
+                handler.setFormatter(LOG_FORMATTERS[settings["log_format"]]())
+                handler.maxBytes = settings["max_bytes"]
+                handler.backupCount = settings["backup_count"]
+
+    def level_of(self, name: str) -> Union[int, str]:
+        """Configured level of a logger: its configured override, the level it was set up with or the default"""
+        settings = self.settings
+        return settings["levels"].get(name, self._default_levels.get(name, settings["level"]))
 
-    # Utwórz handler pliku
-    # handler = RotatingFileHandler(log_file, maxBytes=5 * 1024 * 1024, backupCount=2)
-    handler = logging.FileHandler(log_file, mode='w')
-    handler.setFormatter(file_formatter)
+    def register(self, name: str, log_file: str, level: Optional[Union[int, str]] = None) -> logging.Logger:
+        """
+        Route a logger to a log file. Registering the same logger again only updates it.
 
-    # Utwórz handler konsoli z kolorami
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(CustomFormatter())
+        Args:
+            name (str): Name of the logger
+            log_file (str): Path to the log file
+            level (int | str): Level of this logger instead of the configured default
 
-    # Skonfiguruj logger
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+        Returns:
+            logging.Logger: The logger
+        """
+        log_file = os.path.abspath(log_file)
+        logger = logging.getLogger(name)
+        with self._lock:
+            self.loggers[name] = log_file
+            if level is not None:
+                self._default_levels[name] = level
+            logger.setLevel(self.level_of(name))
+            logger.handlers = [_DestinationQueueHandler(self, log_file)]
+            logger.propagate = False
+        return logger
 
-    # Usuń istniejące handlery
-    logger.handlers = []
+    def submit(self, log_file: str, record: logging.LogRecord) -> None:
+        """Queue a record for the writer thread, starting it on first use"""
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None and not self._stopped:
+                    self._writer = _LogWriter(self)
+                    self._writer.start()
+                    atexit.register(self.shutdown)
+        if self._stopped:
+            # After shutdown, write synchronously instead of dropping the record
+            self.write(log_file, record)
+        else:
+            self.queue.put_nowait((log_file, record))
 
-    # Dodaj oba handlery
-    logger.addHandler(handler)
-    logger.addHandler(console_handler)
+    def write(self, log_file: str, record: logging.LogRecord) -> None:
+        """Write a record to its log file and the console (runs on the writer thread)"""
+        with self._lock:
+            late = self._stopped
+            file_handler = self._late_file_handler(log_file) if late else self._file_handler(log_file)
+            try:
+                for handler in (file_handler, self._console()):
+                    if handler is not None and record.levelno >= handler.level:
+                        handler.handle(record)
+            finally:
+                if late and file_handler is not None:
+                    file_handler.close()
 
-    return logger
+    def _console(self) -> logging.Handler:
+        if self._console_handler is None:
+            self._console_handler = logging.StreamHandler()
+            self._console_handler.setFormatter(CustomFormatter())
+            self._console_handler.setLevel(self.settings["console_level"])
+        return self._console_handler
+
+    def _file_handler(self, log_file: str) -> Optional[logging.Handler]:
+        handler = self._file_handlers.get(log_file)
+        if handler is None and log_file not in self._file_handlers:
+            settings = self.settings
+            try:
+                os.makedirs(os.path.dirname(log_file), exist_ok=True)
+                handler = RotatingFileHandler(
+                    log_file, maxBytes=settings["max_bytes"], backupCount=settings["backup_count"], delay=True
+                )
+                if os.path.exists(log_file) and os.path.getsize(log_file) > 0:
+                    handler.doRollover()
+                handler.setFormatter(LOG_FORMATTERS[settings["log_format"]]())
+            except OSError as e:
+                # Keep logging to the console, one unwritable file must not break the others
+                print(f"Cannot open log file {log_file}: {e}", file=sys.stderr)
+                handler = None
+            self._file_handlers[log_file] = handler
+        return handler
+
+    def _late_file_handler(self, log_file: str) -> Optional[logging.Handler]:
+        """
+        Handler appending a record logged after shutdown to the current log file.
+        The file is never rotated, that would move this run's log away, and the caller closes it.
+        """
+        try:
+            handler = logging.FileHandler(log_file, mode="a", delay=True)
+        except OSError as e:
+            print(f"Cannot open log file {log_file}: {e}", file=sys.stderr)
+            return None
+        handler.setFormatter(LOG_FORMATTERS[self.settings["log_format"]]())
+        return handler
+
+    def shutdown(self) -> None:
+        """Write out all queued records and close the log files"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+            self._stopped = True
+        if writer is not None:
+            writer.stop()
+        with self._lock:
+            for handler in self._file_handlers.values():
+                if handler is not None:
+                    handler.close()
+            self._file_handlers.clear()
+            if self._console_handler is not None:
+                try:
+                    self._console_handler.flush()
+                except (OSError, ValueError):
+                    pass  # The console stream may already be closed at exit, e.g. captured by pytest
+
+
+_registry = LoggingRegistry()
+
+
+def configure_logging(**settings) -> None:
+    """
+    Configure all loggers of the application at once, see LoggingRegistry.configure.
+    Safe to call any number of times.
+    """
+    _registry.configure(**settings)
+
+
+def shutdown_logging() -> None:
+    """Flush every queued record and close the log files (done automatically at exit)."""
+    _registry.shutdown()
+
+
+def setup_logger(name: str, log_file: str, level: Optional[Union[int, str]] = None) -> logging.Logger:
+    """
+    Return a logger with the specified name and level.
+
+    Note:
+        Records are queued and written by one background thread, so logging never waits for disk
+        or terminal I/O. Records below the logger level are dropped before any formatting, use
+        lazy %-style arguments (logger.debug("x = %s", x)) on hot paths.
+
+    Args:
+        name (str): Name of the logger.
+        log_file (str): Path to the log file, shared with the other loggers writing to it.
+        level (int | str): Logging level (default: configured level, see configure_logging).
+
+    Returns:
+        logging.Logger: Configured logger.
+    """
+    return _registry.register(name, log_file, level)
 
 
 # Ustaw root logger żeby uniknąć duplikowania
@@ -0,0 +1,262 @@
+import json
+import re
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("utils/metrics", ProjectConfig.get_log_file("metrics"))
+
+# Quantiles reported for every histogram
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Distribution of one measured value.
+
+    Note:
+        Count, sum and max are exact over the whole run. Quantiles are computed over a ring
+        buffer of the latest observations, so they follow the recent behaviour and recording
+        stays O(1) with bounded memory.
+
+    Attributes:
+        count (int): Number of observations
+        total (float): Sum of all observations
+        max (float): Largest observation
+    """
+
+    __slots__ = ("count", "total", "max", "_window", "_next")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._window: List[float] = [0.0] * window
+        self._next = 0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self._window[self._next] = value
+        self._next = (self._next + 1) % len(self._window)
+
+    def samples(self) -> List[float]:
+        """Observations in the window, oldest first"""
+        if self.count < len(self._window):
+            return self._window[:self.count]
+        return self._window[self._next:] + self._window[:self._next]
+
+    def quantiles(self, quantiles=QUANTILES) -> List[float]:
+        """Quantiles of the observations in the window, zeros if there are none"""
+        samples = self._window[:min(self.count, len(self._window))]
+        if not samples:
+            return [0.0] * len(quantiles)
+        return np.quantile(np.asarray(samples), quantiles).tolist()
+
+    def summary(self) -> Dict[str, float]:
+        p50, p95, p99 = self.quantiles()
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+        }
+
+
+class _Timer:
+    """Context manager adding its elapsed time in seconds to a histogram"""
+
+    __slots__ = ("_metrics", "_name", "_start", "elapsed")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+        self.elapsed = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        self._metrics.observe(self._name, self.elapsed)
+
+
+class _NullTimer:
+    """Timer used while metrics are disabled, it does nothing"""
+
+    __slots__ = ()
+    elapsed = 0.0
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    In-process counters and histograms of hot-path timings.
+
+    Note:
+        While disabled, timer() returns a shared no-op context manager and every other recording
+        call returns after one attribute check, so instrumented code pays well under a
+        microsecond. Recording is thread-safe, workers and the GUI thread record concurrently.
+        Time is recorded in seconds, metric names follow Prometheus conventions
+        (snake_case, "_seconds" for timings, "_total" for counters).
+
+    Attributes:
+        enabled (bool): Whether anything is recorded
+        window (int): Observations per histogram used for quantiles
+    """
+
+    def __init__(self, enabled: bool = False, window: int = 4096):
+        self.enabled = enabled
+        self.window = window
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record one value of a histogram"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(value)
+
+    def timer(self, name: str) -> Union[_Timer, _NullTimer]:
+        """
+        Time a block into a histogram.
+        Args:
+            name (str): Histogram name, e.g. "hold_viewer_paint_seconds"
+        Returns:
+            Context manager, its elapsed attribute holds the measured seconds afterwards
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator timing every call of a function into a histogram"""
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Timer(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def counter(self, name: str) -> float:
+        """Current value of a counter"""
+        return self._counters.get(name, 0)
+
+    def summary(self, name: str) -> Optional[Dict[str, float]]:
+        """Count, sum, mean, max and p50/p95/p99 of a histogram, None if it has no observations"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram is not None else None
+
+    def samples(self, name: str) -> List[float]:
+        """Latest observations of a histogram, oldest first"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.samples() if histogram is not None else []
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Current value of every metric.
+        Returns:
+            Dict[str, Dict]: {"counters": {name: value}, "histograms": {name: summary}}
+        """
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {name: histogram.summary() for name, histogram in self._histograms.items()},
+            }
+
+    def reset(self) -> None:
+        """Forget all recorded values"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        Histograms are exported as summaries with their quantiles.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            name = _prometheus_name(name)
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name} {value}")
+        for name, summary in sorted(snapshot["histograms"].items()):
+            name = _prometheus_name(name)
+            lines.append(f"# TYPE {name} summary")
+            for quantile in QUANTILES:
+                lines.append(f'{name}{{quantile="{quantile}"}} {summary[f"p{round(quantile * 100)}"]}')
+            lines.append(f"{name}_sum {summary['sum']}")
+            lines.append(f"{name}_count {summary['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: Union[Path, str]) -> Path:
+        """
+        Write all metrics to a file, as JSON for a .json path and in Prometheus text format otherwise.
+        Args:
+            path (Union[Path, str]): Output file
+        Returns:
+            Path: The written file
+        """
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            text = self.to_json() if path.suffix == ".json" else self.to_prometheus()
+            path.write_text(text, encoding="utf-8")
+            logger.info(f"Wrote metrics to {path}")
+            return path
+
+        except Exception as e:
+            logger.error(f"Failed to write metrics to {path}: {str(e)}")
+            raise
+
+
+def _prometheus_name(name: str) -> str:
+    """Replace characters Prometheus does not allow in metric names"""
+    name = re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+    return f"_{name}" if name[:1].isdigit() else name
+
+
+# Process-wide metrics, enabled with the METRICS_ENABLED environment variable
+metrics = Metrics(enabled=ProjectConfig.METRICS_ENABLED, window=ProjectConfig.METRICS_WINDOW)
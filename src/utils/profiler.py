@@ -0,0 +1,240 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("utils/profiler", ProjectConfig.get_log_file("profiler"))
+
+# Supported profilers, "cprofile" traces every call of the GUI thread, "sampling" samples all threads
+PROFILE_MODES = ("cprofile", "sampling")
+
+# Histogram holding the duration of every HoldViewer frame
+PAINT_METRIC = "hold_viewer_paint_seconds"
+
+# Frame budget of a 60 Hz display, slower paints are counted as dropped frames
+FRAME_BUDGET = 1 / 60
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler taking the stacks of all threads at a fixed interval.
+
+    Note:
+        Runs in its own daemon thread and only reads sys._current_frames(), so the profiled code
+        runs at full speed apart from the GIL hand-offs of the sampler. Stacks are aggregated as
+        counts per unique stack, written in the folded format read by flamegraph.pl, speedscope
+        and inferno: "thread;outer;...;inner count".
+
+    Attributes:
+        interval (float): Seconds between samples
+        stacks (Counter): Folded stack -> number of samples
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class AppProfiler:
+    """
+    Profiling mode of the application, switched on and off at runtime.
+
+    Note:
+        Profiling also enables metrics, so the duration of every HoldViewer frame is recorded in
+        the ring buffer of the paint histogram. Pauses keep everything recorded so far, each
+        start() continues the same profile. cProfile only sees the thread that started it, the
+        GUI thread, use the sampling profiler for detection and export workers.
+
+    Attributes:
+        mode (str): One of PROFILE_MODES
+        output_dir (Path): Directory the results are written to
+    """
+
+    def __init__(self, mode: str = "cprofile", output_dir: Union[Path, str] = None):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of: {', '.join(PROFILE_MODES)}")
+        self.mode = mode
+        self.output_dir = Path(output_dir or ProjectConfig.LOGS_DIR)
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._running = False
+        self._started_at: Optional[float] = None
+        self._profiled_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        """Start or resume profiling"""
+        if self._running:
+            return
+        metrics.enabled = True
+        if self.mode == "cprofile":
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            if self._sampler is None:
+                self._sampler = SamplingProfiler(ProjectConfig.PROFILE_SAMPLE_INTERVAL)
+            self._sampler.start()
+        self._running = True
+        self._started_at = time.perf_counter()
+        logger.info(f"Profiling started ({self.mode})")
+
+    def stop(self) -> None:
+        """Pause profiling, the results so far are kept"""
+        if not self._running:
+            return
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self._running = False
+        self._profiled_seconds += time.perf_counter() - self._started_at
+        logger.info(f"Profiling paused after {self._profiled_seconds:.1f} s")
+
+    def toggle(self) -> bool:
+        """
+        Pause a running profile or resume a paused one.
+        Returns:
+            bool: Whether profiling is running now
+        """
+        if self._running:
+            self.stop()
+        else:
+            self.start()
+        return self._running
+
+    def frame_times(self) -> List[float]:
+        """Durations of the latest HoldViewer frames in seconds, oldest first"""
+        return metrics.samples(PAINT_METRIC)
+
+    def dump(self) -> Dict[str, Path]:
+        """
+        Stop profiling and write the results to output_dir, named after the current time:
+        profile_<time>.prof (cProfile stats, for pstats/snakeviz), profile_<time>.folded
+        (sampled stacks, for flame graphs), profile_<time>_frames.txt (every recorded frame
+        time in ms) and profile_<time>_summary.txt.
+
+        Returns:
+            Dict[str, Path]: Written files keyed by kind
+        """
+        self.stop()
+        prefix = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        written = {}
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+
+            if self._profile is not None:
+                written["stats"] = self.output_dir / f"{prefix}.prof"
+                self._profile.dump_stats(str(written["stats"]))
+
+            if self._sampler is not None:
+                written["stacks"] = self.output_dir / f"{prefix}.folded"
+                self._sampler.write_folded(written["stacks"])
+
+            frames = self.frame_times()
+            written["frames"] = self.output_dir / f"{prefix}_frames.txt"
+            written["frames"].write_text("".join(f"{seconds * 1000:.3f}\n" for seconds in frames), encoding="utf-8")
+
+            written["summary"] = self.output_dir / f"{prefix}_summary.txt"
+            written["summary"].write_text(self.summary(), encoding="utf-8")
+
+            logger.info(f"Wrote profile to {self.output_dir / prefix}*")
+            return written
+
+        except Exception as e:
+            logger.error(f"Failed to write profile: {str(e)}")
+            raise
+
+    def summary(self) -> str:
+        """Human readable report: frame times, all metrics and the top functions"""
+        lines = [f"Profile mode: {self.mode}", f"Profiled time: {self._profiled_seconds:.1f} s", ""]
+
+        frames = np.asarray(self.frame_times()) * 1000
+        lines.append(f"HoldViewer frames (latest {len(frames)}):")
+        if len(frames):
+            p50, p95, p99 = np.percentile(frames, (50, 95, 99))
+            slow = int(np.count_nonzero(frames > FRAME_BUDGET * 1000))
+            lines.append(f"  p50 {p50:.2f} ms, p95 {p95:.2f} ms, p99 {p99:.2f} ms, max {frames.max():.2f} ms")
+            lines.append(f"  {slow} frames over the {FRAME_BUDGET * 1000:.1f} ms budget")
+        lines.append("")
+
+        snapshot = metrics.snapshot()
+        lines.append("Timings (ms):")
+        for name, values in sorted(snapshot["histograms"].items()):
+            lines.append(f"  {name}: n={values['count']} mean={values['mean'] * 1000:.2f} "
+                         f"p50={values['p50'] * 1000:.2f} p95={values['p95'] * 1000:.2f} "
+                         f"p99={values['p99'] * 1000:.2f} max={values['max'] * 1000:.2f}")
+        lines.append("Counters:")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"  {name}: {value}")
+        lines.append("")
+
+        if self._profile is not None:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(ProjectConfig.PROFILE_TOP_FUNCTIONS)
+            lines.append(stream.getvalue())
+
+        if self._sampler is not None:
+            total = sum(self._sampler.stacks.values())
+            lines.append(f"Samples: {total}, hottest stacks:")
+            for stack, count in self._sampler.stacks.most_common(ProjectConfig.PROFILE_TOP_FUNCTIONS):
+                lines.append(f"  {count / total:6.1%}  {' > '.join(stack.split(';')[-3:])}")
+
+        return "\n".join(lines) + "\n"
@@ -1,125 +1,227 @@
 from pathlib import Path
-from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QPainter, QImage, QColor
-from PIL import Image, ImageDraw, ImageFont
-import os
-from datetime import datetime
-from pathlib import Path
+from PIL import Image
+import numpy as np
 from src.utils.logger import setup_logger
+from src.utils.metrics import metrics
 from src.utils.config import ProjectConfig
-from typing import List, Tuple
+from src.utils.route_renderer import RouteRenderer
+from src.utils.image_utils import load_image
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import multiprocessing
+from multiprocessing import shared_memory
+import threading
+from typing import Dict, Optional, Sequence, Tuple
 
 logger = setup_logger("utils/route_image", ProjectConfig.get_log_file("utils/route_image"))
 
+# Pillow format name and file extension of each supported export format
+EXPORT_FORMATS = {
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+}
+
+
+@dataclass(frozen=True)
+class ExportProfile:
+    """
+    One size of an exported route image
+
+    Attributes:
+        name: Suffix of the output file names, e.g. "thumbnail"
+        max_size: Longest side in pixels, None keeps the native resolution
+        formats: Formats written for this size, keys of EXPORT_FORMATS
+        quality: Encoder quality (0-100)
+        webp_method: WebP encoder effort (0-6), lower is faster and slightly larger
+    """
+    name: str
+    max_size: Optional[int] = None
+    formats: Tuple[str, ...] = ("jpeg", "webp")
+    quality: int = 90
+    webp_method: int = 4
+
+    def encoder_options(self, fmt: str) -> dict:
+        """Pillow save options for one of the profile's formats"""
+        if fmt == "webp":
+            return {"quality": self.quality, "method": self.webp_method}
+        return {"quality": self.quality}
+
+    def __post_init__(self):
+        unknown = set(self.formats) - EXPORT_FORMATS.keys()
+        if unknown:
+            raise ValueError(f"Unsupported export formats: {', '.join(sorted(unknown))}")
+        if not 0 <= self.quality <= 100:
+            raise ValueError("Quality must be between 0 and 100.")
+
+
+DEFAULT_EXPORT_PROFILES = (
+    ExportProfile("full", None, quality=95, webp_method=2),  # Full size WebP at method 4 is ~6x slower
+    ExportProfile("mid", 1600, quality=85),
+    ExportProfile("thumbnail", 320, quality=80),
+)
+
+
+def _encode_variant(shm_name, mode, size, output_path, image_format, options):
+    """
+    Encode one image variant from shared memory (runs in a pool process)
+
+    Args:
+        shm_name: Name of the shared memory block holding the raw pixels
+        mode: Pillow image mode of the pixels
+        size: (width, height) of the image
+        output_path: Path of the encoded file
+        image_format: Pillow format name
+        options: Pillow save options
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        image = Image.frombuffer(mode, size, shm.buf, 'raw', mode, 0, 1)
+        image.save(output_path, image_format, **options)
+        del image  # Release the buffer export before closing the block
+    finally:
+        shm.close()
+    return output_path
+
 
 class RouteImageProcessor:
-    def __init__(self, font_path=None):
+    def __init__(self, font_path=None, profiles: Sequence[ExportProfile] = DEFAULT_EXPORT_PROFILES,
+                 max_workers: Optional[int] = None):
         self.font_path = font_path
-
-    def add_route_info_overlay(self, hold_viewer, route_info, output_path):
+        self.renderer = RouteRenderer(font_path)
+        self.profiles = tuple(profiles)
+        self.max_workers = max_workers
+        self._encode_pool = None  # Created on first use, encodes run in separate processes
+        self._encode_pool_lock = threading.Lock()  # Export workers of the QThreadPool share the pool
+
+    def close(self):
+        """Shut down the encoder process pool"""
+        with self._encode_pool_lock:
+            if self._encode_pool is not None:
+                self._encode_pool.shutdown()
+                self._encode_pool = None
+
+    def _get_encode_pool(self) -> ProcessPoolExecutor:
+        with self._encode_pool_lock:
+            if self._encode_pool is None:
+                # Forking a multithreaded Qt process can deadlock the child, start clean interpreters instead
+                self._encode_pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                        mp_context=multiprocessing.get_context("spawn"))
+            return self._encode_pool
+
+    def export_route_profiles(self, image_path, route, holds, output_dir, base_name,
+                              profiles: Optional[Sequence[ExportProfile]] = None) -> Dict[Tuple[str, str], Path]:
         """
-        Renders exactly what's visible in the HoldViewer and adds info overlay
+        Renders the route once and writes every size and format of the export profiles
 
         Args:
-            hold_viewer: HoldViewer widget instance
-            route_info: Dictionary containing route information
-            output_path: Path where to save the processed image
+            image_path: Path to the wall image
+            route: Route to draw (src.core.route.Route)
+            holds: All holds detected on the wall
+            output_dir: Directory the images are written to
+            base_name: File name stem, the profile name and extension are appended
+            profiles: Profiles to export, the processor's profiles if None
+
+        Returns:
+            Dict[Tuple[str, str], Path]: Written files keyed by (profile name, format)
         """
+        image = load_image(image_path)
+        with metrics.timer("route_export_render_seconds"):
+            image = self.renderer.render(image, route, holds)
         try:
-            # Create a QImage of the exact same size as the HoldViewer
-            qimage = QImage(hold_viewer.size(), QImage.Format_ARGB32)
-            qimage.fill(Qt.transparent)
-
-            # Create painter for QImage
-            painter = QPainter(qimage)
-            painter.setRenderHint(QPainter.Antialiasing)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform)
-
-            # Paint the wall image
-            if hold_viewer.wall_image:
-                scaled_image = hold_viewer.wall_image.scaled(
-                    hold_viewer.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                x = (hold_viewer.width() - scaled_image.width()) // 2
-                y = (hold_viewer.height() - scaled_image.height()) // 2
-                painter.drawPixmap(x, y, scaled_image)
-
-            # Draw holds using HoldViewer's own drawing functions
-            for hold in hold_viewer.holds:
-                hold_viewer.draw_hold(painter, hold)
-
-            # Draw route connections using HoldViewer's function
-            hold_viewer.draw_route_connections(painter, hold_viewer.holds)
-
-            # End QPainter before converting image
-            painter.end()
-
-            # Convert QImage to PIL Image
-            buffer = qimage.bits().asstring(qimage.width() * qimage.height() * 4)
-            image = Image.frombytes(
-                'RGBA',
-                (qimage.width(), qimage.height()),
-                buffer,
-                'raw',
-                'BGRA'
-            )
-
-            # Create overlay for route info
-            overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
-
-            # Draw route info box
-            padding = 20
-            rect_height = 180
-            rect_width = 300
-            rect_position = (image.width - rect_width - padding, padding)
-
-            draw.rectangle(
-                [
-                    rect_position[0],
-                    rect_position[1],
-                    rect_position[0] + rect_width,
-                    rect_position[1] + rect_height
-                ],
-                fill=(255, 255, 255, 230)
-            )
-
-            # Setup fonts
-            try:
-                title_font = ImageFont.truetype(self.font_path, 24) if self.font_path else ImageFont.load_default()
-                info_font = ImageFont.truetype(self.font_path, 16) if self.font_path else ImageFont.load_default()
-            except Exception:
-                title_font = info_font = ImageFont.load_default()
-
-            # Draw text
-            text_x = rect_position[0] + 15
-            text_y = rect_position[1] + 10
-
-            # Draw route name
-            draw.text((text_x, text_y), route_info["name"], font=title_font, fill=(0, 0, 0, 255))
-            text_y += 35
-
-            # Draw other info
-            info_items = [
-                f"Grade: {route_info['grade']}",
-                f"Author: {route_info['author']}",
-                f"Created: {datetime.now().strftime('%Y-%m-%d')}",
-                f"Description: {route_info['description'][:50]}..."
-            ]
-
-            for item in info_items:
-                draw.text((text_x, text_y), item, font=info_font, fill=(0, 0, 0, 255))
-                text_y += 25
-
-            # Composite image with overlay
-            final_image = Image.alpha_composite(image, overlay)
-
-            # Save the result
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            final_image.convert('RGB').save(output_path, 'JPEG', quality=95)
-
+            return self.write_profiles(image, output_dir, base_name, profiles)
         except Exception as e:
-            raise
\ No newline at end of file
+            logger.error(f"Error exporting route {route.id} profiles: {str(e)}")
+            raise
+
+    def write_profiles(self, image: Image.Image, output_dir, base_name,
+                       profiles: Optional[Sequence[ExportProfile]] = None) -> Dict[Tuple[str, str], Path]:
+        """
+        Writes every size and format of the export profiles from one rendered image
+
+        Note:
+            Sizes are produced by cascaded downscaling, every size is resampled from the next larger
+            one instead of the full render. The pixels of each downscaled size are placed in shared
+            memory once and encoded in parallel in a process pool, while the native resolution image
+            is encoded in the calling process.
+
+        Args:
+            image: Rendered route image
+            output_dir: Directory the images are written to
+            base_name: File name stem, the profile name and extension are appended
+            profiles: Profiles to export, the processor's profiles if None
+
+        Returns:
+            Dict[Tuple[str, str], Path]: Written files keyed by (profile name, format), largest size first
+        """
+        profiles = tuple(profiles) if profiles is not None else self.profiles
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        full_size = max(image.size)
+
+        # Largest size first, so each downscale starts from the closest larger image
+        ordered = sorted(profiles, key=lambda p: -min(p.max_size or full_size, full_size))
+
+        blocks = []
+        futures = {}
+        local_jobs = []
+        try:
+            pool = self._get_encode_pool()
+            current = image
+            for profile in ordered:
+                current = self._downscale(current, profile.max_size)
+
+                # The native resolution render is encoded here, copying it to another process costs
+                # more than the JPEG encode itself. Downscaled sizes go through shared memory.
+                shm = None
+                if current is not image:
+                    pixels = np.asarray(current)
+                    shm = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+                    blocks.append(shm)
+                    np.ndarray(pixels.shape, dtype=pixels.dtype, buffer=shm.buf)[...] = pixels
+                    del pixels
+
+                for fmt in profile.formats:
+                    image_format, extension = EXPORT_FORMATS[fmt]
+                    path = str(output_dir / f"{base_name}_{profile.name}{extension}")
+                    options = profile.encoder_options(fmt)
+                    if shm is None:
+                        local_jobs.append(((profile.name, fmt), path, image_format, options))
+                    else:
+                        futures[(profile.name, fmt)] = pool.submit(
+                            _encode_variant, shm.name, current.mode, current.size, path, image_format, options
+                        )
+
+            # Runs while the pool encodes the smaller sizes
+            with metrics.timer("route_export_encode_seconds"):
+                written = {}
+                for key, path, image_format, options in local_jobs:
+                    image.save(path, image_format, **options)
+                    written[key] = Path(path)
+
+                written.update((key, Path(future.result())) for key, future in futures.items())
+            metrics.increment("route_export_images_total", len(written))
+            logger.info(f"Exported {len(written)} route images to {output_dir}")
+            return written
+
+        except Exception:
+            metrics.increment("route_export_errors_total")
+            raise
+
+        finally:
+            for future in futures.values():
+                future.cancel()
+            for future in futures.values():
+                if not future.cancelled():
+                    future.exception()  # Wait, the block must outlive every encode reading it
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    @staticmethod
+    def _downscale(image: Image.Image, max_size: Optional[int]) -> Image.Image:
+        if max_size is None or max(image.size) <= max_size:
+            return image
+        scale = max_size / max(image.size)
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        # reducing_gap first shrinks by an integer factor in the cheap box filter, then resamples
+        return image.resize(size, Image.LANCZOS, reducing_gap=3.0)
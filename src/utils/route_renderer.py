@@ -0,0 +1,298 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from src.core.connection import Connection
+from src.core.hold import Hold
+from src.core.route import Route
+from src.utils.image_utils import load_image
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("utils/route_renderer", ProjectConfig.get_log_file("utils/route_image"))
+
+# Same palette as the HoldViewer
+HAND_COLOR = (255, 165, 0)
+FOOT_COLOR = (255, 0, 0)
+UNSELECTED_COLOR = (200, 200, 200)
+FILL_ALPHA = 30
+CARD_ALPHA = 230
+
+REFERENCE_SIZE = 1000  # Long side in pixels the HoldViewer sizes (line widths, card) were designed for
+BEZIER_SEGMENTS = 32  # Line segments used to approximate one connection curve
+
+
+def quadratic_bezier(start: Tuple[float, float], control: Tuple[float, float], end: Tuple[float, float],
+                     segments: int = BEZIER_SEGMENTS) -> List[Tuple[float, float]]:
+    """
+    Sample a quadratic Bezier curve.
+
+    Args:
+        start (Tuple[float, float]): Start point
+        control (Tuple[float, float]): Control point
+        end (Tuple[float, float]): End point
+        segments (int): Number of line segments
+
+    Returns:
+        List[Tuple[float, float]]: segments + 1 points along the curve
+    """
+    t = np.linspace(0.0, 1.0, segments + 1)[:, None]
+    points = ((1 - t) ** 2) * np.asarray(start) + (2 * (1 - t) * t) * np.asarray(control) + (t ** 2) * np.asarray(end)
+    return [tuple(p) for p in points.tolist()]
+
+
+def default_control_point(connection: Connection) -> Tuple[float, float]:
+    """
+    Control point placed perpendicular to the line between the holds, same as the HoldViewer default.
+
+    Args:
+        connection (Connection): Connection between two holds
+
+    Returns:
+        Tuple[float, float]: Control point in image coordinates
+    """
+    x1, y1 = connection.hold1.x, connection.hold1.y
+    x2, y2 = connection.hold2.x, connection.hold2.y
+    return (x1 + x2) / 2 - (y2 - y1) * 0.2, (y1 + y2) / 2 + (x2 - x1) * 0.2
+
+
+def _fit_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_width: float) -> str:
+    """Shorten text with an ellipsis until it fits into max_width pixels."""
+    if draw.textlength(text, font=font) <= max_width:
+        return text
+    while text and draw.textlength(text + "...", font=font) > max_width:
+        text = text[:-1]
+    return text + "..."
+
+
+class RouteRenderer:
+    """
+    Headless renderer drawing a route straight onto the wall photo in image coordinates.
+
+    Note:
+        Uses only PIL and NumPy, so it works without a QApplication (server-side, batch exports)
+        and always renders at the native resolution of the photo. Translucent fills are blended
+        with masked pastes on the RGB image, so no full-frame RGBA copy is ever made.
+
+    Attributes:
+        font_path (Optional[str]): TrueType font for the info card, PIL default font if None
+        draw_unselected (bool): Flag indicating whether holds outside the route are outlined too
+    """
+
+    def __init__(self, font_path: Optional[str] = None, draw_unselected: bool = True):
+        self.font_path = font_path
+        self.draw_unselected = draw_unselected
+
+    def render(self, image: Image.Image, route: Route, holds: Iterable[Hold] = (),
+               info_card: bool = True) -> Image.Image:
+        """
+        Draw a route onto an image in place.
+
+        Args:
+            image (Image.Image): Wall photo, converted to RGB if needed
+            route (Route): Route to draw
+            holds (Iterable[Hold]): All holds of the wall, holds outside the route are drawn grey
+            info_card (bool): Flag indicating whether the route info card is drawn
+
+        Returns:
+            Image.Image: The rendered RGB image
+        """
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+
+        scale = max(image.size) / REFERENCE_SIZE
+        line_width = max(1, round(2 * scale))
+        draw = ImageDraw.Draw(image)
+
+        route_ids = {hold.id for hold in route.hand_holds} | {hold.id for hold in route.foot_holds}
+        if self.draw_unselected:
+            for hold in holds:
+                if hold.id not in route_ids:
+                    self._draw_hold(image, draw, hold, UNSELECTED_COLOR, line_width)
+
+        # Foot holds first so hand holds used for both stay on top, like in the viewer
+        for hold in route.foot_holds:
+            self._draw_hold(image, draw, hold, FOOT_COLOR, line_width)
+        for hold in route.hand_holds:
+            self._draw_hold(image, draw, hold, HAND_COLOR, line_width)
+
+        hand_ids = {hold.id for hold in route.hand_holds}
+        for connection in route.connections:
+            color = HAND_COLOR if connection.hold1.id in hand_ids else FOOT_COLOR
+            self._draw_connection(draw, connection, color, line_width, scale)
+
+        if info_card:
+            self._draw_info_card(image, draw, route, scale)
+
+        return image
+
+    def render_file(self, image_path: Union[str, Path], route: Route, holds: Iterable[Hold],
+                    output_path: Union[str, Path], quality: int = 95) -> Path:
+        """
+        Render a route onto a wall photo file and save it as JPEG.
+
+        Args:
+            image_path (Union[str, Path]): Wall photo
+            route (Route): Route to draw
+            holds (Iterable[Hold]): All holds of the wall
+            output_path (Union[str, Path]): Output JPEG path
+            quality (int): JPEG quality
+
+        Returns:
+            Path: Path of the saved image
+        """
+        output_path = Path(output_path)
+        rendered = self.render(load_image(image_path), route, holds)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        rendered.save(output_path, "JPEG", quality=quality)
+        logger.info(f"Rendered route {route.id} at {rendered.width}x{rendered.height} to {output_path}")
+        return output_path
+
+    def _draw_hold(self, image: Image.Image, draw: ImageDraw.ImageDraw, hold: Hold,
+                   color: Tuple[int, int, int], line_width: int) -> None:
+        if hold.contour_points:
+            points = [(p.x, p.y) for p in hold.contour_points]
+        else:
+            x_min, y_min, x_max, y_max = hold.bounds
+            points = [(x_min, y_min), (x_max, y_min), (x_max, y_max), (x_min, y_max)]
+
+        # Translucent fill: blend the colour through a polygon mask limited to the hold's bounding box
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        left = max(0, int(min(xs)))
+        top = max(0, int(min(ys)))
+        right = min(image.width, int(max(xs)) + 1)
+        bottom = min(image.height, int(max(ys)) + 1)
+        if right > left and bottom > top:
+            mask = Image.new("L", (right - left, bottom - top), 0)
+            ImageDraw.Draw(mask).polygon([(x - left, y - top) for x, y in points], fill=FILL_ALPHA)
+            image.paste(color, (left, top, right, bottom), mask)
+
+        draw.line(points + [points[0]], fill=color, width=line_width, joint="curve")
+
+    def _draw_connection(self, draw: ImageDraw.ImageDraw, connection: Connection,
+                         color: Tuple[int, int, int], line_width: int, scale: float) -> None:
+        start = (connection.hold1.x, connection.hold1.y)
+        end = (connection.hold2.x, connection.hold2.y)
+
+        if connection.is_curved:
+            control = connection.control_points or default_control_point(connection)
+            draw.line(quadratic_bezier(start, control, end), fill=color, width=line_width, joint="curve")
+        else:
+            draw.line([start, end], fill=color, width=line_width)
+
+        if connection.number is not None:
+            offset = 10 * scale
+            draw.text(
+                ((start[0] + end[0]) / 2 - offset, (start[1] + end[1]) / 2 - offset),
+                str(connection.number),
+                fill=color,
+                font=self._font(int(12 * scale)),
+            )
+
+    def _draw_info_card(self, image: Image.Image, draw: ImageDraw.ImageDraw, route: Route, scale: float) -> None:
+        padding = round(20 * scale)
+        card_width = round(300 * scale)
+        card_height = round(180 * scale)
+        left = image.width - card_width - padding
+        top = padding
+
+        # White card at CARD_ALPHA opacity, blended with a constant mask
+        card_mask = Image.new("L", (card_width, card_height), CARD_ALPHA)
+        image.paste((255, 255, 255), (left, top, left + card_width, top + card_height), card_mask)
+
+        text_x = left + round(15 * scale)
+        text_y = top + round(10 * scale)
+        max_width = card_width - 2 * round(15 * scale)
+
+        title_font = self._font(round(24 * scale))
+        draw.text((text_x, text_y), _fit_text(draw, route.name, title_font, max_width), font=title_font, fill=(0, 0, 0))
+        text_y += round(35 * scale)
+
+        info_font = self._font(round(16 * scale))
+        description = route.description or ""
+        info_items = [
+            f"Grade: {route.grade}",
+            f"Author: {route.author}",
+            f"Created: {route.created_at.strftime('%Y-%m-%d')}",
+            f"Description: {description[:50]}..." if len(description) > 50 else f"Description: {description}",
+        ]
+        for item in info_items:
+            draw.text((text_x, text_y), _fit_text(draw, item, info_font, max_width), font=info_font, fill=(0, 0, 0))
+            text_y += round(25 * scale)
+
+    def _font(self, size: int) -> ImageFont.ImageFont:
+        size = max(size, 8)
+        try:
+            if self.font_path:
+                return ImageFont.truetype(self.font_path, size)
+            return ImageFont.load_default(size)
+        except (OSError, TypeError):
+            # Missing font file, or a Pillow version without sized default fonts
+            return ImageFont.load_default()
+
+
+def render_stored_routes(route_ids: Sequence[str], output_dir: Path, font_path: Optional[str] = None) -> int:
+    """
+    Render stored routes from the repository and their wall snapshots, without a GUI.
+
+    Args:
+        route_ids (Sequence[str]): IDs of the routes to render, all routes if empty
+        output_dir (Path): Directory the JPEGs are written to
+        font_path (Optional[str]): TrueType font for the info card
+
+    Returns:
+        int: Number of routes rendered
+    """
+    # Imported here to keep the renderer itself free of storage dependencies
+    from src.storage.repositories.route_repository import RouteRepository
+    from src.storage.repositories.wall_repository import WallRepository
+
+    route_repository = RouteRepository(ProjectConfig.ROUTES_DIR)
+    wall_repository = WallRepository(ProjectConfig.WALLS_DIR)
+    renderer = RouteRenderer(font_path)
+
+    if route_ids:
+        models = (route_repository.get(route_id) for route_id in route_ids)
+    else:
+        models = route_repository.iter_all()
+
+    rendered = 0
+    walls = {}
+    for model in models:
+        if model is None or model.wall_hash is None:
+            continue
+        if model.wall_hash not in walls:
+            wall = wall_repository.get(model.wall_hash)
+            walls[model.wall_hash] = (wall, wall.to_holds()) if wall is not None else None
+        if walls[model.wall_hash] is None:
+            logger.warning(f"No wall snapshot for route {model.id}, skipping")
+            continue
+
+        wall, holds = walls[model.wall_hash]
+        route = Route.from_model(model, holds)
+        renderer.render_file(wall.image_path, route, holds, output_dir / f"{model.id}.jpg")
+        rendered += 1
+
+    return rendered
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render stored routes onto their wall photos at full resolution.")
+    parser.add_argument("route_ids", nargs="*", help="Route IDs to render (default: all routes)")
+    parser.add_argument("--output-dir", type=Path, default=ProjectConfig.EXPORTS_DIR, help="Output directory")
+    parser.add_argument("--font", help="TrueType font for the info card")
+    args = parser.parse_args(argv)
+
+    count = render_stored_routes(args.route_ids, args.output_dir, args.font)
+    print(f"Rendered {count} routes to {args.output_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from PIL import Image
+
+from src.utils.image_utils import compute_image_hash, load_image
+from src.utils.logger import setup_logger
+from src.utils.config import ProjectConfig
+
+logger = setup_logger("utils/thumbnails", ProjectConfig.get_log_file("utils/thumbnails"))
+
+
+class ThumbnailCache:
+    """
+    Downscaled previews of wall photos and exported route images.
+
+    Note:
+        Thumbnails are generated once on ingest and stored as small JPEGs named after the content
+        hash of the source image, so renamed or copied files share one thumbnail. JPEG sources are
+        decoded in draft mode: libjpeg scales by 1/2, 1/4 or 1/8 while decoding the DCT blocks, so
+        the full-size image is never materialized. Recently used thumbnails are kept decoded in an
+        in-memory LRU tier. All methods are thread-safe.
+
+    Attributes:
+        cache_dir (Path): Directory holding the thumbnail files
+        size (int): Longest side of a thumbnail in pixels
+        max_memory_items (int): Number of thumbnails kept in memory
+        quality (int): JPEG quality of the stored thumbnails
+    """
+
+    def __init__(self, cache_dir: Union[Path, str] = ProjectConfig.THUMBNAILS_DIR,
+                 size: int = ProjectConfig.THUMBNAIL_SIZE,
+                 max_memory_items: int = ProjectConfig.MAX_CACHE_SIZE, quality: int = 85):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.size = size
+        self.max_memory_items = max_memory_items
+        self.quality = quality
+
+        self._memory: "OrderedDict[str, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info(f"Initialized ThumbnailCache with storage path: {self.cache_dir}")
+
+    def thumbnail_path(self, image_hash: str) -> Path:
+        """Path of the stored thumbnail of an image."""
+        return self.cache_dir / f"{image_hash}_{self.size}.jpg"
+
+    def ingest(self, image_path: Union[Path, str], image_hash: Optional[str] = None,
+               image: Optional[Image.Image] = None) -> str:
+        """
+        Create the thumbnail of an image if it is not stored yet.
+        Args:
+            image_path (Union[Path, str]): Source image
+            image_hash (Optional[str]): Content hash of the source, computed if None
+            image (Optional[Image.Image]): Already decoded upright source pixels, used instead of decoding the file
+        Returns:
+            str: Content hash of the source image
+        """
+        image_hash = image_hash or compute_image_hash(image_path)
+        if self._memory_get(image_hash) is not None or self.thumbnail_path(image_hash).exists():
+            return image_hash
+
+        try:
+            if image is not None:
+                thumbnail = image.convert("RGB")
+                thumbnail.thumbnail((self.size, self.size), Image.LANCZOS, reducing_gap=3.0)
+            else:
+                thumbnail = load_image(image_path, self.size)
+            self._store(image_hash, thumbnail)
+            self._memory_put(image_hash, thumbnail)
+            logger.debug(f"Created {thumbnail.width}x{thumbnail.height} thumbnail {image_hash[:12]} for {image_path}")
+
+        except Exception as e:
+            logger.error(f"Error creating thumbnail for {image_path}: {str(e)}")
+            raise
+
+        return image_hash
+
+    def get(self, image_hash: str) -> Optional[Image.Image]:
+        """
+        Retrieve a thumbnail by the content hash of its source image.
+        Args:
+            image_hash (str): Content hash of the source image
+        Returns:
+            Image.Image: Thumbnail if cached, None otherwise
+        """
+        thumbnail = self._memory_get(image_hash)
+        if thumbnail is not None:
+            return thumbnail
+
+        path = self.thumbnail_path(image_hash)
+        if not path.exists():
+            return None
+
+        try:
+            with Image.open(path) as stored:
+                thumbnail = stored.convert("RGB")
+        except Exception as e:
+            logger.error(f"Error loading thumbnail {image_hash[:12]}: {str(e)}")
+            return None
+
+        self._memory_put(image_hash, thumbnail)
+        return thumbnail
+
+    def get_for_path(self, image_path: Union[Path, str]) -> Image.Image:
+        """
+        Retrieve the thumbnail of an image file, creating it if needed.
+        Args:
+            image_path (Union[Path, str]): Source image
+        Returns:
+            Image.Image: Thumbnail of the image
+        """
+        image_hash = self.ingest(image_path)
+        return self.get(image_hash)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier, stored thumbnails are kept."""
+        with self._lock:
+            self._memory.clear()
+
+    def _store(self, image_hash: str, thumbnail: Image.Image) -> None:
+        # Write under a temporary name so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(prefix=".thumb-", suffix=".jpg", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                thumbnail.save(f, "JPEG", quality=self.quality)
+            os.replace(tmp_path, self.thumbnail_path(image_hash))
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+
+    def _memory_get(self, image_hash: str) -> Optional[Image.Image]:
+        with self._lock:
+            thumbnail = self._memory.get(image_hash)
+            if thumbnail is not None:
+                self._memory.move_to_end(image_hash)
+            return thumbnail
+
+    def _memory_put(self, image_hash: str, thumbnail: Image.Image) -> None:
+        with self._lock:
+            self._memory[image_hash] = thumbnail
+            self._memory.move_to_end(image_hash)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
@@ -0,0 +1,48 @@
+"""RouteImporter handling of malformed exports."""
+import csv
+from uuid import uuid4
+
+from src.storage.exporters.csv_exporter import CSV_FIELDS, route_to_row
+from src.storage.importers.route_importer import RouteImporter
+from src.storage.models.route_model import ConnectionModel, RouteModel
+from src.storage.repositories.route_repository import RouteRepository
+
+
+def make_route(name: str) -> RouteModel:
+    hands, feet = [uuid4(), uuid4(), uuid4()], [uuid4(), uuid4()]
+    return RouteModel(
+        name=name,
+        hold_ids=hands + feet,
+        difficulty="6b+",
+        hand_hold_ids=hands,
+        foot_hold_ids=feet,
+        connections=[ConnectionModel(a, b) for chain in (hands, feet) for a, b in zip(chain, chain[1:])],
+    )
+
+
+def write_csv(path, rows, fieldnames=CSV_FIELDS):
+    with path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_import_skips_malformed_csv_rows(tmp_path):
+    """A malformed row is counted as invalid instead of aborting the import"""
+    good, bad = route_to_row(make_route("Good")), route_to_row(make_route("Bad"))
+    bad["connections"] = "[{\"hold1_id\": 1"
+    path = tmp_path / "routes.csv"
+    write_csv(path, [good, bad])
+
+    repository = RouteRepository(tmp_path / "repository")
+    result = RouteImporter(repository).import_file(path)
+    assert (result.imported, result.duplicates, result.invalid) == (1, 0, 1)
+    assert repository.route_ids() == {good["id"]}
+
+
+def test_import_without_id_column_rejects_every_row(tmp_path):
+    path = tmp_path / "routes.csv"
+    write_csv(path, [route_to_row(make_route("No id"))], [field for field in CSV_FIELDS if field != "id"])
+
+    result = RouteImporter(RouteRepository(tmp_path / "repository")).import_file(path)
+    assert (result.imported, result.invalid) == (0, 1)